@@ -0,0 +1,145 @@
+"""Regression check and benchmark for ByteBuilder and BitVector, compares results with former
+implementation for random operation sequences and for all packets using ByteBuilder"""
+
+import contextlib
+import random
+import sys
+from typing import Callable, Iterator
+
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.low_level.low_level_channel_config import PacketLowLevelChannelConfigAck
+from science_mode_4.mid_level.mid_level_current_data import PacketMidLevelGetCurrentDataAck
+from science_mode_4.utils.bit_vector import BitVector
+from science_mode_4.utils.byte_builder import ByteBuilder
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyBitVector, LegacyByteBuilder
+from benchmarks.sample_packets import SamplePackets
+
+
+@contextlib.contextmanager
+def legacy_implementation() -> Iterator[None]:
+    """Replaces ByteBuilder and BitVector in all library modules with former implementation"""
+    replacements = {ByteBuilder: LegacyByteBuilder, BitVector: LegacyBitVector}
+    patched: list[tuple[object, str, object]] = []
+    for name, module in list(sys.modules.items()):
+        # skip implementation modules themselves
+        if not name.startswith("science_mode_4") or name in (ByteBuilder.__module__, BitVector.__module__):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if value is ByteBuilder or value is BitVector:
+                patched.append((module, attribute, value))
+                setattr(module, attribute, replacements[value])
+    try:
+        yield
+    finally:
+        for module, attribute, value in patched:
+            setattr(module, attribute, value)
+
+
+def run_operations(bb: ByteBuilder | LegacyByteBuilder, seed: int) -> list[object]:
+    """Executes a random sequence of operations and returns all observable results"""
+    rnd = random.Random(seed)
+    result: list[object] = []
+    for _ in range(rnd.randint(1, 30)):
+        operation = rnd.randint(0, 8)
+        length = len(bb)
+        try:
+            if operation == 0:
+                bb.append_byte(rnd.randint(-300, 300))
+            elif operation == 1:
+                bb.append_value(rnd.randint(-2**40, 2**40), rnd.randint(0, 6), rnd.random() < 0.5)
+            elif operation == 2:
+                bb.append_bytes(rnd.randbytes(rnd.randint(0, 8)))
+            elif operation == 3:
+                bb.append_list([rnd.randint(0, 1000) for _ in range(rnd.randint(0, 4))])
+            elif operation == 4:
+                bb.set_bit_to_position(rnd.randint(-2**20, 2**20), rnd.randint(0, length * 8 + 16), rnd.randint(0, 24))
+            elif operation == 5:
+                count = rnd.randint(0, 3)
+                bb.set_bytes_to_position(list(rnd.randbytes(count)), rnd.randint(0, length + 2), count)
+            elif operation == 6:
+                bb.swap(rnd.randint(0, length), rnd.randint(0, 4))
+            elif operation == 7:
+                result.append(bb.get_bit_from_position(rnd.randint(0, length * 8), rnd.randint(0, 20)))
+            else:
+                result.append(len(bb))
+        except (ValueError, IndexError) as e:
+            # only the exception type matters, so abort sequence because state after exception may differ
+            result.append(type(e).__name__)
+            break
+        result.append(bb.get_bytes())
+    return result
+
+
+def check_operations(count: int) -> int:
+    """Compares random operation sequences and returns mismatch count"""
+    mismatch_count = 0
+    for seed in range(count):
+        rnd = random.Random(seed)
+        data, byte_count = rnd.randint(0, 2**32), rnd.randint(0, 5)
+        if run_operations(ByteBuilder(data, byte_count), seed) != run_operations(LegacyByteBuilder(data, byte_count), seed):
+            print(f"Mismatch random operations, seed: {seed}")
+            mismatch_count += 1
+
+        value = rnd.randint(0, 255)
+        if list(BitVector.init_from_int(value, 8)) != list(LegacyBitVector.init_from_int(value, 8)):
+            print(f"Mismatch bit vector, value: {value}")
+            mismatch_count += 1
+    return mismatch_count
+
+
+def create_results() -> list[object]:
+    """Returns payloads, extracted packet data and parsed acknowledges using current ByteBuilder implementation"""
+    result: list[object] = []
+    for packet in SamplePackets.create_all_packets():
+        data = packet.get_data()
+        result.append(data)
+        result.append(Protocol.extract_packet_data(Protocol.packet_to_bytes(packet)))
+
+    rnd = random.Random(0)
+    for _ in range(100):
+        ack = PacketLowLevelChannelConfigAck(bytes([0, rnd.randint(0, 255), rnd.randint(0, 3)]) + rnd.randbytes(258))
+        result.append(vars(ack))
+        ack = PacketMidLevelGetCurrentDataAck(bytes([0, 4]) + rnd.randbytes(5))
+        result.append(vars(ack))
+    return result
+
+
+def measure(name: str, func: Callable[[], object], reference_func: Callable[[], object] | None = None):
+    """Measures func with current and former implementation, reference_func is used for former
+    implementation if provided"""
+    duration = BenchmarkUtils.measure(func, 20)
+    with legacy_implementation():
+        reference_duration = BenchmarkUtils.measure(func if reference_func is None else reference_func, 20)
+    BenchmarkUtils.print_result(name, reference_duration, duration)
+
+
+def main() -> int:
+    """Main function"""
+
+    mismatch_count = check_operations(5000)
+
+    results = create_results()
+    with legacy_implementation():
+        reference_results = create_results()
+    for index, (result, reference_result) in enumerate(zip(results, reference_results)):
+        if result != reference_result:
+            print(f"Mismatch packet data, index: {index}")
+            mismatch_count += 1
+
+    print(f"Checked random operations and {len(results)} packet results, mismatches: {mismatch_count}")
+
+    # measure
+    payload = bytes(range(256))
+    measure("ByteBuilder.append_bytes (256 bytes)", lambda: ByteBuilder().append_bytes(payload),
+            lambda: LegacyByteBuilder().append_bytes(payload))
+    measure("PacketLowLevelChannelConfigAck", lambda: PacketLowLevelChannelConfigAck(bytes([0, 0x12, 1]) + payload + b"\0\0"))
+    for packet in SamplePackets.create_all_packets():
+        if packet.get_data():
+            measure(f"{type(packet).__name__}.get_data", packet.get_data)
+
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
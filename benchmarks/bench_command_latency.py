@@ -0,0 +1,165 @@
+"""Benchmark for latency of commands waiting for an acknowledge, compares polling connection
+with connection using a background reader thread and with concurrent commands using a packet
+dispatcher. All connections answer every command after a fixed delay in a separate thread"""
+
+import asyncio
+import queue
+import sys
+import threading
+import time
+from timeit import default_timer as timer
+
+from science_mode_4.device_i24 import DeviceI24
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.utils.async_connection import AsyncConnection
+from science_mode_4.utils.connection import Connection
+from science_mode_4.utils.logger import logger
+
+
+class LoopbackDevice():
+    """Answers each written command with an acknowledge (no error) after delay_in_seconds"""
+
+
+    def __init__(self, delay_in_seconds: float):
+        self._delay = delay_in_seconds
+        self.output: queue.Queue[bytes] = queue.Queue()
+
+
+    def write(self, data: bytes):
+        """Answers command in data"""
+        command, number, _ = Protocol.decode_packet_data(data)
+
+        def answer():
+            """Puts acknowledge into output after delay"""
+            time.sleep(self._delay)
+            self.output.put(Protocol.data_to_bytes(command + 1, number, bytes([0])))
+
+        threading.Thread(target=answer, daemon=True).start()
+
+
+class PollingLoopbackConnection(Connection):
+    """Polling connection for LoopbackDevice"""
+
+
+    def __init__(self, device: LoopbackDevice):
+        self._device = device
+
+
+    def open(self):
+        """Open connection"""
+
+
+    def close(self):
+        """Close connection"""
+
+
+    def is_open(self) -> bool:
+        """Checks if connection is open"""
+        return True
+
+
+    def write(self, data: bytes):
+        """Passes data to device"""
+        self._device.write(data)
+
+
+    def clear_buffer(self):
+        """Clear buffer from connection"""
+
+
+    def _read_intern(self) -> bytes:
+        """Returns all answers of device"""
+        result = bytearray()
+        while not self._device.output.empty():
+            result += self._device.output.get_nowait()
+        return bytes(result)
+
+
+class AsyncLoopbackConnection(AsyncConnection):
+    """Connection with background reader thread for LoopbackDevice"""
+
+
+    def __init__(self, device: LoopbackDevice):
+        super().__init__()
+        self._device = device
+
+
+    def open(self):
+        """Open connection and start reader thread"""
+        self._start_reader()
+
+
+    def close(self):
+        """Stop reader thread and close connection"""
+        self._stop_reader()
+
+
+    def is_open(self) -> bool:
+        """Checks if connection is open"""
+        return True
+
+
+    def write(self, data: bytes):
+        """Passes data to device"""
+        self._device.write(data)
+
+
+    def _read_blocking(self) -> bytes:
+        """Waits shortly for an answer of device"""
+        try:
+            return self._device.output.get(timeout=0.05)
+        except queue.Empty:
+            return bytes()
+
+
+async def measure_latency(connection: Connection, count: int) -> float:
+    """Sends count commands and returns average duration per command in seconds"""
+    connection.open()
+    dyscom = DeviceI24(connection).get_layer_dyscom()
+    start_time = timer()
+    for _ in range(count):
+        await dyscom.start()
+    duration = (timer() - start_time) / count
+    connection.close()
+    return duration
+
+
+async def measure_pipelined_latency(connection: Connection, count: int, concurrent_count: int) -> float:
+    """Sends count commands with concurrent_count commands in flight using a packet dispatcher
+    and returns average duration per command in seconds"""
+    connection.open()
+    device = DeviceI24(connection)
+    device.start_dispatcher()
+    dyscom = device.get_layer_dyscom()
+    start_time = timer()
+    for _ in range(count // concurrent_count):
+        await asyncio.gather(*[dyscom.start() for _ in range(concurrent_count)])
+    duration = (timer() - start_time) / count
+    await device.stop_dispatcher()
+    connection.close()
+    return duration
+
+
+def main() -> int:
+    """Main function"""
+
+    # disable logger to avoid output for each command
+    logger().disabled = True
+
+    count = 100
+    delay = 0.001
+    polling_duration = asyncio.run(measure_latency(PollingLoopbackConnection(LoopbackDevice(delay)), count))
+    async_duration = asyncio.run(measure_latency(AsyncLoopbackConnection(LoopbackDevice(delay)), count))
+    print(f"Command with {delay * 1000:.1f} ms device delay, polling: {polling_duration * 1000:.2f} ms, "
+          f"reader thread: {async_duration * 1000:.2f} ms, speedup: {polling_duration / async_duration:.1f}x")
+
+    concurrent_count = 10
+    pipelined_duration = asyncio.run(measure_pipelined_latency(AsyncLoopbackConnection(LoopbackDevice(delay)),
+                                                               count, concurrent_count))
+    print(f"Command with {delay * 1000:.1f} ms device delay, {concurrent_count} concurrent commands with dispatcher: "
+          f"{pipelined_duration * 1000:.2f} ms, speedup: {async_duration / pipelined_duration:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Benchmark for CRC16 calculation and packet validation over I24 byte streams created from recorded values"""
+
+import os
+import sys
+
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.utils.crc16 import Crc16
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyProtocol
+from benchmarks.recorded_streams import RecordedStreams
+
+
+def find_all_packets(buffer: bytes, find_packet) -> list[tuple[int, int]]:
+    """Returns start and stop index of all packets in buffer using find_packet"""
+    result: list[tuple[int, int]] = []
+    position = 0
+    while (start_stop := find_packet(buffer, position)) is not None:
+        result.append(start_stop)
+        position = start_stop[1] + 1
+    return result
+
+
+def main() -> int:
+    """Main function"""
+
+    mismatch_count = 0
+    for csv_file in RecordedStreams.get_csv_files():
+        name = os.path.basename(csv_file)
+        frames = RecordedStreams.create_live_data_frames(csv_file)
+        stream = RecordedStreams.create_stream(frames, 0.1)
+        payloads = [x[9:-1] for x in frames]
+
+        # check identical results
+        table_crcs = [Crc16._crc16(x, 0, Crc16.CRC16_XMODEM_TABLE) for x in payloads] # pylint: disable=protected-access
+        if Crc16.crc16_xmodem_list(payloads) != table_crcs or [Crc16.crc16_xmodem(x) for x in payloads] != table_crcs:
+            print(f"Mismatch crc, {name}")
+            mismatch_count += 1
+        if not all(Protocol.is_valid_packet_data_list(frames)):
+            print(f"Mismatch bulk validation, {name}")
+            mismatch_count += 1
+        packets = find_all_packets(stream, Protocol.find_packet_in_buffer)
+        if packets != find_all_packets(stream, LegacyProtocol.find_packet_in_buffer) or len(packets) != len(frames):
+            print(f"Mismatch find packets, {name}")
+            mismatch_count += 1
+
+        # measure
+        print(f"{name}: {len(frames)} frames, {len(stream)} bytes")
+        BenchmarkUtils.print_result("crc16_xmodem (all frames)",
+                                    BenchmarkUtils.measure(lambda p=payloads: [Crc16._crc16(x, 0, Crc16.CRC16_XMODEM_TABLE) # pylint: disable=protected-access
+                                                                               for x in p], 1),
+                                    BenchmarkUtils.measure(lambda p=payloads: Crc16.crc16_xmodem_list(p), 1))
+        BenchmarkUtils.print_result("is_valid_packet_data (all frames)",
+                                    BenchmarkUtils.measure(lambda f=frames: [LegacyProtocol.is_valid_packet_data(x) for x in f], 1),
+                                    BenchmarkUtils.measure(lambda f=frames: Protocol.is_valid_packet_data_list(f), 1))
+        BenchmarkUtils.print_result("find_packet_in_buffer (stream with noise)",
+                                    BenchmarkUtils.measure(lambda s=stream: find_all_packets(s, LegacyProtocol.find_packet_in_buffer), 1),
+                                    BenchmarkUtils.measure(lambda s=stream: find_all_packets(s, Protocol.find_packet_in_buffer), 1))
+
+    print(f"Checked {len(RecordedStreams.get_csv_files())} recorded streams, mismatches: {mismatch_count}")
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
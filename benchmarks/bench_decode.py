@@ -0,0 +1,97 @@
+"""Benchmark for decoding frames (validation, unstuffing and extraction of command, packet number and payload),
+checks additionally that results are identical to former implementation"""
+
+import os
+import random
+import sys
+
+from science_mode_4.protocol.protocol import Protocol
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyProtocol
+from benchmarks.recorded_streams import RecordedStreams
+from benchmarks.sample_packets import SamplePackets
+
+
+def legacy_decode_stream(buffer: bytes) -> list[tuple[int, int, bytes]]:
+    """Decodes all packets in buffer with former implementation"""
+    result: list[tuple[int, int, bytes]] = []
+    position = 0
+    while (start_stop := LegacyProtocol.find_packet_in_buffer(buffer, position)) is not None:
+        result.append(LegacyProtocol.extract_packet_data(buffer[start_stop[0]:start_stop[1] + 1]))
+        position = start_stop[1] + 1
+    return result
+
+
+def decode_stream(buffer: bytes) -> list[tuple[int, int, bytes]]:
+    """Decodes all packets in buffer with current implementation"""
+    result: list[tuple[int, int, bytes]] = []
+    position = 0
+    while (packet := Protocol.decode_packet_in_buffer(buffer, position)) is not None:
+        command, number, payload = packet[2]
+        result.append((command, number, payload.tobytes()))
+        position = packet[1] + 1
+    return result
+
+
+def check_unstuff(count: int) -> int:
+    """Compares unstuff results for random data (including invalid stuffing) and returns mismatch count"""
+    mismatch_count = 0
+    rnd = random.Random(0)
+    for _ in range(count):
+        # use bytes relevant for stuffing with a high probability
+        data = bytes(rnd.choice([0x81, 0xA5, 0x5A, 0xD4, 0xF0, 0x0F, rnd.randint(0, 255)]) for _ in range(rnd.randint(0, 20)))
+        try:
+            reference = LegacyProtocol.unstuff(data)
+        except IndexError:
+            reference = IndexError
+        try:
+            result = Protocol.unstuff(data)
+        except IndexError:
+            result = IndexError
+        # stuffed data must always be unstuffed to original data
+        if result != reference or Protocol.unstuff(Protocol.stuff(data)) != data:
+            print(f"Mismatch unstuff, data: {data.hex(" ")}")
+            mismatch_count += 1
+    return mismatch_count
+
+
+def main() -> int:
+    """Main function"""
+
+    mismatch_count = check_unstuff(20000)
+
+    for packet in SamplePackets.create_all_packets():
+        for number in range(64):
+            packet.number = number
+            frame = Protocol.packet_to_bytes(packet)
+            command, nr, payload = Protocol.decode_packet_data(frame)
+            if (command, nr, payload.tobytes()) != LegacyProtocol.extract_packet_data(frame) or \
+                Protocol.extract_packet_data(frame) != LegacyProtocol.extract_packet_data(frame):
+                print(f"Mismatch {type(packet).__name__}, number: {number}")
+                mismatch_count += 1
+
+    for csv_file in RecordedStreams.get_csv_files():
+        name = os.path.basename(csv_file)
+        frames = RecordedStreams.create_live_data_frames(csv_file)
+        stream = RecordedStreams.create_stream(frames, 0.1)
+
+        packets = decode_stream(stream)
+        if packets != legacy_decode_stream(stream) or len(packets) != len(frames):
+            print(f"Mismatch decode stream, {name}")
+            mismatch_count += 1
+
+        print(f"{name}: {len(frames)} frames, {len(stream)} bytes")
+        BenchmarkUtils.print_result("decode_packet_data (all frames)",
+                                    BenchmarkUtils.measure(lambda f=frames: [LegacyProtocol.extract_packet_data(x) for x in f
+                                                                             if LegacyProtocol.is_valid_packet_data(x)], 1),
+                                    BenchmarkUtils.measure(lambda f=frames: [Protocol.decode_packet_data(x) for x in f], 1))
+        BenchmarkUtils.print_result("decode stream with noise",
+                                    BenchmarkUtils.measure(lambda s=stream: legacy_decode_stream(s), 1),
+                                    BenchmarkUtils.measure(lambda s=stream: decode_stream(s), 1))
+
+    print(f"Checked unstuff, sample packets and recorded streams, mismatches: {mismatch_count}")
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
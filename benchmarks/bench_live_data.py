@@ -0,0 +1,109 @@
+"""Benchmark for parsing PacketDyscomSendLiveData, shows packets per second of former and current implementation
+for synthetic 5 channel packets and checks that results are identical. Checks additionally gap detection for
+sequences of packet numbers"""
+
+import random
+import struct
+import sys
+
+from science_mode_4.dyscom.dyscom_live_data import DyscomLiveDataBlock
+from science_mode_4.dyscom.dyscom_live_data_gap_detector import DyscomLiveDataGapDetector
+from science_mode_4.dyscom.dyscom_send_live_data import PacketDyscomSendLiveData
+from science_mode_4.dyscom.dyscom_types import DyscomSignalType
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyPacketDyscomSendLiveData
+
+
+def create_payloads(count: int, channel_count: int = 5) -> list[bytes]:
+    """Creates payloads of live data packets with random values, signal types and status"""
+    rnd = random.Random(0)
+    signal_types = list(DyscomSignalType)
+    result: list[bytes] = []
+    for x in range(count):
+        payload = bytearray([channel_count])
+        payload += (x * 250).to_bytes(4, "big")
+        for _ in range(channel_count):
+            payload += struct.pack(">fBB", rnd.uniform(-1e3, 1e3), rnd.choice(signal_types), rnd.randint(0, 255))
+        result.append(bytes(payload))
+    return result
+
+
+def check_gap_detector() -> int:
+    """Checks dropped and duplicate packets reported by DyscomLiveDataGapDetector for sequences of packet numbers,
+    returns mismatch count"""
+    # packet numbers, expected dropped packets for each packet and expected duplicate count
+    cases: list[tuple[list[int], list[int], int]] = [
+        ([1, 2, 5, 6], [0, 0, 2, 0], 0),
+        ([62, 63, 0, 1], [0, 0, 0, 0], 0),
+        ([5, 5, 6], [0, 0, 0], 1),
+        ([10, 11, 9, 12], [0, 0, 0, 0], 1),
+        ([0, 63], [0, 0], 1),
+        ([0, 32], [0, 31], 0),
+        ([0, 33, 1], [0, 0, 0], 1),
+    ]
+    payload = create_payloads(1)[0]
+    mismatch_count = 0
+    for numbers, expected_dropped, expected_duplicate_count in cases:
+        gap_detector = DyscomLiveDataGapDetector()
+        dropped: list[int] = []
+        for number in numbers:
+            packet = PacketDyscomSendLiveData(payload)
+            packet.number = number
+            dropped.append(gap_detector.check_packet(packet))
+        if dropped != expected_dropped or gap_detector.duplicate_packet_count != expected_duplicate_count or \
+            gap_detector.dropped_packet_count != sum(expected_dropped):
+            print(f"Mismatch gap detector, numbers: {numbers}, dropped: {dropped}, "
+                  f"duplicates: {gap_detector.duplicate_packet_count}")
+            mismatch_count += 1
+    return mismatch_count
+
+
+def print_packets_per_second(name: str, count: int, reference_duration: float, duration: float):
+    """Prints packets per second and speedup"""
+    print(f"{name:<35} reference: {count / reference_duration:12.0f} packets/s, "
+          f"current: {count / duration:12.0f} packets/s, speedup: {reference_duration / duration:6.1f}x")
+
+
+def main() -> int:
+    """Main function"""
+
+    payloads = create_payloads(10000)
+
+    # check identical output
+    mismatch_count = 0
+    for payload in payloads:
+        packet = PacketDyscomSendLiveData(payload)
+        reference = LegacyPacketDyscomSendLiveData(payload)
+        if packet.number_of_channels != reference.number_of_channels or packet.time_offset != reference.time_offset or \
+            packet.status_error != reference.status_error or packet.samples != reference.samples or \
+            list(packet.values) != [x.value for x in reference.samples]:
+            print(f"Mismatch payload: {payload.hex(" ")}")
+            mismatch_count += 1
+
+    mismatch_count += check_gap_detector()
+    print(f"Checked {len(payloads)} packets and gap detector, mismatches: {mismatch_count}")
+
+    # measure
+    count = len(payloads)
+    print_packets_per_second("parse", count,
+                             BenchmarkUtils.measure(lambda: [LegacyPacketDyscomSendLiveData(x) for x in payloads], 1),
+                             BenchmarkUtils.measure(lambda: [PacketDyscomSendLiveData(x) for x in payloads], 1))
+    print_packets_per_second("parse and read values", count,
+                             BenchmarkUtils.measure(lambda: [[y.value for y in LegacyPacketDyscomSendLiveData(x).samples]
+                                                             for x in payloads], 1),
+                             BenchmarkUtils.measure(lambda: [PacketDyscomSendLiveData(x).values for x in payloads], 1))
+    print_packets_per_second("parse and read samples", count,
+                             BenchmarkUtils.measure(lambda: [LegacyPacketDyscomSendLiveData(x).samples for x in payloads], 1),
+                             BenchmarkUtils.measure(lambda: [PacketDyscomSendLiveData(x).samples for x in payloads], 1))
+    block = DyscomLiveDataBlock.create_block(count)
+    print_packets_per_second("parse into block (reference lists)", count,
+                             BenchmarkUtils.measure(lambda: [[y.value for y in LegacyPacketDyscomSendLiveData(x).samples]
+                                                             for x in payloads], 1),
+                             BenchmarkUtils.measure(lambda: DyscomLiveDataBlock.fill_block(block, [PacketDyscomSendLiveData(x)
+                                                                                                   for x in payloads]), 1))
+
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
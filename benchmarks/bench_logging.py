@@ -0,0 +1,99 @@
+"""Benchmark for logging overhead on the hot I/O path with debug output disabled, compares
+former unguarded debug calls with current implementation and measures wire trace overhead.
+Checks additionally that wire trace contains all read and written data"""
+
+import os
+import sys
+import tempfile
+
+from science_mode_4.utils.connection import Connection
+from science_mode_4.utils.logger import Logger
+from science_mode_4.utils.wire_trace import WireTraceDirection, WireTraceReader, WireTraceWriter
+from benchmarks.benchmark_utils import BenchmarkUtils
+
+
+class ConstantConnection(Connection):
+    """Connection returning always the same data"""
+
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self.wire_trace = None
+
+
+    def open(self):
+        """Open connection"""
+
+
+    def close(self):
+        """Close connection"""
+
+
+    def is_open(self) -> bool:
+        """Checks if connection is open"""
+        return True
+
+
+    def clear_buffer(self):
+        """Clear buffer from connection"""
+
+
+    def _read_intern(self) -> bytes:
+        """Returns always the same data"""
+        return self._data
+
+
+class LegacyConstantConnection(ConstantConnection):
+    """Connection with former read and write implementation"""
+
+
+    def write(self, data: bytes):
+        """Logs data without checking log level first"""
+        Logger().logger.debug("Outgoing data, length: %d, bytes: %s", len(data), data.hex(" ").upper())
+
+
+    def read(self) -> bytes:
+        """Reads data and logs it without checking log level first"""
+        result = self._read_intern()
+        if len(result) > 0:
+            Logger().logger.debug("Incoming data, length: %d, bytes: %s", len(result), result.hex(" ").upper())
+        return result
+
+
+def main() -> int:
+    """Main function"""
+
+    data = bytes(range(256)) * 4
+    connection = ConstantConnection(data)
+    legacy_connection = LegacyConstantConnection(data)
+
+    BenchmarkUtils.print_result("Connection.read (1024 bytes)", BenchmarkUtils.measure(legacy_connection.read, 10000),
+                                BenchmarkUtils.measure(connection.read, 10000))
+    BenchmarkUtils.print_result("Connection.write (1024 bytes)", BenchmarkUtils.measure(lambda: legacy_connection.write(data), 10000),
+                                BenchmarkUtils.measure(lambda: connection.write(data), 10000))
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "trace.bin")
+        trace = WireTraceWriter(filename)
+        connection.wire_trace = trace
+        duration = BenchmarkUtils.measure(connection.read, 10000, 1)
+        BenchmarkUtils.print_result("Connection.read with wire trace", BenchmarkUtils.measure(legacy_connection.read, 10000),
+                                    duration)
+        connection.write(data[0:10])
+        trace.close()
+
+        records = list(WireTraceReader.read_records(filename))
+        reads = [x for x in records if x.direction == WireTraceDirection.READ]
+        writes = [x for x in records if x.direction == WireTraceDirection.WRITE]
+        error_count = 0
+        if len(reads) != 10000 or any(x.data != data for x in reads):
+            error_count += 1
+        if len(writes) != 1 or writes[0].data != data[0:10]:
+            error_count += 1
+        print(f"Checked {len(records)} wire trace records, errors: {error_count}")
+
+    return 0 if error_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
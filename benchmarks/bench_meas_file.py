@@ -0,0 +1,109 @@
+"""Benchmark for decoding measurement files, compares former implementation (struct per sample and lists)
+with numpy structured array views in memory and memory mapped from disk, checks that results are identical
+and that time ranges of DyscomMeasurementFile consider time_delta of records"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from science_mode_4.dyscom.dyscom_measurement_decoder import DyscomMeasurementDecoder
+from science_mode_4.dyscom.dyscom_measurement_file import DyscomMeasurementFile
+from science_mode_4.dyscom.dyscom_types import DyscomFrequencyOut, DyscomSignalType
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyMeasurementDecoder
+
+
+def create_measurement_file(sample_count: int, signal_types: list[DyscomSignalType]) -> bytes:
+    """Creates content of a measurement file with random values"""
+    file_signal_types = {value: key for key, value in DyscomMeasurementDecoder.SIGNAL_TYPE_MAP.items()}
+    header = bytearray(DyscomMeasurementDecoder.HEADER_SIZE)
+    header[3] = DyscomFrequencyOut.SAMPLES_PER_SECOND_4K
+    header[10] = len(signal_types)
+    for index, signal_type in enumerate(signal_types):
+        header[11 + index] = file_signal_types[signal_type]
+
+    records = np.zeros(sample_count, DyscomMeasurementDecoder.create_dtype(len(signal_types)))
+    records["time_delta"] = 250
+    records["values"] = np.random.default_rng(0).normal(0.0, 100.0, (sample_count, len(signal_types)))
+    return bytes(header) + records.tobytes()
+
+
+def read_file(filename: str) -> bytes:
+    """Returns content of file"""
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def check_time_range(filename: str, data: bytes) -> int:
+    """Writes data with changing time_delta (rate change and a gap) to filename and compares records of
+    time ranges with a sample by sample search, returns mismatch count"""
+    records = np.frombuffer(data, DyscomMeasurementDecoder.create_dtype(4), offset=DyscomMeasurementDecoder.HEADER_SIZE).copy()
+    records["time_delta"][len(records) // 2:] = 500
+    records["time_delta"][1000] = 100000
+    with open(filename, "wb") as f:
+        f.write(data[0:DyscomMeasurementDecoder.HEADER_SIZE] + records.tobytes())
+
+    times = [0]
+    for x in records["time_delta"][1:].tolist():
+        times.append(times[-1] + x)
+
+    mismatch_count = 0
+    meas_file = DyscomMeasurementFile(filename)
+    for start, stop in [(0.0, 0.1), (0.2, 0.35), (30.0, 31.5), (-1.0, 0.001), (80.0, 1000.0)]:
+        start_index = next((i for i, x in enumerate(times) if x >= round(start * 1_000_000)), len(times))
+        stop_index = next((i for i, x in enumerate(times) if x >= round(stop * 1_000_000)), len(times))
+        if not np.array_equal(meas_file.get_time_range(start, stop), records[start_index:stop_index]):
+            print(f"Mismatch time range {start} - {stop}, expected indices {start_index} - {stop_index}")
+            mismatch_count += 1
+    meas_file.close()
+    return mismatch_count
+
+
+def main() -> int:
+    """Main function"""
+
+    signal_types = [DyscomSignalType.BI, DyscomSignalType.EMG_1, DyscomSignalType.EMG_2, DyscomSignalType.BREATHING]
+    # one minute at 4 kSPS
+    sample_count = 240000
+    data = create_measurement_file(sample_count, signal_types)
+
+    mismatch_count = 0
+    reference = LegacyMeasurementDecoder.decode(data)
+    current = DyscomMeasurementDecoder.decode(data)
+    if current[0] != reference[0] or list(current[1].keys()) != list(reference[1].keys()):
+        print("Mismatch header")
+        mismatch_count += 1
+    for signal_type, values in current[1].items():
+        # former implementation skipped last sample
+        if values[:-1].tolist() != reference[1][signal_type] or len(values) != sample_count:
+            print(f"Mismatch values {signal_type.name}")
+            mismatch_count += 1
+    print(f"Checked {sample_count} samples, mismatches: {mismatch_count}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "meas.bin")
+        with open(filename, "wb") as f:
+            f.write(data)
+
+        from_file = DyscomMeasurementDecoder.decode_file(filename)
+        if any(not np.array_equal(from_file[1][x], current[1][x]) for x in signal_types):
+            print("Mismatch memory mapped file")
+            mismatch_count += 1
+        mismatch_count += check_time_range(os.path.join(folder, "time.bin"), data)
+
+        BenchmarkUtils.print_result("decode in memory", BenchmarkUtils.measure(lambda: LegacyMeasurementDecoder.decode(data), 1, 3),
+                                    BenchmarkUtils.measure(lambda: DyscomMeasurementDecoder.decode(data), 10))
+        BenchmarkUtils.print_result("decode and sum values", BenchmarkUtils.measure(
+            lambda: [sum(x) for x in LegacyMeasurementDecoder.decode(data)[1].values()], 1, 3),
+                                    BenchmarkUtils.measure(lambda: [x.sum() for x in DyscomMeasurementDecoder.decode(data)[1].values()], 10))
+        BenchmarkUtils.print_result("decode file and sum values", BenchmarkUtils.measure(
+            lambda: [sum(x) for x in LegacyMeasurementDecoder.decode(read_file(filename))[1].values()], 1, 3),
+                                    BenchmarkUtils.measure(lambda: [x.sum() for x in DyscomMeasurementDecoder.decode_file(filename)[1].values()], 10))
+
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Checks that PacketBuffer and RingPacketBuffer return identical packets and statistics, when data
+arrives in chunks and contains invalid frames, that clear_buffer() removes all data and that no
+packets are lost when the reader thread is started and stopped"""
+
+import os
+import random
+import sys
+import time
+
+from science_mode_4.device import Device, DeviceCapability
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.packet_factory import PacketFactory
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.utils.connection import Connection
+from science_mode_4.utils.packet_buffer import PacketBuffer
+from science_mode_4.utils.ring_packet_buffer import RingPacketBuffer
+from benchmarks.recorded_streams import RecordedStreams
+
+
+class ChunkConnection(Connection):
+    """Connection returning added data at next read"""
+
+
+    def __init__(self):
+        self._data = b""
+
+
+    def open(self):
+        """Open connection"""
+
+
+    def close(self):
+        """Close connection"""
+
+
+    def is_open(self) -> bool:
+        """Checks if connection is open"""
+        return True
+
+
+    def add_data(self, data: bytes):
+        """Adds data returned at next read"""
+        self._data += data
+
+
+    def clear_buffer(self):
+        """Clear buffer from connection"""
+        self._data = b""
+
+
+    def _read_intern(self) -> bytes:
+        """Read all data from connection"""
+        result = self._data
+        self._data = b""
+        return result
+
+
+def get_statistics(packet_buffer: PacketBuffer) -> tuple[int, int, int]:
+    """Returns decoded packets, invalid frames and discarded bytes"""
+    statistics = packet_buffer.statistics
+    return statistics.decoded_packet_count, statistics.invalid_frame_count, statistics.discarded_byte_count
+
+
+def check_corrupt_frame(packet_buffer_type: type[PacketBuffer]) -> int:
+    """Polls repeatedly over a frame with wrong CRC and checks that it is counted once, returns mismatch count"""
+    conn = ChunkConnection()
+    packet_buffer = packet_buffer_type(conn, PacketFactory())
+    valid_frame = Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, 1, bytes(range(20)))
+    corrupt_frame = Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, 0, bytes(20))
+    corrupt_frame = corrupt_frame[0:12] + bytes([corrupt_frame[12] ^ 1]) + corrupt_frame[13:]
+
+    conn.add_data(corrupt_frame)
+    packets = []
+    for _ in range(5):
+        packets += packet_buffer.get_packets_from_buffer()
+    conn.add_data(valid_frame)
+    packets += packet_buffer.get_packets_from_buffer()
+
+    expected = (1, 1, len(corrupt_frame))
+    if len(packets) != 1 or get_statistics(packet_buffer) != expected:
+        print(f"Mismatch corrupt frame {packet_buffer_type.__name__}, packets: {len(packets)}, "
+              f"statistics: {get_statistics(packet_buffer)}, expected: {expected}")
+        return 1
+    return 0
+
+
+def check_clear_buffer(packet_buffer_type: type[PacketBuffer]) -> int:
+    """Checks that clear_buffer() removes buffered data and pending packets, returns mismatch count"""
+    conn = ChunkConnection()
+    packet_buffer = packet_buffer_type(conn, PacketFactory())
+    frame = Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, 1, bytes(range(20)))
+
+    conn.add_data(frame + frame[0:10])
+    packet_buffer.add_pending_packet(packet_buffer.get_packet_from_buffer())
+    conn.add_data(frame)
+    packet_buffer.clear_buffer()
+    packets = packet_buffer.get_packets_from_buffer()
+
+    if packets or packet_buffer.pending_packet_count != 0 or packet_buffer.buffer:
+        print(f"Mismatch clear buffer {packet_buffer_type.__name__}, packets: {len(packets)}, "
+              f"pending packets: {packet_buffer.pending_packet_count}, buffer: {len(packet_buffer.buffer)}")
+        return 1
+    return 0
+
+
+def check_reader_thread_switch(packet_buffer_type: type[PacketBuffer]) -> int:
+    """Starts and stops reader thread while packets are pending, decoded partially or not complete
+    and checks that all packets arrive in order, returns mismatch count"""
+    conn = ChunkConnection()
+    device = Device(conn, {DeviceCapability.GENERAL}, packet_buffer_type)
+    frames = [Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, x, bytes(range(20))) for x in range(6)]
+
+    # one pending packet, two complete frames and an incomplete frame
+    conn.add_data(frames[0] + frames[1] + frames[2] + frames[3][0:10])
+    device.packet_buffer.add_pending_packet(device.packet_buffer.get_packet_from_buffer())
+    threaded_packet_buffer = device.start_reader_thread()
+    conn.add_data(frames[3][10:] + frames[4] + frames[5][0:10])
+    deadline = time.perf_counter() + 1.0
+    while threaded_packet_buffer.received_packet_count < 4 and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    device.stop_reader_thread()
+    conn.add_data(frames[5][10:])
+    numbers = [x.number for x in device.packet_buffer.get_packets_from_buffer()]
+
+    if numbers != list(range(len(frames))):
+        print(f"Mismatch reader thread switch {packet_buffer_type.__name__}, packet numbers: {numbers}")
+        return 1
+    return 0
+
+
+def decode_chunks(packet_buffer_type: type[PacketBuffer], chunks: list[bytes]) -> tuple[list[tuple], tuple[int, int, int]]:
+    """Polls packet buffer once per chunk and returns number, time offset and values of all live data packets
+    and statistics"""
+    conn = ChunkConnection()
+    packet_buffer = packet_buffer_type(conn, PacketFactory())
+    result: list[tuple] = []
+    for chunk in chunks:
+        conn.add_data(chunk)
+        # poll twice, second poll has no new data
+        for _ in range(2):
+            result += [(x.number, x.time_offset, x.values) for x in packet_buffer.get_packets_from_buffer()]
+    return result, get_statistics(packet_buffer)
+
+
+def main() -> int:
+    """Main function"""
+
+    mismatch_count = 0
+    for packet_buffer_type in [PacketBuffer, RingPacketBuffer]:
+        mismatch_count += check_corrupt_frame(packet_buffer_type)
+        mismatch_count += check_clear_buffer(packet_buffer_type)
+        mismatch_count += check_reader_thread_switch(packet_buffer_type)
+
+    rnd = random.Random(0)
+    for csv_file in RecordedStreams.get_csv_files():
+        frames = RecordedStreams.create_live_data_frames(csv_file)
+        stream = RecordedStreams.create_stream(frames, 0.1)
+        positions = sorted(rnd.sample(range(1, len(stream)), len(stream) // 200))
+        chunks = [stream[x:y] for x, y in zip([0] + positions, positions + [len(stream)])]
+
+        packets, statistics = decode_chunks(PacketBuffer, chunks)
+        ring_packets, ring_statistics = decode_chunks(RingPacketBuffer, chunks)
+        if packets != ring_packets or statistics != ring_statistics or len(packets) != len(frames):
+            print(f"Mismatch stream {os.path.basename(csv_file)}, packets: {len(packets)}, {len(ring_packets)}, "
+                  f"statistics: {statistics}, {ring_statistics}")
+            mismatch_count += 1
+
+    print(f"Checked corrupt frames, clear buffer, reader thread switch and recorded streams in chunks, mismatches: {mismatch_count}")
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
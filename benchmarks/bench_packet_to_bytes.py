@@ -0,0 +1,38 @@
+"""Benchmark for Protocol.packet_to_bytes, checks additionally that result is identical
+to former implementation for every registered packet class and all packet numbers"""
+
+import sys
+
+from science_mode_4.protocol.protocol import Protocol
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.legacy import LegacyProtocol
+from benchmarks.sample_packets import SamplePackets
+
+
+def main() -> int:
+    """Main function"""
+
+    packets = SamplePackets.create_all_packets()
+
+    # check identical output
+    mismatch_count = 0
+    for packet in packets:
+        for number in range(64):
+            packet.number = number
+            if Protocol.packet_to_bytes(packet) != LegacyProtocol.packet_to_bytes(packet):
+                print(f"Mismatch {type(packet).__name__}, number: {number}")
+                mismatch_count += 1
+
+    print(f"Checked {len(packets)} packet classes, mismatches: {mismatch_count}")
+
+    # measure
+    for packet in packets:
+        reference_duration = BenchmarkUtils.measure(lambda p=packet: LegacyProtocol.packet_to_bytes(p), 20)
+        duration = BenchmarkUtils.measure(lambda p=packet: Protocol.packet_to_bytes(p), 20)
+        BenchmarkUtils.print_result(type(packet).__name__, reference_duration, duration)
+
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
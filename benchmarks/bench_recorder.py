@@ -0,0 +1,85 @@
+"""Benchmark for recording live data, compares writing each row to a .csv file (like CsvHelper) with
+DyscomLiveDataRecorder, checks that converting a recording to .csv creates identical content"""
+
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from science_mode_4.dyscom.dyscom_live_data import DyscomLiveDataBlock
+from science_mode_4.dyscom.dyscom_live_data_recorder import DyscomLiveDataRecorder, DyscomLiveDataRecording
+from benchmarks.benchmark_utils import BenchmarkUtils
+
+
+def create_blocks(sample_count: int, block_size: int) -> list[np.ndarray]:
+    """Creates blocks of live data with random values"""
+    rows = DyscomLiveDataBlock.create_block(sample_count)
+    rows["number"] = np.arange(sample_count) % 64
+    rows["time_offset"] = np.arange(sample_count) * 250
+    rows["values"] = np.random.default_rng(0).normal(0.0, 100.0, rows["values"].shape)
+    return [rows[x:x + block_size] for x in range(0, sample_count, block_size)]
+
+
+def write_csv(filename: str, blocks: list[np.ndarray]):
+    """Writes each row to a .csv file, like former CsvHelper"""
+    with open(filename, "w", encoding="utf-8", newline="") as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(["package_nr", "Channel 1", "Channel 2", "Channel 3", "Channel 4", "Channel 5", "time_delta"])
+        for block in blocks:
+            for row in block:
+                csv_writer.writerow([int(row["number"])] + row["values"].tolist() + [int(row["time_offset"])])
+
+
+def read_csv(filename: str) -> list[list[str]]:
+    """Returns rows of a .csv file"""
+    with open(filename, encoding="utf-8", newline="") as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def write_recording(filename: str, blocks: list[np.ndarray]):
+    """Writes blocks with DyscomLiveDataRecorder"""
+    recorder = DyscomLiveDataRecorder(filename)
+    for block in blocks:
+        recorder.write_block(block)
+    recorder.close()
+
+
+def main() -> int:
+    """Main function"""
+
+    # one minute at 4 kSPS, read_live_block() typically returns small blocks
+    sample_count = 240000
+    blocks = create_blocks(sample_count, 64)
+
+    mismatch_count = 0
+    with tempfile.TemporaryDirectory() as folder:
+        csv_filename = os.path.join(folder, "values.csv")
+        recording_filename = os.path.join(folder, "values.bin")
+        converted_filename = os.path.join(folder, "converted.csv")
+
+        write_csv(csv_filename, blocks)
+        write_recording(recording_filename, blocks)
+        recording = DyscomLiveDataRecording(recording_filename)
+        if not np.array_equal(recording.read_block(), np.concatenate(blocks)):
+            print("Mismatch recording")
+            mismatch_count += 1
+        recording.to_csv(converted_filename)
+        with open(csv_filename, "rb") as f1, open(converted_filename, "rb") as f2:
+            if f1.read() != f2.read():
+                print("Mismatch converted .csv file")
+                mismatch_count += 1
+        print(f"Checked {sample_count} samples, mismatches: {mismatch_count}")
+        print(f"File size .csv: {os.path.getsize(csv_filename)} bytes, recording: {os.path.getsize(recording_filename)} bytes")
+
+        BenchmarkUtils.print_result("write", BenchmarkUtils.measure(lambda: write_csv(csv_filename, blocks), 1, 3),
+                                    BenchmarkUtils.measure(lambda: write_recording(recording_filename, blocks), 10))
+        BenchmarkUtils.print_result("read", BenchmarkUtils.measure(lambda: read_csv(csv_filename), 1, 3),
+                                    BenchmarkUtils.measure(recording.read_block, 10))
+
+    return 0 if mismatch_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
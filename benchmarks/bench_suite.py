@@ -0,0 +1,268 @@
+"""Benchmark suite for protocol encode/decode, packet creation, live data parsing and end-to-end acquisition.
+Results are printed and can be written as JSON file (--output), so regressions can be tracked across
+releases. With --compare results are compared to a former JSON file and exit code is 1 if a benchmark
+is slower than tolerance allows"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable
+
+from science_mode_4.device_i24 import DeviceI24
+from science_mode_4.dyscom.dyscom_live_data import DyscomLiveDataBlock
+from science_mode_4.dyscom.dyscom_live_data_gap_detector import DyscomLiveDataGapDetector
+from science_mode_4.dyscom.dyscom_send_live_data import PacketDyscomSendLiveData
+from science_mode_4.dyscom.dyscom_types import DyscomInitParams
+from science_mode_4.protocol.packet_factory import PacketFactory
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.simulator.device_simulator_connection import DeviceSimulatorConnection
+from science_mode_4.utils.logger import logger
+from science_mode_4.utils.packet_buffer import PacketBuffer
+from science_mode_4.utils.replay_connection import ReplayConnection
+from science_mode_4.utils.ring_packet_buffer import RingPacketBuffer
+from science_mode_4.utils.wire_trace import WireTraceDirection, WireTraceWriter
+from benchmarks.benchmark_utils import BenchmarkUtils
+from benchmarks.recorded_streams import RecordedStreams
+from benchmarks.sample_packets import SamplePackets
+
+
+class BenchmarkSuite():
+    """Runs benchmarks and collects results, each result has duration per call in seconds and
+    optionally a number of items processed per call (e.g. frames) to calculate items per second"""
+
+
+    # chunk size of replayed stream, similar to data read from serial port at once
+    REPLAY_CHUNK_SIZE = 4096
+
+
+    def __init__(self, repeat: int):
+        self._repeat = repeat
+        self._results: dict[str, dict[str, float]] = {}
+
+
+    @property
+    def results(self) -> dict[str, dict[str, float]]:
+        """Getter for results"""
+        return self._results
+
+
+    def add_result(self, name: str, duration: float, item_count: int = 1):
+        """Adds and prints result, duration is in seconds for item_count items"""
+        self._results[name] = {"duration_us": duration * 1e6, "items_per_second": item_count / duration}
+        print(f"{name:<60} {duration * 1e6:12.2f} us, {item_count / duration:14.0f} items/s")
+
+
+    def measure(self, name: str, func: Callable[[], object], item_count: int = 1, number: int = 1):
+        """Measures func and adds result"""
+        self.add_result(name, BenchmarkUtils.measure(func, number, self._repeat), item_count)
+
+
+    def run_encode(self):
+        """Protocol.packet_to_bytes for every packet type"""
+        for packet in SamplePackets.create_all_packets():
+            self.measure(f"packet_to_bytes/{type(packet).__name__}", lambda p=packet: Protocol.packet_to_bytes(p), number=200)
+
+
+    def run_decode(self, frames: list[bytes]):
+        """Searching frames in a stream with noise, extracting packet data and unstuffing"""
+        stream = RecordedStreams.create_stream(frames, 0.1)
+
+        def find_all():
+            position = 0
+            while (start_stop := Protocol.find_packet_in_buffer(stream, position)) is not None:
+                position = start_stop[1] + 1
+
+        self.measure("find_packet_in_buffer/stream_with_noise", find_all, len(frames))
+        self.measure("extract_packet_data", lambda: [Protocol.extract_packet_data(x) for x in frames], len(frames))
+        self.measure("decode_packet_data", lambda: [Protocol.decode_packet_data(x) for x in frames], len(frames))
+        stuffed = [x[9:-1] for x in frames]
+        self.measure("unstuff", lambda: [Protocol.unstuff(x) for x in stuffed], len(frames))
+
+
+    def run_packet_creation(self, frames: list[bytes]):
+        """PacketFactory.create_packet_with_data and parsing of PacketDyscomSendLiveData"""
+        factory = PacketFactory()
+        packet_data = [Protocol.extract_packet_data(x) for x in frames]
+        self.measure("create_packet_with_data/DL_SEND_LIVE_DATA",
+                     lambda: [factory.create_packet_with_data(*x) for x in packet_data], len(packet_data))
+        payloads = [x[2] for x in packet_data]
+        self.measure("PacketDyscomSendLiveData/parse", lambda: [PacketDyscomSendLiveData(x) for x in payloads], len(payloads))
+        self.measure("PacketDyscomSendLiveData/values",
+                     lambda: [PacketDyscomSendLiveData(x).values for x in payloads], len(payloads))
+        self.measure("PacketDyscomSendLiveData/samples",
+                     lambda: [PacketDyscomSendLiveData(x).samples for x in payloads], len(payloads))
+
+
+    def run_replay(self, frames: list[bytes], folder: str):
+        """Frames per second through packet buffers reading a replayed byte stream"""
+        filename = os.path.join(folder, "stream.sm4wire")
+        stream = RecordedStreams.create_stream(frames, 0.1)
+        writer = WireTraceWriter(filename)
+        for x in range(0, len(stream), BenchmarkSuite.REPLAY_CHUNK_SIZE):
+            writer.write_record(WireTraceDirection.READ, stream[x:x + BenchmarkSuite.REPLAY_CHUNK_SIZE])
+        writer.close()
+
+        for packet_buffer_type in [PacketBuffer, RingPacketBuffer]:
+            def replay(buffer_type=packet_buffer_type):
+                conn = ReplayConnection(filename, 0)
+                conn.open()
+                packet_buffer = buffer_type(conn, PacketFactory())
+                count = 0
+                while not conn.is_finished:
+                    count += len(packet_buffer.get_packets_from_buffer())
+                conn.close()
+                if count != len(frames):
+                    raise ValueError(f"Replay decoded {count} of {len(frames)} frames")
+
+            self.measure(f"replay/{packet_buffer_type.__name__}", replay, len(frames))
+
+
+    def run_backlog(self, frames: list[bytes], folder: str, backlog: int):
+        """Frames per second through packet buffers, when backlog frames arrive at once (e.g. after user code
+        blocked for a while) and are consumed one by one with iter_packets_from_buffer(), like read_live_block()
+        and file transfers do. PacketBuffer copies remaining data for each packet, RingPacketBuffer moves an index"""
+        filename = os.path.join(folder, "backlog.sm4wire")
+        writer = WireTraceWriter(filename)
+        writer.write_record(WireTraceDirection.READ, RecordedStreams.create_stream(frames[0:backlog], 0.1))
+        writer.close()
+
+        for packet_buffer_type in [PacketBuffer, RingPacketBuffer]:
+            def consume(buffer_type=packet_buffer_type):
+                conn = ReplayConnection(filename, 0)
+                conn.open()
+                packet_buffer = buffer_type(conn, PacketFactory())
+                count = sum(1 for _ in packet_buffer.iter_packets_from_buffer())
+                conn.close()
+                if count != backlog:
+                    raise ValueError(f"Backlog decoded {count} of {backlog} frames")
+
+            self.measure(f"backlog_{backlog}/{packet_buffer_type.__name__}", consume, backlog)
+
+
+    def run_simulator(self, sample_rate: int, duration: float):
+        """Live data acquisition with DeviceI24 and device simulator, measures time per row spent in
+        read_live_block() (includes frame creation by simulator, excludes waiting for data) and checks
+        that no packet was lost"""
+        result = asyncio.run(self._acquire(sample_rate, duration))
+        self.add_result(f"simulator/live_{sample_rate}", result[0], result[1])
+
+
+    def run_file_transfer(self, filesize: int):
+        """Download of a file with get_file_content() from device simulator"""
+        data = random.Random(0).randbytes(filesize)
+
+        async def download():
+            conn = DeviceSimulatorConnection()
+            conn.open()
+            conn.add_file("BENCH.MEA", data)
+            content = await DeviceI24(conn).get_layer_dyscom().get_file_content("BENCH.MEA")
+            conn.close()
+            if content != data:
+                raise ValueError("Simulator file transfer content mismatch")
+
+        self.measure("simulator/file_transfer", lambda: asyncio.run(download()), filesize)
+
+
+    async def _acquire(self, sample_rate: int, duration: float) -> tuple[float, int]:
+        """Acquires live data for duration seconds, returns processing time and number of rows"""
+        conn = DeviceSimulatorConnection(sample_rate)
+        conn.open()
+        device = DeviceI24(conn)
+        device.preserve_packets = True
+        dyscom = device.get_layer_dyscom()
+        await dyscom.init(DyscomInitParams())
+        await dyscom.start()
+
+        gap_detector = DyscomLiveDataGapDetector()
+        block = DyscomLiveDataBlock.create_block(sample_rate)
+        row_count = 0
+        processing_time = 0.0
+        end_time = time.perf_counter() + duration
+        while time.perf_counter() < end_time:
+            start_time = time.perf_counter()
+            row_count += len(dyscom.read_live_block(len(block), block=block, gap_detector=gap_detector))
+            processing_time += time.perf_counter() - start_time
+            await device.packet_buffer.wait_for_data(0.01)
+
+        await dyscom.stop()
+        conn.close()
+        if gap_detector.dropped_packet_count > 0:
+            raise ValueError(f"Simulator acquisition lost {gap_detector.dropped_packet_count} packets")
+        return processing_time, row_count
+
+
+
+def compare_results(results: dict[str, dict[str, float]], baseline_filename: str, tolerance: float) -> int:
+    """Compares results with baseline file and returns number of benchmarks slower than tolerance allows"""
+    with open(baseline_filename, encoding="utf-8") as f:
+        baseline: dict[str, dict[str, float]] = json.load(f)["results"]
+
+    regression_count = 0
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        baseline_duration = baseline[name]["duration_us"]
+        duration = result["duration_us"]
+        ratio = duration / baseline_duration
+        if ratio > 1.0 + tolerance:
+            print(f"Regression {name:<49} baseline: {baseline_duration:12.2f} us, "
+                  f"current: {duration:12.2f} us, {ratio:6.2f}x")
+            regression_count += 1
+    print(f"Compared with {baseline_filename}, regressions: {regression_count}")
+    return regression_count
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="compare results with this JSON file written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown for --compare")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark, best is used")
+    parser.add_argument("--sample-rate", type=int, default=32000, help="sample rate of simulator acquisition")
+    parser.add_argument("--duration", type=float, default=2.0, help="duration of simulator acquisition in seconds")
+    parser.add_argument("--filesize", type=int, default=1_000_000, help="size of file downloaded from simulator")
+    args = parser.parse_args()
+
+    # disable logger to avoid output for each command
+    logger().disabled = True
+
+    frames: list[bytes] = []
+    for csv_file in RecordedStreams.get_csv_files():
+        frames += RecordedStreams.create_live_data_frames(csv_file)
+
+    suite = BenchmarkSuite(args.repeat)
+    suite.run_encode()
+    suite.run_decode(frames)
+    suite.run_packet_creation(frames)
+    with tempfile.TemporaryDirectory() as folder:
+        suite.run_replay(frames, folder)
+        suite.run_backlog(frames, folder, 4000)
+    suite.run_simulator(args.sample_rate, args.duration)
+    suite.run_file_transfer(args.filesize)
+
+    if args.output:
+        try:
+            library_version = version("science_mode_4")
+        except PackageNotFoundError:
+            library_version = "unknown"
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"library_version": library_version, "python_version": platform.python_version(),
+                       "platform": platform.platform(), "timestamp": datetime.datetime.now().isoformat(),
+                       "frame_count": len(frames), "results": suite.results}, f, indent=2)
+
+    if args.compare:
+        return 1 if compare_results(suite.results, args.compare, args.tolerance) > 0 else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
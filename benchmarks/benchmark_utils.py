@@ -0,0 +1,22 @@
+"""Provides helper functionality for benchmarks"""
+
+import timeit
+from typing import Callable
+
+
+class BenchmarkUtils():
+    """Helper functions for benchmarks"""
+
+
+    @staticmethod
+    def measure(func: Callable[[], object], number: int, repeat: int = 5) -> float:
+        """Calls func number times, repeats this repeat times and returns best duration per call in seconds"""
+        timer = timeit.Timer(func)
+        return min(timer.repeat(repeat, number)) / number
+
+
+    @staticmethod
+    def print_result(name: str, reference_duration: float, duration: float):
+        """Prints durations per call and speedup"""
+        print(f"{name:<45} reference: {reference_duration * 1e6:10.2f} us, "
+              f"current: {duration * 1e6:10.2f} us, speedup: {reference_duration / duration:6.1f}x")
@@ -0,0 +1,404 @@
+"""Provides former implementations of performance critical functions,
+used as reference to check that current implementations produce identical results"""
+
+import struct
+
+from science_mode_4.dyscom.dyscom_types import DyscomElectrodeSample, DyscomFrequencyOut, DyscomSignalType, DyscomPowerLiveDataStatusFlag
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.packet import Packet
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.utils.crc16 import Crc16
+
+
+class LegacyBitVector():
+    """Former implementation of BitVector, stores one int per bit"""
+
+
+    @staticmethod
+    def init_from_int(value: int = 0, bit_length: int = 0) -> "LegacyBitVector":
+        """Creates new LegacyBitVector instance from an integer value with bit_length"""
+        result = LegacyBitVector()
+        result.set_from_int(value, bit_length)
+        return result
+
+
+    def __init__(self):
+        self._data: list[int] = []
+        self.set_from_int(0, 0)
+
+
+    def set_from_int(self, value: int = 0, bit_length: int = 0):
+        """Set to an integer value with bit_length"""
+        bl = bit_length
+        if bl == 0:
+            bl = value.bit_length()
+        self._data = [0] * bl
+
+        for x in range(bl):
+            self._data[x] = (value >> x) & 0x1
+
+
+    def __getitem__(self, index: int) -> int:
+        if (index < 0) or (index >= len(self._data)):
+            raise ValueError(f"Bit vector index out of bounds {index} [0 - {len(self._data)}]")
+
+        return self._data[index]
+
+
+    def __setitem__(self, index: int, value: int):
+        if not value in {0, 1}:
+            raise ValueError(f"Bit vector wrong value {value}")
+        if (index < 0) or (index >= len(self._data)):
+            raise ValueError(f"Bit vector index out of bounds {index} [0 - {len(self._data)}]")
+
+        self._data[index] = value
+
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+    def __iter__(self):
+        yield from self._data
+
+
+    def set_length(self, new_length: int):
+        """Set length to new_length, does preserve current data"""
+        length_difference = new_length - len(self._data)
+        if length_difference > 0:
+            self.extend(LegacyBitVector.init_from_int(0, length_difference))
+        elif length_difference < 0:
+            self._data = self._data[0:new_length]
+
+
+    def extend(self, value: "LegacyBitVector"):
+        """Extends current data with value"""
+        if isinstance(value, LegacyBitVector):
+            self._data += value._data # pylint: disable=protected-access
+
+
+    def get_bytes(self) -> bytes:
+        """Convert to bytes"""
+        result = bytearray()
+        position = 0
+
+        value = 0
+        bit_counter = 0
+        bl = len(self._data)
+        while position < bl:
+            if bit_counter == 8:
+                result.append(value)
+                value = 0
+                bit_counter = 0
+
+            value |= self[position] << bit_counter
+            position += 1
+            bit_counter += 1
+
+        if bit_counter > 0:
+            result.append(value)
+
+        return bytes(result)
+
+
+class LegacyByteBuilder():
+    """Former implementation of ByteBuilder, based on LegacyBitVector"""
+
+
+    def __init__(self, data: int = 0, byte_count: int = 0):
+        self._data = LegacyBitVector.init_from_int(data, byte_count * 8)
+
+
+    def get_bit_from_position(self, bit_position: int, bit_count: int) -> int:
+        """Returns bits starting with bit_position and a count of bit_count"""
+        result = 0
+        for x in range(bit_count):
+            result |= (self._data[bit_position + x] << x)
+        return result
+
+
+    def append_value(self, value: int, byte_count: int, do_swap: bool):
+        """Extends current data with byte_count bytes from values"""
+        temp = range(byte_count)
+        if do_swap:
+            temp = reversed(temp)
+        for x in temp:
+            self._append_byte(value >> (x * 8))
+
+
+    def append_byte(self, value: int):
+        """Append a byte"""
+        self._append_byte(value)
+
+
+    def append_list(self, value: list[int]):
+        """Extends current data with list of values (byte)"""
+        for x in value:
+            self._append_byte(x)
+
+
+    def append_bytes(self, value: bytes):
+        """Extends current data with value"""
+        for x in value:
+            self._append_byte(x)
+
+
+    def set_bit_to_position(self, value: int, bit_position: int, bit_count: int):
+        """Set bits starting with bit_position and a count of bit_count to value"""
+        new_length = max(len(self._data), bit_position + bit_count)
+        self._data.set_length(new_length)
+        for x in range(bit_count):
+            self._data[bit_position + x] = (value >> x) & 0x1
+
+
+    def set_bytes_to_position(self, value: bytes, byte_position: int, byte_count: int):
+        """Set bytes starting with byte_position and a count of byte_count to value"""
+        for x in range(byte_count):
+            self.set_bit_to_position(value[x], (byte_position + x) * 8, 8)
+
+
+    def swap(self, start: int, count: int):
+        """Swap bytes by reversion order from start to start + count"""
+        tmp = self.get_bytes()
+        for x in range(count):
+            self.set_bit_to_position(tmp[start + x], (start + count - x - 1) * 8, 8)
+
+
+    def get_bytes(self) -> bytes:
+        """Returns data as bytes"""
+        return self._data.get_bytes()
+
+
+    def clear(self):
+        """Resets data"""
+        self._data = LegacyBitVector()
+
+
+    def __len__(self) -> int:
+        return (len(self._data) + 7) // 8
+
+
+    def _append_byte(self, value: int):
+        """Append value at the end of data, value is treated as byte"""
+        start = len(self._data)
+        self._data.set_length(start + 8)
+        for x in range(8):
+            self._data[start + x] = (value >> x) & 0x1
+
+
+class LegacyProtocol:
+    """Former implementation of Protocol functions"""
+
+
+    @staticmethod
+    def packet_to_bytes(packet: Packet) -> bytes:
+        """Builds bytes from a packet"""
+        # build payload
+        bb = LegacyByteBuilder()
+        # command and packet number
+        bb.set_bit_to_position(packet.command, 0, 10)
+        bb.set_bit_to_position(packet.number, 10, 6)
+        # swap command and packet number to ensure big endianness
+        bb.swap(0, 2)
+        # append packet data
+        bb.append_bytes(packet.get_data())
+        # stuff packet data
+        stuffed_packet_data = LegacyProtocol.stuff(bb.get_bytes())
+
+        bb.clear()
+
+        # stop byte
+        bb.append_byte(Protocol.START_BYTE)
+        # packet length
+        packet_length: int = len(stuffed_packet_data) + 10
+        bb.append_bytes(Protocol.stuff_byte(packet_length >> 8))
+        bb.append_bytes(Protocol.stuff_byte(packet_length))
+        # crc
+        crc_16 = Crc16.crc16_xmodem(stuffed_packet_data)
+        bb.append_bytes(Protocol.stuff_byte(crc_16 >> 8))
+        bb.append_bytes(Protocol.stuff_byte(crc_16))
+        # payload
+        bb.append_bytes(stuffed_packet_data)
+        # stop byte
+        bb.append_byte(Protocol.STOP_BYTE)
+
+        result = bb.get_bytes()
+        return bytes(result)
+
+
+    @staticmethod
+    def stuff(packet_data: bytes) -> bytes:
+        """Stuff data"""
+        result: bytearray = bytearray()
+        for b in packet_data:
+            if b in [Protocol.START_BYTE, Protocol.STOP_BYTE, Protocol.STUFFING_BYTE]:
+                result.extend(Protocol.stuff_byte(b))
+            else:
+                result.append(b)
+
+        return bytes(result)
+
+
+    @staticmethod
+    def is_valid_packet_data(buffer: bytes) -> bool:
+        """Checks if buffer might contain a valid packet structure, uses table based crc calculation"""
+        if len(buffer) == 0:
+            return False
+
+        result = True
+
+        result &= len(buffer) > 10
+        result &= buffer[0] == Protocol.START_BYTE
+        result &= buffer[-1] == Protocol.STOP_BYTE
+        crc = int.from_bytes([Protocol.unstuff_byte(buffer[6]), Protocol.unstuff_byte(buffer[8])])
+        result &= crc == Crc16._crc16(buffer[9:-1], 0, Crc16.CRC16_XMODEM_TABLE) # pylint: disable=protected-access
+        return result
+
+
+    @staticmethod
+    def find_packet_in_buffer(buffer: bytes, start: int = 0) -> tuple[int, int] | None:
+        """Tries to find a valid packet in buffer beginning at index start, return start and stop index of packet
+        if found or None otherwise"""
+        while True:
+            start = buffer.find(bytes([Protocol.START_BYTE, Protocol.STUFFING_BYTE]), start)
+            if start == -1:
+                return None
+            stop = buffer.find(bytes([Protocol.STOP_BYTE]), start + 12)
+            if stop == -1:
+                return None
+            if LegacyProtocol.is_valid_packet_data(buffer[start:stop+1]):
+                return start, stop
+            start = stop
+
+
+    @staticmethod
+    def extract_packet_data(buffer: bytes) -> tuple[int, int, bytes]:
+        """Extract command, packet number and payload from buffer and returns these as tuple, buffer must contain valid packet data"""
+        bb = LegacyByteBuilder()
+        # command prefix with command and packet number may be stuffed and can be from 2 to 4 bytes long
+        command_prefix_count = 0
+        for _ in range(2):
+            if buffer[9+command_prefix_count] == Protocol.STUFFING_BYTE:
+                command_prefix_count += 2
+            else:
+                command_prefix_count += 1
+
+        bb.append_bytes(LegacyProtocol.unstuff(buffer[9:9+command_prefix_count]))
+        bb.swap(0, 2)
+
+        command = bb.get_bit_from_position(0, 10)
+        nr = bb.get_bit_from_position(10, 6)
+        payload = LegacyProtocol.unstuff(buffer[9+command_prefix_count:-1])
+
+        return command, nr, payload
+
+
+    @staticmethod
+    def unstuff(stuffed_packet_data: bytes) -> bytes:
+        """Unstuff data"""
+        result = bytearray()
+        index: int = 0
+        while index < len(stuffed_packet_data):
+            if stuffed_packet_data[index] == Protocol.STUFFING_BYTE:
+                index += 1
+                result.append(Protocol.unstuff_byte(stuffed_packet_data[index]))
+            else:
+                result.append(stuffed_packet_data[index])
+
+            index += 1
+
+        return bytes(result)
+
+
+class LegacyPacketDyscomSendLiveData():
+    """Former implementation of PacketDyscomSendLiveData parsing"""
+
+
+    def __init__(self, data: bytes):
+        self._command = Commands.DL_SEND_LIVE_DATA
+        self._number_of_channels = 0
+        self._time_offset = 0
+        self._samples: list[DyscomElectrodeSample] = []
+
+        if not data is None:
+            self._number_of_channels = data[0]
+            self._time_offset = int.from_bytes(data[1:5], "big")
+
+            for x in range(self._number_of_channels):
+                start_index = 5 + x * 6
+
+                sample = DyscomElectrodeSample()
+                sample.value = struct.unpack_from(">f", data[start_index:start_index+4])[0]
+                sample.signal_type = DyscomSignalType(data[start_index+4])
+                status = data[start_index+5]
+                for f in DyscomPowerLiveDataStatusFlag:
+                    if status & (1 << f) == 1:
+                        sample.status.add(f)
+
+                self._samples.append(sample)
+
+
+    @property
+    def number_of_channels(self) -> int:
+        """Getter for number of channels"""
+        return self._number_of_channels
+
+
+    @property
+    def time_offset(self) -> int:
+        """Getter for time offset"""
+        return self._time_offset
+
+
+    @property
+    def samples(self) -> list[DyscomElectrodeSample]:
+        """Getter for samples"""
+        return self._samples
+
+
+    @property
+    def status_error(self) -> bool:
+        """Returns true if in any sample a status flag is set, false otherwise"""
+        for x in self._samples:
+            if len(x.status) != 0:
+                return True
+        return False
+
+
+class LegacyMeasurementDecoder():
+    """Former implementation of measurement file decoding in LayerDyscom.get_meas_file_content"""
+
+
+    @staticmethod
+    def decode(meas_data: bytes) -> tuple[DyscomFrequencyOut, dict[DyscomSignalType, list[float]]]:
+        """Returns sample rate and values for each signal type"""
+        result: dict[DyscomSignalType, list[float]] = {}
+        # signal types differ from DyscomSignalType enum
+        signal_type_map = {1: 1, 2: 10, 3: 2, 4: 3, 5: 11, 6: 9, 7: 12}
+        signal_types: list[DyscomSignalType] = []
+        for x in range(meas_data[10]):
+            signal_type = DyscomSignalType(signal_type_map[meas_data[11+x]])
+            signal_types.append(signal_type)
+
+            result[signal_type] = []
+
+        # sample rate
+        sample_rate = DyscomFrequencyOut(meas_data[3])
+
+        # build string to unpack samples
+        # each sample consist of a time difference and n time signal type values
+        value_structure = "<I" + "f" * len(signal_types)
+        unpack_struct = struct.Struct(value_structure)
+
+        # skip header
+        pos = 512
+        sample_size = unpack_struct.size
+        while pos + sample_size < len(meas_data):
+            r = unpack_struct.unpack(meas_data[pos:pos+sample_size])
+            for index, value in enumerate(signal_types):
+                result[value].append(r[1+index])
+
+            # advance to next sample
+            pos += sample_size
+
+        return sample_rate, result
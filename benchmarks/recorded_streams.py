@@ -0,0 +1,56 @@
+"""Provides byte streams of I24 live data, that are created from recorded measurement values"""
+
+import csv
+import glob
+import os
+import random
+import struct
+
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.protocol import Protocol
+
+
+class RecordedStreams():
+    """Creates byte streams as sent by I24 from recorded csv files (see examples/dyscom)"""
+
+
+    CSV_FOLDER = os.path.join(os.path.dirname(__file__), "..", "examples", "dyscom")
+
+
+    @staticmethod
+    def get_csv_files() -> list[str]:
+        """Returns all recorded csv files"""
+        return sorted(glob.glob(os.path.join(RecordedStreams.CSV_FOLDER, "*.csv")))
+
+
+    @staticmethod
+    def create_live_data_frames(csv_file: str) -> list[bytes]:
+        """Creates a DL_send_live_data frame for each row of csv_file, signal type and status are
+        always 0 as sent by I24"""
+        result: list[bytes] = []
+        with open(csv_file, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            channel_count = len(header) - 2
+            for row in reader:
+                # time offset is the time since previous sample, as recorded in column time_delta
+                payload = bytearray([channel_count])
+                payload += int(row[-1]).to_bytes(4, "big")
+                for value in row[1:-1]:
+                    payload += struct.pack(">fBB", float(value), 0, 0)
+                result.append(Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, int(row[0]) % 64, payload))
+        return result
+
+
+    @staticmethod
+    def create_stream(frames: list[bytes], noise_probability: float = 0.0, seed: int = 0) -> bytes:
+        """Concatenates frames, with noise_probability random bytes with a false start sequence are inserted
+        between frames, noise ends with a stop byte, so no frame is lost"""
+        rnd = random.Random(seed)
+        result = bytearray()
+        for frame in frames:
+            if rnd.random() < noise_probability:
+                result += bytes([Protocol.START_BYTE, Protocol.STUFFING_BYTE]) + rnd.randbytes(rnd.randint(12, 40)) + \
+                    bytes([Protocol.STOP_BYTE])
+            result += frame
+        return bytes(result)
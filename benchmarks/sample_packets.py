@@ -0,0 +1,39 @@
+"""Provides instances of all registered packets with meaningful parameters"""
+
+from science_mode_4.protocol.channel_point import ChannelPoint
+from science_mode_4.protocol.packet import Packet, PacketAck
+from science_mode_4.protocol.packet_factory import PacketFactory
+from science_mode_4.low_level.low_level_channel_config import PacketLowLevelChannelConfig
+from science_mode_4.mid_level.mid_level_types import MidLevelChannelConfiguration
+from science_mode_4.mid_level.mid_level_update import PacketMidLevelUpdate
+
+
+class SamplePackets():
+    """Creates packet instances for benchmarks"""
+
+
+    @staticmethod
+    def create_all_packets() -> list[Packet]:
+        """Returns an instance of each registered packet class (acknowledges included),
+        packets that need parameters to build payload are configured"""
+        result: list[Packet] = []
+        factory = PacketFactory()
+        for prototype in factory.data.values():
+            if isinstance(prototype, PacketAck):
+                packet = prototype.create_copy_with_data(None)
+            else:
+                packet = prototype.create_copy()
+            SamplePackets._configure(packet)
+            result.append(packet)
+        return result
+
+
+    @staticmethod
+    def _configure(packet: Packet):
+        """Set parameters for packets that need them"""
+        points = [ChannelPoint(200, 20), ChannelPoint(100, 0), ChannelPoint(200, -20)]
+        if isinstance(packet, PacketLowLevelChannelConfig):
+            packet.execute_stimulation = True
+            packet.points = points
+        elif isinstance(packet, PacketMidLevelUpdate):
+            packet.channel_configuration = [MidLevelChannelConfiguration(True, 3, 20, points)] * 8
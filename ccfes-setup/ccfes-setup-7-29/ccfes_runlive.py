@@ -20,6 +20,7 @@ from science_mode_4 import DeviceI24, Commands, SerialPortConnection as SerialPo
 from science_mode_4.dyscom.dyscom_send_live_data import PacketDyscomSendLiveData
 from science_mode_4.dyscom.dyscom_types import DyscomInitParams, DyscomSignalType, DyscomPowerModuleType, DyscomPowerModulePowerType
 from science_mode_4.dyscom.ads129x.ads129x_config_register_1 import Ads129xOutputDataRate, Ads129xPowerMode
+from science_mode_4.dyscom.dyscom_unit_converter import DyscomUnitConverter
 
 from science_mode_4 import DeviceP24, MidLevelChannelConfiguration, ChannelPoint
 from science_mode_4 import SerialPortConnection as SerialPortP24
@@ -125,10 +126,6 @@ async def main():
     dyscom = record_device.get_layer_dyscom()  # Get the Dyscom control layer
 
     # --- Configure I24 measurement parameters ---
-    VREF = 4.0  # volts, automatically set at 4.0 unless add init_param
-    GAIN = 6 #automatically set at 6 unless add init_param
-    CURRENT = 30e-6  # 30 uA injected - page 15 ads129 manual
-
     fs = 500  # Sampling frequency in Hz
     hp_b, hp_a = butter_highpass(5, fs)  # Highpass filter coefficients
     notch_b, notch_a = butter_bandstop(58, 62, fs)  # Notch filter coefficients
@@ -156,7 +153,11 @@ async def main():
     # --- Start I24 device ---
     await dyscom.power_module(DyscomPowerModuleType.MEASUREMENT, 
                               DyscomPowerModulePowerType.SWITCH_ON)
-    await dyscom.init(init_params)
+    init_result = await dyscom.init(init_params)
+    # VREF and GAIN are taken from register map used by device, 30 uA injected for BI - page 15 ads129 manual
+    # BI channel is converted to ohms, other channels to microvolts
+    unit_converter = DyscomUnitConverter(init_result.register_map_ads129x)
+    unit_factors = unit_converter.get_factors(init_params.signal_type)
     await dyscom.start()
 
     # --- Setup live plotting ---
@@ -211,30 +212,8 @@ async def main():
             if sld.status_error:
                 print(f"SendLiveData status error {sld.samples}")
                 break 
-            converted = [0] * 5  # Initialize converted values for 5 channels
-            for i in range(5): #used to be 4
-                #convert to respective channel units
-                raw = sld.samples[i].value #raw ADC value 
-                if i == 0:
-                    #converted[i] = (raw / (2**24)) * (VREF / GAIN) / CURRENT # convert to ohms for BI
-                    converted[i] = ((raw * VREF * 2) / ((2**24)*GAIN)) / CURRENT # convert to microvolts
-                    # Ohms = Voltage_measured / Current_injected
-                    # 2**23: ADS129x is a 24‑bit ADC, so the full‑scale range is ±2^23.
-                    # nope, 2 ^ N bits (24)
-                    # VREF: ADC reference voltage (4.0 V in your code).
-                    # GAIN: Programmable amplifier gain (6× here).
-                    # For EMG channels, result × 1e6 to get microvolts.  
-
-                else:
-                    # converted[i] = (raw / (2**24)) * (VREF / GAIN) * 1e6  # convert to microvolts
-                    converted[i] = ((raw * VREF * 2) / ((2**24)*GAIN)) * 1e6  # convert to microvolts
-                # Apply highpass filter
-                #converted[i], hp_zi[i] = apply_filter(converted[i], hp_b, hp_a, hp_zi[i])
-                # Apply bandstop filter 
-                #converted[i], notch_zi[i] = apply_filter(converted[i], notch_b, notch_a, notch_zi[i])
-                # Rectify the signal
-                
-                converted[i] = abs(converted[i])  # Rectification
+            # convert to respective channel units and rectify the signal
+            converted = [abs(x) for x in (unit_factors * sld.values).tolist()]
 
 
             # --- Turn stimulation ON/OFF based on EMG threshold for each channel independently ---
@@ -3,4 +3,5 @@
 from .example_dyscom_fastplotlib import *
 from .example_dyscom_get import *
 from .example_dyscom_pyplot import *
+from .example_dyscom_record import *
 from .example_dyscom_write_csv import *
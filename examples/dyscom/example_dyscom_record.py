@@ -0,0 +1,106 @@
+"""Example how to use dyscom and record values to a binary file with DyscomLiveDataRecorder.
+Recorder writes chunks of rows, so no background thread is needed, recording is converted
+to a .csv file afterwards"""
+
+import asyncio
+from timeit import default_timer as timer
+
+from science_mode_4 import DeviceI24
+from science_mode_4 import SerialPortConnection
+from science_mode_4.dyscom.ads129x.ads129x_config_register_1 import Ads129xOutputDataRate, Ads129xPowerMode
+from science_mode_4.dyscom.dyscom_live_data import DyscomLiveDataBlock
+from science_mode_4.dyscom.dyscom_live_data_recorder import DyscomLiveDataRecorder, DyscomLiveDataRecording
+from science_mode_4.dyscom.dyscom_types import DyscomInitParams, DyscomPowerModulePowerType,\
+    DyscomPowerModuleType, DyscomSignalType
+from science_mode_4.utils.logger import logger
+from examples.utils.example_utils import ExampleUtils
+
+
+def main():
+    """Main function"""
+
+    async def device_communication() -> int:
+        """Communication with science mode device"""
+
+        # disable logger to increase performance
+        logger().disabled = True
+
+        # get comport from command line argument
+        com_port = ExampleUtils.get_comport_from_commandline_argument()
+        # create serial port connection
+        connection = SerialPortConnection(com_port)
+        # open connection, now we can read and write data
+        connection.open()
+
+        # create science mode device
+        device = DeviceI24(connection)
+        # call initialize to get basic information (serial, versions) and stop any active stimulation/measurement
+        # to have a defined state
+        await device.initialize()
+        # keep live data packets, that arrive while async functions wait for an acknowledge
+        device.preserve_packets = True
+
+        # get dyscom layer to call dyscom level commands
+        dyscom = device.get_layer_dyscom()
+
+        # call enable measurement power module for measurement
+        await dyscom.power_module(DyscomPowerModuleType.MEASUREMENT, DyscomPowerModulePowerType.SWITCH_ON)
+        # call init with 4k sample rate and enable signal types
+        init_params = DyscomInitParams()
+        init_params.signal_type = [DyscomSignalType.BI, DyscomSignalType.EMG_1,\
+                                DyscomSignalType.EMG_2, DyscomSignalType.BREATHING]
+        init_params.register_map_ads129x.config_register_1.output_data_rate = Ads129xOutputDataRate.HR_MODE_4_KSPS__LP_MODE_2_KSPS
+        init_params.register_map_ads129x.config_register_1.power_mode = Ads129xPowerMode.HIGH_RESOLUTION
+        init_result = await dyscom.init(init_params)
+
+        # store init parameters and register map used by device in recording
+        recorder = DyscomLiveDataRecorder("values.bin", init_params, init_result)
+        block = DyscomLiveDataBlock.create_block(1024)
+
+        # start dyscom measurement
+        await dyscom.start()
+
+        start_time = timer()
+        total_count = 0
+
+        # loop for some time
+        for x in range(5000):
+            # check operation mode from time to time, live data arriving meanwhile is
+            # returned later by packet buffer
+            if x % 500 == 0:
+                operation_mode = await dyscom.get_operation_mode()
+                print(f"Operation mode {operation_mode.name}")
+
+            # read connection once and record all available live data
+            values = dyscom.read_live_block(block=block)
+            total_count += len(values)
+            recorder.write_block(values)
+
+            # await asyncio.sleep(0.001)
+
+        # print stats
+        end_time = timer()
+        print(f"Samples: {total_count}, duration: {end_time - start_time}, sample rate: {total_count / (end_time - start_time)}")
+
+        # stop measurement
+        await dyscom.stop()
+        # turn power module off
+        await dyscom.power_module(DyscomPowerModuleType.MEASUREMENT, DyscomPowerModulePowerType.SWITCH_OFF)
+
+        # close serial port connection
+        connection.close()
+
+        # write remaining rows and close file
+        recorder.close()
+        # convert recording for tools expecting .csv files
+        DyscomLiveDataRecording("values.bin").to_csv("values.csv")
+
+        return 0
+
+
+    # start device communication
+    asyncio.run(device_communication())
+
+
+if __name__ == "__main__":
+    main()
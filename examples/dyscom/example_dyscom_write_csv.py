@@ -9,11 +9,9 @@ from science_mode_4 import DeviceI24
 from science_mode_4 import Commands
 from science_mode_4 import SerialPortConnection
 from science_mode_4.dyscom.ads129x.ads129x_config_register_1 import Ads129xOutputDataRate, Ads129xPowerMode
-from science_mode_4.dyscom.dyscom_get_operation_mode import PacketDyscomGetAckOperationMode
 from science_mode_4.dyscom.dyscom_send_live_data import PacketDyscomSendLiveData
-from science_mode_4.dyscom.dyscom_types import DyscomGetType, DyscomInitParams, DyscomPowerModulePowerType,\
+from science_mode_4.dyscom.dyscom_types import DyscomInitParams, DyscomPowerModulePowerType,\
     DyscomPowerModuleType, DyscomSignalType
-from science_mode_4.protocol.types import ResultAndError
 from science_mode_4.utils.logger import logger
 from examples.utils.example_utils import ExampleUtils
 from examples.utils.csv_utils import CsvHelper
@@ -43,6 +41,8 @@ def main():
         # call initialize to get basic information (serial, versions) and stop any active stimulation/measurement
         # to have a defined state
         await device.initialize()
+        # keep live data packets, that arrive while async functions wait for an acknowledge
+        device.preserve_packets = True
 
         # get dyscom layer to call dyscom level commands
         dyscom = device.get_layer_dyscom()
@@ -65,40 +65,23 @@ def main():
 
         # loop for some time
         for x in range(5000):
-            # check operation mode from time to time, this function is not waiting for response
-            # so we have to handle it by ourself later
+            # check operation mode from time to time, live data arriving meanwhile is
+            # returned later by packet buffer
             if x % 500 == 0:
-                dyscom.send_get_operation_mode()
-
-            live_data_counter = 0
-            while True:
-                # process all available packages
-                ack = dyscom.packet_buffer.get_packet_from_buffer(live_data_counter == 0)
-                if ack:
-                    # because there are multiple get commands, we need to additionally check kind,
-                    # which is always associated DyscomGetType
-                    if ack.command == Commands.DL_GET_ACK and ack.kind == DyscomGetType.OPERATION_MODE:
-                        om_ack: PacketDyscomGetAckOperationMode = ack
-                        print(f"Operation mode {om_ack.operation_mode.name}")
-                        # check if measurement is still active
-                        if om_ack.result_error != ResultAndError.NO_ERROR:
-                            break
-                    elif ack.command == Commands.DL_SEND_LIVE_DATA:
-                        live_data_counter += 1
-                        total_count += 1
-
-                        sld: PacketDyscomSendLiveData = ack
-                        if sld.status_error:
-                            print(f"SendLiveData status error {sld.samples}")
-                            break
-
-                        csv_helper.append_values(ack.number, [sld.samples[0].value, sld.samples[1].value,\
-                                                              sld.samples[2].value, sld.samples[3].value,\
-                                                              sld.samples[4].value], sld.time_offset)
-
-                else:
-                    # print(f"Live data acknowledges per iteration {live_data_counter}")
-                    break
+                operation_mode = await dyscom.get_operation_mode()
+                print(f"Operation mode {operation_mode.name}")
+
+            # read connection once and process all available packages
+            for ack in dyscom.packet_buffer.iter_packets_from_buffer():
+                if ack.command == Commands.DL_SEND_LIVE_DATA:
+                    total_count += 1
+
+                    sld: PacketDyscomSendLiveData = ack
+                    if sld.status_error:
+                        print(f"SendLiveData status error {sld.samples}")
+                        break
+
+                    csv_helper.append_values(ack.number, list(sld.values), sld.time_offset)
 
             # await asyncio.sleep(0.001)
 
@@ -4,34 +4,65 @@
 import csv
 from queue import Empty, Full, Queue
 import threading
+import time
 
 
 class CsvHelper:
-    """Class for holding values and write to .csv file"""
+    """Class for holding values and write to .csv file. Values are queued by main thread and
+    written in batches by a background thread, that blocks while queue is empty. If queue is
+    full, values are dropped and counted. File is flushed every flush_interval seconds"""
 
 
-    def __init__(self, filename: str, header: list[str]):
+    def __init__(self, filename: str, header: list[str], max_queue_size: int = 1000000,
+                 batch_size: int = 1024, flush_interval: float = 1.0):
         self._filename = filename
         self._header = header
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
 
-        # this queue is used to synchronize data between background and main thread
-        self._data_queue = Queue(maxsize=0)
-        self._is_running = False
+        # this queue is used to synchronize data between background and main thread,
+        # None marks end of data
+        self._data_queue: Queue[list | None] = Queue(maxsize=max_queue_size)
+        self._thread: threading.Thread | None = None
+        self._dropped_count = 0
+        self._written_count = 0
+
+
+    @property
+    def dropped_count(self) -> int:
+        """Getter for number of rows dropped because queue was full"""
+        return self._dropped_count
+
+
+    @property
+    def written_count(self) -> int:
+        """Getter for number of rows written to file"""
+        return self._written_count
+
+
+    @property
+    def queue_size(self) -> int:
+        """Getter for number of rows waiting to be written"""
+        return self._data_queue.qsize()
 
 
     def start(self):
         """Start background tread"""
 
-        self._is_running = True
-
-        # Create and start the data generator thread (aka background thread)
-        data_thread = threading.Thread(target=self._background_task, daemon=True)
-        data_thread.start()
+        # Create and start the data writer thread (aka background thread)
+        self._thread = threading.Thread(target=self._background_task, daemon=True)
+        self._thread.start()
 
 
     def stop(self):
-        """Stop background thread"""
-        self._is_running = False
+        """Stop background thread, waits until all queued values are written"""
+        if self._thread is None:
+            return
+
+        # blocks if queue is full until background thread has written some rows
+        self._data_queue.put(None)
+        self._thread.join()
+        self._thread = None
 
 
     def append_values(self, package_nr: int, values: list[float], time_delta: int):
@@ -40,19 +71,34 @@ class CsvHelper:
             self._data_queue.put_nowait([package_nr] + values + [time_delta])
         except Full:
             # Queue is full, skip this update
-            pass
+            self._dropped_count += 1
 
 
     def _background_task(self):
         with open(self._filename, "w", encoding="utf-8", newline="") as csv_file:
             csv_writer = csv.writer(csv_file)
             csv_writer.writerow(self._header)
-
-            while self._is_running:
-                while self._data_queue.qsize() > 0:
-                    try:
+            last_flush_time = time.monotonic()
+
+            is_running = True
+            while is_running:
+                batch = []
+                try:
+                    # block until data arrives, but wake up to flush file
+                    data = self._data_queue.get(timeout=self._flush_interval)
+                    while data is not None:
+                        batch.append(data)
+                        if len(batch) >= self._batch_size:
+                            break
                         data = self._data_queue.get_nowait()
-                        csv_writer.writerow(data)
-                    except Empty:
-                        # No new data in the queue
-                        pass
+                    is_running = data is not None
+                except Empty:
+                    # No more data in the queue
+                    pass
+
+                csv_writer.writerows(batch)
+                self._written_count += len(batch)
+
+                if time.monotonic() - last_flush_time >= self._flush_interval:
+                    csv_file.flush()
+                    last_flush_time = time.monotonic()
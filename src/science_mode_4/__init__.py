@@ -8,6 +8,7 @@ from .general import *
 from .low_level import *
 from .mid_level import *
 from .dyscom import *
+from .simulator import *
 
 from .device import *
 from .layer import *
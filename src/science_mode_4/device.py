@@ -1,10 +1,11 @@
 """Provides device class representing a science mode device"""
 
 from enum import IntEnum
-from typing import Type
+from typing import Any, Type
 
 from .layer import Layer
 from .protocol.types import StimStatus
+from .protocol.packet_dispatcher import PacketDispatcher
 from .protocol.packet_factory import PacketFactory
 from .protocol.packet_number_generator import PacketNumberGenerator
 from .general.general_layer import LayerGeneral
@@ -14,6 +15,7 @@ from .dyscom.dyscom_layer import LayerDyscom
 from .dyscom.dyscom_types import DyscomGetOperationModeType
 from .utils.connection import Connection
 from .utils.packet_buffer import PacketBuffer
+from .utils.threaded_packet_buffer import QueueOverflowPolicy, ThreadedPacketBuffer
 
 
 class DeviceCapability(IntEnum):
@@ -28,13 +30,15 @@ class Device():
     """Base class for a science mode devices"""
 
 
-    def __init__(self, conn: Connection, capabilities: set[DeviceCapability]):
+    def __init__(self, conn: Connection, capabilities: set[DeviceCapability],
+                 packet_buffer_type: Type[PacketBuffer] = PacketBuffer):
         self._connection  = conn
         self._packet_factory = PacketFactory()
-        self._packet_buffer = PacketBuffer(self._connection, self._packet_factory)
+        self._packet_buffer = packet_buffer_type(self._connection, self._packet_factory)
         self._packet_number_generator = PacketNumberGenerator()
         self._capabilities = capabilities
         self._layer: dict[DeviceCapability, Layer] = {}
+        self._packet_dispatcher: PacketDispatcher | None = None
 
         self._add_layer(DeviceCapability.GENERAL, capabilities, LayerGeneral)
         self._add_layer(DeviceCapability.LOW_LEVEL, capabilities, LayerLowLevel)
@@ -66,6 +70,25 @@ class Device():
         return self._capabilities
 
 
+    @property
+    def packet_dispatcher(self) -> PacketDispatcher | None:
+        """Getter for packet dispatcher, None if dispatcher is not started"""
+        return self._packet_dispatcher
+
+
+    @property
+    def preserve_packets(self) -> bool:
+        """Getter for preserve packets mode of packet buffer"""
+        return self._packet_buffer.preserve_packets
+
+
+    @preserve_packets.setter
+    def preserve_packets(self, value: bool):
+        """Setter for preserve packets mode of packet buffer, if enabled async functions do not clear buffer
+        and packets arriving while waiting for an acknowledge (e.g. live data) are returned later by packet buffer"""
+        self._packet_buffer.preserve_packets = value
+
+
     @property
     def capabilities(self) -> set[DeviceCapability]:
         """Getter for capabilities"""
@@ -96,6 +119,80 @@ class Device():
         await self.get_layer_general().initialize()
 
 
+    def stats(self) -> dict[str, Any]:
+        """Returns snapshot of statistics (see PacketStatistics) for reading connection, decoding packets,
+        acknowledge latency and packet queue as dict"""
+        result = self._packet_buffer.statistics.get_snapshot()
+        result["pending_packet_count"] = self._packet_buffer.pending_packet_count
+        if isinstance(self._packet_buffer, ThreadedPacketBuffer):
+            result["current_queue_length"] = self._packet_buffer.queue_length
+            result["received_packet_count"] = self._packet_buffer.received_packet_count
+            result["dropped_packet_count"] = self._packet_buffer.dropped_packet_count
+        if self._packet_dispatcher is not None:
+            result["open_future_count"] = self._packet_dispatcher.open_future_count
+        return result
+
+
+    def reset_stats(self):
+        """Resets statistics"""
+        self._packet_buffer.statistics.reset()
+
+
+    def start_reader_thread(self, max_queue_size: int = 65536,
+                            overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.DROP_OLDEST) -> ThreadedPacketBuffer:
+        """Replaces packet buffer with a ThreadedPacketBuffer, that reads and decodes packets in a background thread
+        and pushes them into a queue with max_queue_size packets. Connection must be open. Previous packet buffer
+        is used by reader thread, so data already read from connection is not lost. Returns new packet buffer"""
+        if isinstance(self._packet_buffer, ThreadedPacketBuffer):
+            return self._packet_buffer
+
+        packet_buffer = ThreadedPacketBuffer(self._connection, self._packet_factory, max_queue_size, overflow_policy,
+                                             self._packet_buffer)
+        packet_buffer.copy_open_acknowledges(self._packet_buffer)
+        self._set_packet_buffer(packet_buffer)
+        packet_buffer.start()
+        return packet_buffer
+
+
+    def stop_reader_thread(self):
+        """Stops background reader thread and restores previous packet buffer, packets remaining in queue are
+        kept as pending packets"""
+        if not isinstance(self._packet_buffer, ThreadedPacketBuffer):
+            return
+
+        self._packet_buffer.stop()
+        self._packet_buffer.move_queue_to_pending_packets()
+        packet_buffer = self._packet_buffer.reader_buffer
+        packet_buffer.copy_open_acknowledges(self._packet_buffer)
+        self._set_packet_buffer(packet_buffer)
+
+
+    def start_dispatcher(self) -> PacketDispatcher:
+        """Starts a PacketDispatcher, that processes incoming packets in a task, must be called with a running
+        event loop. Afterwards async functions of all layers no longer clear buffer and multiple commands
+        can wait for acknowledges concurrently. Use subscribe() of returned dispatcher to get other packets
+        (e.g. live data). Functions reading packets from packet buffer directly (LayerDyscom.read_live_block(),
+        get_file_content(), get_meas_file_content() and DyscomFileDownloader.download_file()) raise an exception
+        while dispatcher is running, call stop_dispatcher() before. Returns dispatcher"""
+        if self._packet_dispatcher is None:
+            self._packet_dispatcher = PacketDispatcher(self._packet_buffer)
+            for layer in self._layer.values():
+                layer.packet_dispatcher = self._packet_dispatcher
+        self._packet_dispatcher.start()
+        return self._packet_dispatcher
+
+
+    async def stop_dispatcher(self):
+        """Stops packet dispatcher, async functions of all layers are using packet buffer directly again"""
+        if self._packet_dispatcher is None:
+            return
+
+        for layer in self._layer.values():
+            layer.packet_dispatcher = None
+        await self._packet_dispatcher.stop()
+        self._packet_dispatcher = None
+
+
     def get_layer_general(self) -> LayerGeneral:
         """Helper function to access general layer"""
         return self._layer[DeviceCapability.GENERAL]
@@ -121,6 +218,17 @@ class Device():
         self._layer[capability] = layer
 
 
+    def _set_packet_buffer(self, packet_buffer: PacketBuffer):
+        """Set packet buffer for device and all layers"""
+        packet_buffer.copy_pending_packets(self._packet_buffer)
+        packet_buffer.statistics = self._packet_buffer.statistics
+        self._packet_buffer = packet_buffer
+        for layer in self._layer.values():
+            layer.packet_buffer = packet_buffer
+        if self._packet_dispatcher is not None:
+            self._packet_dispatcher.packet_buffer = packet_buffer
+
+
     def _add_layer(self, capability: DeviceCapability, used_capabilities: set[DeviceCapability], layer_class: Type[Layer]):
         """Helper method that checks if capability is in used_capabilities and if yes add a layer_class instance"""
         if capability in used_capabilities:
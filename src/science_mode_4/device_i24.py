@@ -2,11 +2,12 @@
 
 from .device import Device, DeviceCapability
 from .utils.connection import Connection
+from .utils.packet_buffer import PacketBuffer
 
 
 class DeviceI24(Device):
     """Device class for a I24 device"""
 
-    def __init__(self, conn: Connection):
+    def __init__(self, conn: Connection, packet_buffer_type: type[PacketBuffer] = PacketBuffer):
         super().__init__(conn, [DeviceCapability.GENERAL,
-                                DeviceCapability.DYSCOM])
+                                DeviceCapability.DYSCOM], packet_buffer_type)
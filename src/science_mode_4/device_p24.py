@@ -2,12 +2,13 @@
 
 from .device import Device, DeviceCapability
 from .utils.connection import Connection
+from .utils.packet_buffer import PacketBuffer
 
 
 class DeviceP24(Device):
     """Device class for a P24 device"""
 
-    def __init__(self, conn: Connection):
+    def __init__(self, conn: Connection, packet_buffer_type: type[PacketBuffer] = PacketBuffer):
         super().__init__(conn, [DeviceCapability.GENERAL,
                                 DeviceCapability.LOW_LEVEL,
-                                DeviceCapability.MID_LEVEL])
+                                DeviceCapability.MID_LEVEL], packet_buffer_type)
@@ -1,5 +1,7 @@
 """Init file for dyscom"""
 
+from .dyscom_file_downloader import *
+from .dyscom_file_transfer import *
 from .dyscom_get_battery_status import *
 from .dyscom_get_device_id import *
 from .dyscom_get_file_by_name import *
@@ -10,6 +12,11 @@ from .dyscom_get_list_of_measurement_meta_info import *
 from .dyscom_get_operation_mode import *
 from .dyscom_init import *
 from .dyscom_layer import *
+from .dyscom_live_data import *
+from .dyscom_live_data_gap_detector import *
+from .dyscom_live_data_recorder import *
+from .dyscom_measurement_decoder import *
+from .dyscom_measurement_file import *
 from .dyscom_power_module import *
 from .dyscom_send_file import *
 from .dyscom_send_live_data import *
@@ -18,4 +25,5 @@ from .dyscom_start import *
 from .dyscom_stop import *
 from .dyscom_sys import *
 from .dyscom_types import *
+from .dyscom_unit_converter import *
 from .ads129x import *
@@ -0,0 +1,85 @@
+"""Provides a class to download dyscom files to disk"""
+
+import os
+from typing import TYPE_CHECKING, Callable
+
+from science_mode_4.utils.logger import logger
+from .dyscom_types import DyscomGetOperationModeType
+from .dyscom_file_transfer import DyscomDownloadState, DyscomFileTransfer, DyscomFileTransferProgress
+
+if TYPE_CHECKING:
+    # only needed for type hints, layer imports this module
+    from .dyscom_layer import LayerDyscom
+
+
+class DyscomFileDownloader():
+    """Downloads files of a dyscom device to disk. Blocks are written to file through a small buffer and
+    the number of the last written block is stored in a state file (path + ".progress"), so an interrupted
+    download can be resumed"""
+
+
+    # buffer size of file written by download_file()
+    DOWNLOAD_BUFFER_SIZE = 65536
+    # interval for saving state of download_file()
+    DOWNLOAD_STATE_INTERVAL_IN_BLOCKS = 64
+
+
+    def __init__(self, layer: "LayerDyscom"):
+        self._layer = layer
+
+
+    async def download_file(self, filename: str, path: str, resume: bool = True,
+                            on_progress: Callable[[DyscomFileTransferProgress], None] | None = None):
+        """Downloads a file to path. Device must be in Idle operating mode. If resume is True and the state
+        file of an interrupted download of the same file exists, download continues after last written block,
+        otherwise it starts from the beginning. on_progress is called after each block. Can not be used while
+        packet dispatcher is running"""
+        self._layer._check_no_packet_dispatcher("download_file") # pylint:disable=protected-access
+        om = await self._layer.get_operation_mode()
+        if om != DyscomGetOperationModeType.IDLE:
+            raise ValueError(f"Error wrong operation mode {om.name}")
+
+        file_info = await self._layer.get_file_info(filename)
+        state = DyscomDownloadState.load(path) if resume and os.path.exists(path) else None
+        if state is not None and (state.filename != filename or state.filesize != file_info.filesize):
+            state = None
+        block_offset = state.block_number if state is not None else 0
+        block_size = state.block_size if state is not None else 0
+
+        file_by_name = await self._layer.get_file_by_name(filename, block_offset)
+        if file_by_name.block_offset != block_offset:
+            # device ignored block offset, so we can not resume
+            if file_by_name.block_offset != 0:
+                await self._layer.stop()
+                raise ValueError(f"Dyscom download file, unexpected block offset {file_by_name.block_offset}")
+            block_offset = 0
+        logger().info("Dyscom download file, filesize: %d, number of blocks: %d, block offset: %d",
+                      file_by_name.filesize, file_by_name.number_of_blocks, block_offset)
+
+        with open(path, "r+b" if block_offset > 0 else "wb", buffering=DyscomFileDownloader.DOWNLOAD_BUFFER_SIZE) as f:
+            f.seek(block_offset * block_size)
+            f.truncate()
+            transfer = DyscomFileTransfer(file_by_name.filesize, file_by_name.number_of_blocks, block_offset, f)
+
+            def save_state(progress: DyscomFileTransferProgress):
+                if on_progress is not None:
+                    on_progress(progress)
+                if progress.block_number % DyscomFileDownloader.DOWNLOAD_STATE_INTERVAL_IN_BLOCKS == 0:
+                    # state must not be ahead of data in file
+                    f.flush()
+                    DyscomDownloadState(filename, file_by_name.filesize, transfer.block_size, progress.block_number).save(path)
+
+            transfer.on_progress = save_state
+            try:
+                # start measurement, so device send automatically SendFile packets
+                await self._layer.start()
+                await transfer.receive(self._layer.packet_buffer, self._layer.send_send_file_ack)
+                # stop measurement, we have all blocks
+                await self._layer.stop()
+            finally:
+                f.flush()
+                if transfer.is_complete:
+                    DyscomDownloadState.remove(path)
+                elif transfer.block_size > 0:
+                    DyscomDownloadState(filename, file_by_name.filesize, transfer.block_size,
+                                        transfer.next_block_number - 1).save(path)
@@ -0,0 +1,191 @@
+"""Provides a class to collect blocks of a dyscom file transfer"""
+
+import json
+import os
+import time
+from typing import BinaryIO, Callable, NamedTuple
+
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.utils.logger import logger
+from science_mode_4.utils.packet_buffer import PacketBuffer
+from .dyscom_send_file import PacketDyscomSendFile
+
+
+class DyscomFileTransferProgress(NamedTuple):
+    """Helper class for progress of a dyscom file transfer"""
+    block_number: int
+    number_of_blocks: int
+    transferred_bytes: int
+    filesize: int
+    elapsed_seconds: float
+    bytes_per_second: float
+
+
+class DyscomDownloadState(NamedTuple):
+    """Helper class for state of a download, it is stored next to downloaded file, so an interrupted
+    download can be resumed. block_number is the number of the last block written to file"""
+    filename: str
+    filesize: int
+    block_size: int
+    block_number: int
+
+
+    @staticmethod
+    def get_state_filename(path: str) -> str:
+        """Returns filename of state file for downloaded file path"""
+        return path + ".progress"
+
+
+    @staticmethod
+    def load(path: str) -> "DyscomDownloadState | None":
+        """Loads state of download to path, returns None if there is no valid state file"""
+        try:
+            with open(DyscomDownloadState.get_state_filename(path), encoding="utf-8") as f:
+                return DyscomDownloadState(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+    def save(self, path: str):
+        """Saves state of download to path"""
+        with open(DyscomDownloadState.get_state_filename(path), "w", encoding="utf-8") as f:
+            json.dump({"filename": self.filename, "filesize": self.filesize, "block_size": self.block_size,
+                       "block_number": self.block_number}, f)
+
+
+    @staticmethod
+    def remove(path: str):
+        """Removes state file of download to path"""
+        if os.path.exists(DyscomDownloadState.get_state_filename(path)):
+            os.remove(DyscomDownloadState.get_state_filename(path))
+
+
+class DyscomFileTransfer():
+    """Collects DL_send_file blocks of a file in a preallocated buffer with filesize bytes. Blocks are numbered
+    starting with 1 and must arrive in order, blocks already received are ignored. Device pads last block
+    to block size, so data beyond filesize is discarded. If block_offset is not 0, transfer starts with
+    block block_offset + 1. If file is provided, blocks are written to file (at its current position)
+    instead of buffer"""
+
+
+    def __init__(self, filesize: int, number_of_blocks: int, block_offset: int = 0, file: BinaryIO | None = None):
+        self._file = file
+        self._filesize = filesize
+        self._data = bytearray(filesize if file is None else 0)
+        self._number_of_blocks = number_of_blocks
+        self._next_block_number = block_offset + 1
+        self._block_size = 0
+        self._transferred_bytes = 0
+        self._start_time = time.perf_counter()
+        self._on_progress: Callable[[DyscomFileTransferProgress], None] | None = None
+
+
+    @property
+    def data(self) -> bytearray:
+        """Getter for data, contains received blocks (empty if blocks are written to a file)"""
+        return self._data
+
+
+    @property
+    def filesize(self) -> int:
+        """Getter for filesize"""
+        return self._filesize
+
+
+    @property
+    def block_size(self) -> int:
+        """Getter for block size, 0 until first block was received"""
+        return self._block_size
+
+
+    @property
+    def number_of_blocks(self) -> int:
+        """Getter for number of blocks"""
+        return self._number_of_blocks
+
+
+    @property
+    def next_block_number(self) -> int:
+        """Getter for number of next expected block"""
+        return self._next_block_number
+
+
+    @property
+    def is_complete(self) -> bool:
+        """Getter for transfer state, True if all blocks were received"""
+        return self._next_block_number > self._number_of_blocks
+
+
+    @property
+    def progress(self) -> DyscomFileTransferProgress:
+        """Getter for progress"""
+        elapsed_seconds = time.perf_counter() - self._start_time
+        return DyscomFileTransferProgress(self._next_block_number - 1, self._number_of_blocks, self._transferred_bytes,
+                                          self._filesize, elapsed_seconds,
+                                          self._transferred_bytes / elapsed_seconds if elapsed_seconds > 0 else 0.0)
+
+
+    @property
+    def on_progress(self) -> Callable[[DyscomFileTransferProgress], None] | None:
+        """Getter for progress callback"""
+        return self._on_progress
+
+
+    @on_progress.setter
+    def on_progress(self, value: Callable[[DyscomFileTransferProgress], None] | None):
+        """Setter for progress callback, called after each received block"""
+        self._on_progress = value
+
+
+    def add_block(self, packet: PacketDyscomSendFile) -> bool:
+        """Copies data of block to its position in buffer, returns False if block was already received"""
+        if packet.block_number < self._next_block_number:
+            return False
+        if packet.block_number > self._next_block_number:
+            raise ValueError(f"Dyscom file transfer missing block {self._next_block_number}, received block {packet.block_number}")
+
+        self._block_size = packet.block_size
+        start = (packet.block_number - 1) * packet.block_size
+        stop = min(start + len(packet.data), self._filesize)
+        if stop > start:
+            if self._file is None:
+                self._data[start:stop] = packet.data[0:stop - start]
+            else:
+                self._file.write(packet.data[0:stop - start])
+            self._transferred_bytes += stop - start
+        self._next_block_number += 1
+
+        if self._on_progress is not None:
+            self._on_progress(self.progress)
+        return True
+
+
+    async def receive(self, packet_buffer: PacketBuffer, send_ack: Callable[[int], None], timeout_in_seconds: float = 5):
+        """Reads DL_send_file packets from packet_buffer until all blocks were received, each block is
+        acknowledged with send_ack as soon as it arrives, so device can send next block. If no block
+        arrives within timeout_in_seconds, an exception is raised"""
+        last_block_time = time.perf_counter()
+        while not self.is_complete:
+            # process all available packages
+            for ack in packet_buffer.iter_packets_from_buffer():
+                if ack.command == Commands.DL_SEND_FILE:
+                    sf: PacketDyscomSendFile = ack
+                    send_ack(sf.block_number)
+                    self.add_block(sf)
+                    last_block_time = time.perf_counter()
+                    # check if we have all blocks
+                    if self.is_complete:
+                        break
+                else:
+                    logger().warning("Unexpected command: %d", ack.command)
+            else:
+                # no more packets available, wait for more data
+                remaining_time = last_block_time + timeout_in_seconds - time.perf_counter()
+                if remaining_time <= 0:
+                    raise ValueError(f"Dyscom file transfer, no block received within {timeout_in_seconds} s, "
+                                     f"next block: {self.next_block_number}")
+                await packet_buffer.wait_for_data(min(remaining_time, 1.0))
+
+        progress = self.progress
+        logger().info("Dyscom file transfer, transferred bytes: %d, duration: %.3f s, throughput: %.0f bytes/s",
+                      progress.transferred_bytes, progress.elapsed_seconds, progress.bytes_per_second)
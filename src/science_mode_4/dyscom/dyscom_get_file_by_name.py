@@ -21,12 +21,14 @@ class PacketDyscomGetFileByName(PacketDyscomGet):
     """Packet for dyscom get with type file by name"""
 
 
-    def __init__(self, filename: str = "", mode: DyscomFileByNameMode = DyscomFileByNameMode.MULTI_BLOCK):
+    def __init__(self, filename: str = "", mode: DyscomFileByNameMode = DyscomFileByNameMode.MULTI_BLOCK,
+                 block_offset: int = 0):
         super().__init__()
         self._type = DyscomGetType.FILE_BY_NAME
         self._kind = int(self._type)
         self._filename = filename
         self._mode = mode
+        self._block_offset = block_offset
 
 
     @property
@@ -41,12 +43,18 @@ class PacketDyscomGetFileByName(PacketDyscomGet):
         return self._mode
 
 
+    @property
+    def block_offset(self) -> int:
+        """Getter for block offset, number of blocks to skip (used to resume a transfer)"""
+        return self._block_offset
+
+
     def get_data(self) -> bytes:
         bb = ByteBuilder()
         bb.append_bytes(super().get_data())
         bb.append_bytes(DyscomHelper.str_to_bytes(self._filename, 128))
         # block offset
-        bb.append_value(0, 4, True)
+        bb.append_value(self._block_offset, 4, True)
         # file size
         bb.append_value(0, 8, True)
         # number of blocks
@@ -1,10 +1,12 @@
 """Provides low level layer"""
 
-import asyncio
-import struct
+from typing import Callable
+
+import numpy as np
 
 from science_mode_4.layer import Layer
 from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.packet import PacketAck
 from science_mode_4.utils.logger import logger
 from .dyscom_types import DyscomFrequencyOut, DyscomGetOperationModeType, DyscomInitState, DyscomPowerModuleType,\
     DyscomPowerModulePowerType, DyscomSignalType, DyscomSysState, DyscomSysType
@@ -22,7 +24,13 @@ from .dyscom_get_device_id import PacketDyscomGetAckDeviceId, PacketDyscomGetDev
 from .dyscom_get_file_info import DyscomGetFileInfoResult, PacketDyscomGetAckFileInfo, PacketDyscomGetFileInfo
 from .dyscom_get_battery_status import DyscomGetBatteryResult, PacketDyscomGetAckBatteryStatus, PacketDyscomGetBatteryStatus
 from .dyscom_sys import DyscomSysResult, PacketDyscomSys, PacketDyscomSysAck
-from .dyscom_send_file import PacketDyscomSendFile, PacketDyscomSendFileAck
+from .dyscom_send_file import PacketDyscomSendFileAck
+from .dyscom_send_live_data import PacketDyscomSendLiveData
+from .dyscom_live_data import DyscomLiveDataBlock
+from .dyscom_live_data_gap_detector import DyscomLiveDataGapDetector
+from .dyscom_measurement_decoder import DyscomMeasurementDecoder
+from .dyscom_file_transfer import DyscomFileTransfer, DyscomFileTransferProgress
+from .dyscom_file_downloader import DyscomFileDownloader
 
 
 class LayerDyscom(Layer):
@@ -63,10 +71,10 @@ class LayerDyscom(Layer):
         return ack.number_of_measurements
 
 
-    async def get_file_by_name(self, filename: str) -> DyscomGetFileByNameResult:
+    async def get_file_by_name(self, filename: str, block_offset: int = 0) -> DyscomGetFileByNameResult:
         """Sends dyscom get type file by name and waits for response, returns filename, block offset,
-        filesize, number of blocks and mode"""
-        p = PacketDyscomGetFileByName(filename)
+        filesize, number of blocks and mode. With block_offset the first blocks are skipped"""
+        p = PacketDyscomGetFileByName(filename, block_offset=block_offset)
         ack: PacketDyscomGetAckFileByName = await self.send_packet_and_wait(p)
         self._check_result_error(ack.result_error, "DyscomGetFileByName")
         logger().info("Dyscom get file by name, filename: %s, block offset: %d, filesize: %d, number of blocks: %d, mode: %s",\
@@ -186,8 +194,53 @@ class LayerDyscom(Layer):
         self.send_packet(p)
 
 
-    async def get_file_content(self, filename: str) -> bytes:
-        """Gets content of a file. Device must be in Idle operating mode"""
+    def read_live_block(self, max_count: int = 1024, channel_count: int = 5, block: np.ndarray | None = None,
+                        other_packets: list[PacketAck] | None = None,
+                        gap_detector: DyscomLiveDataGapDetector | None = None) -> np.ndarray:
+        """Reads connection once and returns all available live data packets (at most max_count rows) as
+        numpy structured array (see DyscomLiveDataBlock). If block is provided, it is used as storage and
+        a view of the filled rows is returned. Other packets are appended to other_packets if provided.
+        Each live data packet is checked by gap_detector if provided, if it fills gaps with nan, placeholder
+        rows for dropped packets are inserted (limited to free rows of block). Can not be used while packet
+        dispatcher is running, subscribe to DL_SEND_LIVE_DATA of dispatcher instead"""
+        self._check_no_packet_dispatcher("read_live_block")
+        if block is None:
+            block = DyscomLiveDataBlock.create_block(max_count, channel_count)
+        max_count = min(max_count, len(block))
+
+        live_data: list[PacketDyscomSendLiveData] = []
+        gaps: list[int] | None = None
+        if gap_detector is not None and gap_detector.fill_gaps_with_nan:
+            gaps = []
+        row_count = 0
+        for ack in self.packet_buffer.iter_packets_from_buffer():
+            if ack.command == Commands.DL_SEND_LIVE_DATA:
+                live_data.append(ack)
+                row_count += 1
+                if gap_detector is not None:
+                    dropped_count = gap_detector.check_packet(ack)
+                    if gaps is not None:
+                        gap = min(dropped_count, max_count - row_count)
+                        gaps.append(gap)
+                        row_count += gap
+            elif other_packets is not None:
+                other_packets.append(ack)
+            else:
+                logger().warning("Unexpected command: %d", ack.command)
+
+            if row_count >= max_count:
+                break
+
+        count = DyscomLiveDataBlock.fill_block(block, live_data, 0, gaps)
+        return block[0:count]
+
+
+    async def get_file_content(self, filename: str,
+                               on_progress: Callable[[DyscomFileTransferProgress], None] | None = None) -> bytes:
+        """Gets content of a file. Device must be in Idle operating mode. Each block is acknowledged as soon
+        as it is received, so device can send next block immediately. on_progress is called after each block.
+        Can not be used while packet dispatcher is running"""
+        self._check_no_packet_dispatcher("get_file_content")
         om = await self.get_operation_mode()
         if om != DyscomGetOperationModeType.IDLE:
             raise ValueError(f"Error wrong operation mode {om.name}")
@@ -198,73 +251,25 @@ class LayerDyscom(Layer):
         file_by_name = await self.get_file_by_name(filename)
         logger().info("Dyscom get file content, filesize: %d, number of blocks: %d",
                       file_by_name.filesize, file_by_name.number_of_blocks)
+        transfer = DyscomFileTransfer(file_by_name.filesize, file_by_name.number_of_blocks)
+        transfer.on_progress = on_progress
 
         # start measurement, so device send automatically SendFile packets
         await self.start()
-
-        result = bytes()
-        while True:
-            # process all available packages
-            ack = self.packet_buffer.get_packet_from_buffer()
-            if ack:
-                if ack.command == Commands.DL_SEND_FILE:
-                    # process SendFile data
-                    sf: PacketDyscomSendFile = ack
-                    result += sf.data
-
-                    # send acknowledge for this packet, so device can send
-                    # next block automatically
-                    self.send_send_file_ack(sf.block_number)
-
-                    # check if we have all blocks
-                    if sf.block_number >= file_by_name.number_of_blocks:
-                        break
-                else:
-                    logger().warning("Unexpected command: %d", ack.command)
-
-            await asyncio.sleep(0.01)
-
+        await transfer.receive(self.packet_buffer, self.send_send_file_ack)
         # stop measurement, we have all blocks
         await self.stop()
+        return bytes(transfer.data)
 
-        # trim to filesize (because SendFile sends always data with blocksize)
-        result = result[0:file_by_name.filesize]
-        return result
 
-
-    async def get_meas_file_content(self, filename: str) -> tuple[DyscomFrequencyOut, dict[DyscomSignalType, list[float]]]:
-        """Gets measurement data of a file. Device must be in Idle operating mode"""
+    async def get_meas_file_content(self, filename: str) -> tuple[DyscomFrequencyOut, dict[DyscomSignalType, np.ndarray]]:
+        """Gets measurement data of a file. Device must be in Idle operating mode. Returns sample rate and
+        values for each signal type (see DyscomMeasurementDecoder)"""
         meas_data = await self.get_file_content(filename)
+        return DyscomMeasurementDecoder.decode(meas_data)
+
 
-        result: dict[DyscomSignalType, list[float]] = {}
-        # signal types differ from DyscomSignalType enum
-        signal_type_map = {	1: 1, 2: 10, 3: 2, 4: 3, 5: 11, 6: 9, 7: 12}
-        signal_types: list[DyscomSignalType] = []
-        for x in range(meas_data[10]):
-            signal_type = DyscomSignalType(signal_type_map[meas_data[11+x]])
-            signal_types.append(signal_type)
-
-            result[signal_type] = []
-
-        # sample rate
-        sample_rate = DyscomFrequencyOut(meas_data[3])
-
-        # build string to unpack samples
-        # each sample consist of a time difference and n time signal type values
-        value_structure = "<I"
-        for x in range(len(signal_types)):
-            value_structure += "f"
-        unpack_struct = struct.Struct(value_structure)
-
-        # skip header
-        pos = 512
-        sample_size = unpack_struct.size
-        while pos + sample_size < len(meas_data):
-            r = unpack_struct.unpack(meas_data[pos:pos+sample_size])
-            for index, value in enumerate(signal_types):
-                result[value].append(r[1+index])
-
-            # advance to next sample
-            pos += sample_size
-
-        return sample_rate, result
+    async def download_file(self, filename: str, path: str, resume: bool = True,
+                            on_progress: Callable[[DyscomFileTransferProgress], None] | None = None):
+        """Downloads a file to path, see DyscomFileDownloader.download_file()"""
+        await DyscomFileDownloader(self).download_file(filename, path, resume, on_progress)
@@ -0,0 +1,88 @@
+"""Provides helper class for blocks of dyscom live data stored in numpy structured arrays"""
+
+import numpy as np
+
+from .dyscom_send_live_data import PacketDyscomSendLiveData
+
+
+class DyscomLiveDataBlock():
+    """Helper functions for blocks of live data, a block is a numpy structured array with one row per
+    live data packet and the fields number (packet number), time_offset, values (one float32 per channel)
+    and status (status bitmask per channel)"""
+
+
+    # dict with number of channels as key and dtype as value
+    _dtype_cache: dict[int, np.dtype] = {}
+
+
+    @staticmethod
+    def create_dtype(channel_count: int) -> np.dtype:
+        """Returns dtype of a block for channel_count channels"""
+        result = DyscomLiveDataBlock._dtype_cache.get(channel_count)
+        if result is None:
+            result = np.dtype([("number", np.uint8), ("time_offset", np.uint32),
+                               ("values", np.float32, (channel_count,)), ("status", np.uint8, (channel_count,))])
+            DyscomLiveDataBlock._dtype_cache[channel_count] = result
+        return result
+
+
+    @staticmethod
+    def create_block(size: int, channel_count: int = 5) -> np.ndarray:
+        """Creates a block with size rows for channel_count channels"""
+        return np.zeros(size, DyscomLiveDataBlock.create_dtype(channel_count))
+
+
+    @staticmethod
+    def get_channel_count(block: np.ndarray) -> int:
+        """Returns number of channels of block"""
+        return block.dtype["values"].shape[0]
+
+
+    @staticmethod
+    def fill_block(block: np.ndarray, packets: list[PacketDyscomSendLiveData], start: int = 0,
+                   gaps: list[int] | None = None) -> int:
+        """Writes packets into rows of block beginning at row start, returns number of written rows.
+        If gaps is provided, it contains for each packet the number of placeholder rows (values are nan)
+        inserted before packet"""
+        count = len(packets)
+        if count == 0:
+            return 0
+        row_count = count if gaps is None else count + sum(gaps)
+        if start + row_count > len(block):
+            raise ValueError(f"Block too small for packets {start + row_count} [0 - {len(block)}]")
+
+        channel_count = DyscomLiveDataBlock.get_channel_count(block)
+        for x in packets:
+            if x.number_of_channels != channel_count:
+                raise ValueError(f"Live data channel count mismatch {x.number_of_channels}, expected {channel_count}")
+
+        if row_count != count:
+            return DyscomLiveDataBlock._fill_block_with_gaps(block[start:start + row_count], packets, gaps)
+
+        # fill each column at once
+        rows = block[start:start + count]
+        rows["number"] = [x.number for x in packets]
+        rows["time_offset"] = [x.time_offset for x in packets]
+        rows["values"] = [x.values for x in packets]
+        rows["status"] = [x.status_values for x in packets]
+        return count
+
+
+    @staticmethod
+    def _fill_block_with_gaps(rows: np.ndarray, packets: list[PacketDyscomSendLiveData], gaps: list[int]) -> int:
+        """Writes packets and placeholder rows into rows, returns number of written rows"""
+        rows["time_offset"] = 0
+        rows["values"] = np.nan
+        rows["status"] = 0
+
+        # placeholder rows get consecutive packet numbers before packet
+        indices = np.arange(len(packets)) + np.cumsum(gaps)
+        numbers = np.empty(len(rows), np.int64)
+        for index, packet, gap in zip(indices, packets, gaps):
+            numbers[index - gap:index + 1] = np.arange(packet.number - gap, packet.number + 1)
+        rows["number"] = numbers % 64
+
+        rows["time_offset"][indices] = [x.time_offset for x in packets]
+        rows["values"][indices] = [x.values for x in packets]
+        rows["status"][indices] = [x.status_values for x in packets]
+        return len(rows)
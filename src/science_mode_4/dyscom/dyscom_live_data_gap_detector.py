@@ -0,0 +1,163 @@
+"""Provides a gap detector for dyscom live data"""
+
+from typing import Callable
+
+from .dyscom_send_live_data import PacketDyscomSendLiveData
+
+
+class DyscomLiveDataGapDetector():
+    """Checks continuity of a dyscom live data stream. Live data packets have a 6 bit packet number
+    (wraps from 63 to 0), so a gap is detected if packet number is not previous packet number + 1.
+    A packet number less than half the modulo behind previous packet number is a duplicate or late
+    packet and no gap, so gaps of more than 31 packets can not be detected. Time offset of a packet
+    is the time since previous sample, a jump is detected if it differs from expected time offset by
+    more than time_offset_tolerance (relative). If expected_time_offset is None, first non zero time
+    offset is used"""
+
+
+    NUMBER_MODULO = 64
+
+
+    def __init__(self, expected_time_offset: int | None = None, time_offset_tolerance: float = 0.5,
+                 fill_gaps_with_nan: bool = False):
+        self._initial_expected_time_offset = expected_time_offset
+        self._expected_time_offset = expected_time_offset
+        self._time_offset_tolerance = time_offset_tolerance
+        self._fill_gaps_with_nan = fill_gaps_with_nan
+        self._last_number: int | None = None
+
+        self._packet_count = 0
+        self._dropped_packet_count = 0
+        self._duplicate_packet_count = 0
+        self._time_offset_jump_count = 0
+
+        self._on_dropped_packets: Callable[[int, PacketDyscomSendLiveData], None] | None = None
+        self._on_duplicate_packet: Callable[[PacketDyscomSendLiveData], None] | None = None
+        self._on_time_offset_jump: Callable[[int, PacketDyscomSendLiveData], None] | None = None
+
+
+    @property
+    def expected_time_offset(self) -> int | None:
+        """Getter for expected time offset"""
+        return self._expected_time_offset
+
+
+    @property
+    def fill_gaps_with_nan(self) -> bool:
+        """Getter for fill gaps with nan, if True block outputs contain a placeholder row
+        with nan values for each dropped packet"""
+        return self._fill_gaps_with_nan
+
+
+    @property
+    def packet_count(self) -> int:
+        """Getter for number of checked packets"""
+        return self._packet_count
+
+
+    @property
+    def dropped_packet_count(self) -> int:
+        """Getter for number of dropped packets"""
+        return self._dropped_packet_count
+
+
+    @property
+    def duplicate_packet_count(self) -> int:
+        """Getter for number of duplicate or late (out of order) packets"""
+        return self._duplicate_packet_count
+
+
+    @property
+    def time_offset_jump_count(self) -> int:
+        """Getter for number of time offset jumps"""
+        return self._time_offset_jump_count
+
+
+    @property
+    def on_dropped_packets(self) -> Callable[[int, PacketDyscomSendLiveData], None] | None:
+        """Getter for callback, that is called with number of dropped packets and packet after gap"""
+        return self._on_dropped_packets
+
+
+    @on_dropped_packets.setter
+    def on_dropped_packets(self, value: Callable[[int, PacketDyscomSendLiveData], None] | None):
+        """Setter for callback, that is called with number of dropped packets and packet after gap"""
+        self._on_dropped_packets = value
+
+
+    @property
+    def on_duplicate_packet(self) -> Callable[[PacketDyscomSendLiveData], None] | None:
+        """Getter for callback, that is called with duplicate or late packet"""
+        return self._on_duplicate_packet
+
+
+    @on_duplicate_packet.setter
+    def on_duplicate_packet(self, value: Callable[[PacketDyscomSendLiveData], None] | None):
+        """Setter for callback, that is called with duplicate or late packet"""
+        self._on_duplicate_packet = value
+
+
+    @property
+    def on_time_offset_jump(self) -> Callable[[int, PacketDyscomSendLiveData], None] | None:
+        """Getter for callback, that is called with expected time offset and packet with time offset jump"""
+        return self._on_time_offset_jump
+
+
+    @on_time_offset_jump.setter
+    def on_time_offset_jump(self, value: Callable[[int, PacketDyscomSendLiveData], None] | None):
+        """Setter for callback, that is called with expected time offset and packet with time offset jump"""
+        self._on_time_offset_jump = value
+
+
+    def reset(self):
+        """Resets counters and state, e.g. when a new measurement is started"""
+        self._expected_time_offset = self._initial_expected_time_offset
+        self._last_number = None
+        self._packet_count = 0
+        self._dropped_packet_count = 0
+        self._duplicate_packet_count = 0
+        self._time_offset_jump_count = 0
+
+
+    def check_packet(self, packet: PacketDyscomSendLiveData) -> int:
+        """Checks packet against previous packet, updates counters and calls callbacks.
+        Returns number of dropped packets before packet"""
+        self._packet_count += 1
+        last_number = self._last_number
+        if last_number is None:
+            # first packet has no predecessor and time offset is always zero
+            self._last_number = packet.number
+            return 0
+
+        dropped_count = 0
+        delta = (packet.number - last_number) % self.NUMBER_MODULO
+        if delta == 0 or delta > self.NUMBER_MODULO // 2:
+            # packet number is not after previous packet number, so next packet
+            # is still checked against previous packet number
+            self._duplicate_packet_count += 1
+            if self._on_duplicate_packet is not None:
+                self._on_duplicate_packet(packet)
+        else:
+            self._last_number = packet.number
+            if delta > 1:
+                dropped_count = delta - 1
+                self._dropped_packet_count += dropped_count
+                if self._on_dropped_packets is not None:
+                    self._on_dropped_packets(dropped_count, packet)
+
+        self._check_time_offset(packet)
+        return dropped_count
+
+
+    def _check_time_offset(self, packet: PacketDyscomSendLiveData):
+        """Checks if time offset of packet differs from expected time offset"""
+        time_offset = packet.time_offset
+        if self._expected_time_offset is None:
+            if time_offset != 0:
+                self._expected_time_offset = time_offset
+            return
+
+        if abs(time_offset - self._expected_time_offset) > self._expected_time_offset * self._time_offset_tolerance:
+            self._time_offset_jump_count += 1
+            if self._on_time_offset_jump is not None:
+                self._on_time_offset_jump(self._expected_time_offset, packet)
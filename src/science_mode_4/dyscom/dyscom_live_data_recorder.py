@@ -0,0 +1,213 @@
+"""Provides classes to record dyscom live data in a binary columnar file and to read such files"""
+
+import csv
+import json
+import struct
+from typing import Any, BinaryIO, Iterator
+
+import numpy as np
+
+from .ads129x.ads129x import Ads129x
+from .dyscom_init import DyscomInitParams, DyscomInitResult
+from .dyscom_live_data import DyscomLiveDataBlock
+
+
+class DyscomLiveDataRecorder():
+    """Writes blocks of live data (see DyscomLiveDataBlock) to an append only binary file. File starts with
+    magic bytes, length of header (uint32) and a JSON header describing columns, init parameters and ADS129x
+    register map. Rows are buffered and written as chunks of chunk_size rows, each chunk consists of chunk
+    header (magic bytes and row count) followed by each column as contiguous array (values and status are
+    stored channel by channel). An interrupted recording loses at most the rows of the current chunk"""
+
+
+    MAGIC = b"SM4REC01"
+    CHUNK_MAGIC = b"CHNK"
+    HEADER_LENGTH = struct.Struct("<I")
+    CHUNK_HEADER = struct.Struct("<4sI")
+    VERSION = 1
+
+
+    def __init__(self, filename: str, init_params: DyscomInitParams | None = None, init_result: DyscomInitResult | None = None,
+                 channel_count: int = 5, chunk_size: int = 4096):
+        self._chunk = DyscomLiveDataBlock.create_block(chunk_size, channel_count)
+        self._chunk_row_count = 0
+        self._row_count = 0
+        self._file: BinaryIO = open(filename, "wb") # pylint: disable=consider-using-with
+
+        header = DyscomLiveDataRecorder._create_header(channel_count, init_params, init_result)
+        self._file.write(DyscomLiveDataRecorder.MAGIC)
+        self._file.write(DyscomLiveDataRecorder.HEADER_LENGTH.pack(len(header)))
+        self._file.write(header)
+
+
+    @property
+    def row_count(self) -> int:
+        """Getter for number of recorded rows"""
+        return self._row_count
+
+
+    @property
+    def is_closed(self) -> bool:
+        """Getter for file state"""
+        return self._file.closed
+
+
+    def write_block(self, block: np.ndarray):
+        """Appends rows of block, e.g. result of LayerDyscom.read_live_block()"""
+        position = 0
+        while position < len(block):
+            count = min(len(block) - position, len(self._chunk) - self._chunk_row_count)
+            self._chunk[self._chunk_row_count:self._chunk_row_count + count] = block[position:position + count]
+            self._chunk_row_count += count
+            self._row_count += count
+            position += count
+            if self._chunk_row_count == len(self._chunk):
+                self._write_chunk()
+
+
+    def flush(self):
+        """Writes buffered rows as chunk and flushes file"""
+        self._write_chunk()
+        self._file.flush()
+
+
+    def close(self):
+        """Writes buffered rows and closes file"""
+        if not self._file.closed:
+            self._write_chunk()
+            self._file.close()
+
+
+    def _write_chunk(self):
+        """Writes buffered rows as chunk"""
+        if self._chunk_row_count == 0:
+            return
+
+        chunk = self._chunk[0:self._chunk_row_count]
+        self._file.write(DyscomLiveDataRecorder.CHUNK_HEADER.pack(DyscomLiveDataRecorder.CHUNK_MAGIC, len(chunk)))
+        for name in chunk.dtype.names:
+            # transpose, so that each channel is stored contiguous
+            self._file.write(np.ascontiguousarray(chunk[name].T).tobytes())
+        self._chunk_row_count = 0
+
+
+    @staticmethod
+    def _create_header(channel_count: int, init_params: DyscomInitParams | None, init_result: DyscomInitResult | None) -> bytes:
+        """Creates JSON header"""
+        dtype = DyscomLiveDataBlock.create_dtype(channel_count)
+        header: dict[str, Any] = {"version": DyscomLiveDataRecorder.VERSION, "channel_count": channel_count,
+                                  "columns": [{"name": name, "dtype": dtype[name].base.str, "shape": list(dtype[name].shape)}
+                                              for name in dtype.names]}
+        if init_params is not None:
+            header["init_params"] = {"signal_type": [x.name for x in init_params.signal_type],
+                                     "filter": init_params.filter.name,
+                                     "flags": sorted(x.name for x in init_params.flags),
+                                     "sync_signal": init_params.sync_signal,
+                                     "proband_name": init_params.proband_name,
+                                     "investigator_name": init_params.investigator_name,
+                                     "proband_number": init_params.proband_number,
+                                     "start_time": init_params.start_time.isoformat(),
+                                     "duration_in_seconds": init_params.duration.total_seconds(),
+                                     "data": init_params.get_data().hex()}
+            header["register_map_ads129x"] = init_params.register_map_ads129x.get_data().hex()
+        if init_result is not None:
+            header["init_result"] = {"measurement_file_id": init_result.measurement_file_id,
+                                     "init_state": init_result.init_state.name,
+                                     "frequency_out": init_result.frequency_out.name}
+            # register map of device is more reliable than requested register map
+            header["register_map_ads129x"] = init_result.register_map_ads129x.get_data().hex()
+        return json.dumps(header).encode()
+
+
+class DyscomLiveDataRecording():
+    """Reads files written by DyscomLiveDataRecorder"""
+
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        with open(filename, "rb") as f:
+            self._header, self._data_offset = DyscomLiveDataRecording._read_header(f)
+        self._channel_count: int = self._header["channel_count"]
+
+
+    @property
+    def header(self) -> dict[str, Any]:
+        """Getter for header"""
+        return self._header
+
+
+    @property
+    def channel_count(self) -> int:
+        """Getter for number of channels"""
+        return self._channel_count
+
+
+    @property
+    def register_map_ads129x(self) -> Ads129x | None:
+        """Getter for ADS129x register map, None if it was not recorded"""
+        data = self._header.get("register_map_ads129x")
+        if data is None:
+            return None
+        result = Ads129x()
+        result.set_data(bytes.fromhex(data))
+        return result
+
+
+    def iter_chunks(self) -> Iterator[np.ndarray]:
+        """Yields each chunk as block (see DyscomLiveDataBlock), an incomplete last chunk is ignored"""
+        dtype = DyscomLiveDataBlock.create_dtype(self._channel_count)
+        with open(self._filename, "rb") as f:
+            f.seek(self._data_offset)
+            while True:
+                chunk_header = f.read(DyscomLiveDataRecorder.CHUNK_HEADER.size)
+                if len(chunk_header) < DyscomLiveDataRecorder.CHUNK_HEADER.size:
+                    break
+                magic, row_count = DyscomLiveDataRecorder.CHUNK_HEADER.unpack(chunk_header)
+                if magic != DyscomLiveDataRecorder.CHUNK_MAGIC:
+                    raise ValueError(f"Recording invalid chunk at position {f.tell() - len(chunk_header)}")
+
+                data = f.read(row_count * dtype.itemsize)
+                if len(data) < row_count * dtype.itemsize:
+                    break
+
+                block = np.empty(row_count, dtype)
+                position = 0
+                for name in dtype.names:
+                    column = dtype[name]
+                    values = np.frombuffer(data, column.base, row_count * column.itemsize // column.base.itemsize, position)
+                    # columns with shape are stored channel by channel
+                    block[name] = values.reshape(column.shape + (row_count,)).T
+                    position += row_count * column.itemsize
+                yield block
+
+
+    def read_block(self) -> np.ndarray:
+        """Returns all rows as one block"""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return DyscomLiveDataBlock.create_block(0, self._channel_count)
+        return np.concatenate(chunks)
+
+
+    def to_csv(self, csv_filename: str):
+        """Converts recording to a .csv file with columns package_nr, Channel 1 .. Channel n and time_delta"""
+        with open(csv_filename, "w", encoding="utf-8", newline="") as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(["package_nr"] + [f"Channel {x + 1}" for x in range(self._channel_count)] + ["time_delta"])
+            for block in self.iter_chunks():
+                rows = zip(block["number"].tolist(), block["values"].tolist(), block["time_offset"].tolist())
+                csv_writer.writerows([number] + values + [time_offset] for number, values, time_offset in rows)
+
+
+    @staticmethod
+    def _read_header(f: BinaryIO) -> tuple[dict[str, Any], int]:
+        """Reads and checks file header, returns header and position of first chunk"""
+        magic = f.read(len(DyscomLiveDataRecorder.MAGIC))
+        if magic != DyscomLiveDataRecorder.MAGIC:
+            raise ValueError(f"Recording invalid magic {magic}")
+        header_length = DyscomLiveDataRecorder.HEADER_LENGTH.unpack(f.read(DyscomLiveDataRecorder.HEADER_LENGTH.size))[0]
+        header = json.loads(f.read(header_length).decode())
+        version = header.get("version")
+        if version != DyscomLiveDataRecorder.VERSION:
+            raise ValueError(f"Recording unsupported version {version}")
+        return header, f.tell()
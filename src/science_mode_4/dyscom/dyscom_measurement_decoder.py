@@ -0,0 +1,91 @@
+"""Provides helper class to decode dyscom measurement files with numpy structured arrays"""
+
+import numpy as np
+
+from .dyscom_types import DyscomFrequencyOut, DyscomSignalType
+
+
+class DyscomMeasurementDecoder():
+    """Helper functions to decode measurement files stored by device. A measurement file consists of a header
+    with HEADER_SIZE bytes (sample rate at byte 3, number of signal types at byte 10 and signal types beginning
+    with byte 11) followed by fixed size records, one per sample. Each record has the fields time_delta
+    (time since previous sample) and values (one float32 per signal type), all little endian"""
+
+
+    HEADER_SIZE = 512
+    # signal types in measurement files differ from DyscomSignalType enum
+    SIGNAL_TYPE_MAP = {1: DyscomSignalType.UNKNOWN, 2: DyscomSignalType.TIME, 3: DyscomSignalType.BI,
+                       4: DyscomSignalType.EMG_1, 5: DyscomSignalType.PUSHBUTTON, 6: DyscomSignalType.EMG_2,
+                       7: DyscomSignalType.BREATHING}
+
+    SAMPLES_PER_SECOND = {DyscomFrequencyOut.SAMPLES_PER_SECOND_32K: 32000, DyscomFrequencyOut.SAMPLES_PER_SECOND_16K: 16000,
+                          DyscomFrequencyOut.SAMPLES_PER_SECOND_8K: 8000, DyscomFrequencyOut.SAMPLES_PER_SECOND_4K: 4000,
+                          DyscomFrequencyOut.SAMPLES_PER_SECOND_2K: 2000, DyscomFrequencyOut.SAMPLES_PER_SECOND_1K: 1000,
+                          DyscomFrequencyOut.SAMPLES_PER_SECOND_500: 500, DyscomFrequencyOut.SAMPLES_PER_SECOND_250: 250}
+
+    _SAMPLE_RATE_OFFSET = 3
+    _SIGNAL_TYPE_COUNT_OFFSET = 10
+    _SIGNAL_TYPE_OFFSET = 11
+
+    # dict with number of signal types as key and dtype as value
+    _dtype_cache: dict[int, np.dtype] = {}
+
+
+    @staticmethod
+    def create_dtype(signal_type_count: int) -> np.dtype:
+        """Returns dtype of a record for signal_type_count signal types"""
+        result = DyscomMeasurementDecoder._dtype_cache.get(signal_type_count)
+        if result is None:
+            result = np.dtype([("time_delta", "<u4"), ("values", "<f4", (signal_type_count,))])
+            DyscomMeasurementDecoder._dtype_cache[signal_type_count] = result
+        return result
+
+
+    @staticmethod
+    def parse_header(data: bytes | np.ndarray) -> tuple[DyscomFrequencyOut, list[DyscomSignalType]]:
+        """Returns sample rate and signal types from header of a measurement file"""
+        if len(data) < DyscomMeasurementDecoder.HEADER_SIZE:
+            raise ValueError(f"Measurement file too small for header {len(data)}")
+
+        sample_rate = DyscomFrequencyOut(int(data[DyscomMeasurementDecoder._SAMPLE_RATE_OFFSET]))
+        start = DyscomMeasurementDecoder._SIGNAL_TYPE_OFFSET
+        count = int(data[DyscomMeasurementDecoder._SIGNAL_TYPE_COUNT_OFFSET])
+        signal_types: list[DyscomSignalType] = []
+        for x in data[start:start + count]:
+            signal_type = DyscomMeasurementDecoder.SIGNAL_TYPE_MAP.get(int(x))
+            if signal_type is None:
+                raise ValueError(f"Measurement file unknown signal type {int(x)}")
+            signal_types.append(signal_type)
+        return sample_rate, signal_types
+
+
+    @staticmethod
+    def decode_records(data: bytes | np.ndarray, signal_type_count: int) -> np.ndarray:
+        """Returns all complete records after header as structured array, that is a view of data (no copy).
+        data may be anything supporting the buffer protocol, e.g. bytes, bytearray or np.memmap"""
+        dtype = DyscomMeasurementDecoder.create_dtype(signal_type_count)
+        count = max(0, len(data) - DyscomMeasurementDecoder.HEADER_SIZE) // dtype.itemsize
+        return np.frombuffer(data, dtype, count, DyscomMeasurementDecoder.HEADER_SIZE)
+
+
+    @staticmethod
+    def get_columns(records: np.ndarray, signal_types: list[DyscomSignalType]) -> dict[DyscomSignalType, np.ndarray]:
+        """Returns values of records for each signal type as views (no copy)"""
+        values = records["values"]
+        return {signal_type: values[:, index] for index, signal_type in enumerate(signal_types)}
+
+
+    @staticmethod
+    def decode(data: bytes | np.ndarray) -> tuple[DyscomFrequencyOut, dict[DyscomSignalType, np.ndarray]]:
+        """Decodes content of a measurement file, returns sample rate and values for each signal type
+        as views of data (no copy)"""
+        sample_rate, signal_types = DyscomMeasurementDecoder.parse_header(data)
+        records = DyscomMeasurementDecoder.decode_records(data, len(signal_types))
+        return sample_rate, DyscomMeasurementDecoder.get_columns(records, signal_types)
+
+
+    @staticmethod
+    def decode_file(filename: str) -> tuple[DyscomFrequencyOut, dict[DyscomSignalType, np.ndarray]]:
+        """Decodes a measurement file on disk (e.g. written by download_file()), file is memory mapped, so
+        only accessed parts are read"""
+        return DyscomMeasurementDecoder.decode(np.memmap(filename, np.uint8, "r"))
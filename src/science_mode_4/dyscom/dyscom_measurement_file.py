@@ -0,0 +1,125 @@
+"""Provides a class to read dyscom measurement files stored on disk"""
+
+import os
+
+import numpy as np
+
+from .dyscom_measurement_decoder import DyscomMeasurementDecoder
+from .dyscom_types import DyscomFrequencyOut, DyscomSignalType
+
+
+class DyscomMeasurementFile():
+    """Reads a measurement file on disk (e.g. written by download_file()). Only the header is read when the
+    object is created, records are memory mapped on first access, so only accessed parts of the file are read.
+    Records are a numpy structured array (see DyscomMeasurementDecoder), indexing the object returns records.
+    Time of a sample is the sum of time_delta of all records since first sample, so gaps and rate changes are
+    considered"""
+
+
+    # time_delta of records is in microseconds
+    _TIME_DELTA_PER_SECOND = 1_000_000
+
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        with open(filename, "rb") as f:
+            header = f.read(DyscomMeasurementDecoder.HEADER_SIZE)
+        self._sample_rate, self._signal_types = DyscomMeasurementDecoder.parse_header(header)
+        self._samples_per_second = DyscomMeasurementDecoder.SAMPLES_PER_SECOND.get(self._sample_rate, 0)
+        record_size = DyscomMeasurementDecoder.create_dtype(len(self._signal_types)).itemsize
+        self._sample_count = (os.path.getsize(filename) - DyscomMeasurementDecoder.HEADER_SIZE) // record_size
+        self._records: np.ndarray | None = None
+        self._sample_times: np.ndarray | None = None
+
+
+    @property
+    def filename(self) -> str:
+        """Getter for filename"""
+        return self._filename
+
+
+    @property
+    def sample_rate(self) -> DyscomFrequencyOut:
+        """Getter for sample rate"""
+        return self._sample_rate
+
+
+    @property
+    def samples_per_second(self) -> int:
+        """Getter for samples per second"""
+        return self._samples_per_second
+
+
+    @property
+    def signal_types(self) -> list[DyscomSignalType]:
+        """Getter for signal types"""
+        return self._signal_types
+
+
+    @property
+    def sample_count(self) -> int:
+        """Getter for number of samples"""
+        return self._sample_count
+
+
+    @property
+    def duration_in_seconds(self) -> float:
+        """Getter for duration, calculated from sample rate"""
+        return self._sample_count / self._samples_per_second if self._samples_per_second > 0 else 0.0
+
+
+    @property
+    def records(self) -> np.ndarray:
+        """Getter for records, file is memory mapped on first access"""
+        if self._records is None:
+            if self._sample_count == 0:
+                self._records = np.zeros(0, DyscomMeasurementDecoder.create_dtype(len(self._signal_types)))
+            else:
+                self._records = np.memmap(self._filename, DyscomMeasurementDecoder.create_dtype(len(self._signal_types)),
+                                          "r", DyscomMeasurementDecoder.HEADER_SIZE, (self._sample_count,))
+        return self._records
+
+
+    @property
+    def sample_times(self) -> np.ndarray:
+        """Getter for time of each sample in microseconds since first sample, calculated on first access,
+        so time_delta of all records is read once"""
+        if self._sample_times is None:
+            self._sample_times = np.cumsum(self.records["time_delta"], dtype=np.int64)
+            if self._sample_count > 0:
+                # first sample is at time 0, its time_delta refers to a sample before measurement
+                self._sample_times -= self._sample_times[0]
+        return self._sample_times
+
+
+    def __len__(self) -> int:
+        return self._sample_count
+
+
+    def __getitem__(self, key: int | slice) -> np.ndarray:
+        return self.records[key]
+
+
+    def get_values(self, signal_type: DyscomSignalType, records: np.ndarray | None = None) -> np.ndarray:
+        """Returns values of signal_type of records (all records if None) as view"""
+        if signal_type not in self._signal_types:
+            raise ValueError(f"Measurement file has no signal type {signal_type.name}")
+        if records is None:
+            records = self.records
+        return records["values"][..., self._signal_types.index(signal_type)]
+
+
+    def get_index(self, time_in_seconds: float) -> int:
+        """Returns index of first sample at or after time_in_seconds (see sample_times), limited to valid range"""
+        time_in_microseconds = round(time_in_seconds * DyscomMeasurementFile._TIME_DELTA_PER_SECOND)
+        return int(np.searchsorted(self.sample_times, time_in_microseconds, "left"))
+
+
+    def get_time_range(self, start_in_seconds: float, stop_in_seconds: float) -> np.ndarray:
+        """Returns records from start_in_seconds (included) to stop_in_seconds (excluded)"""
+        return self.records[self.get_index(start_in_seconds):self.get_index(stop_in_seconds)]
+
+
+    def close(self):
+        """Releases memory mapped records, records returned before remain valid"""
+        self._records = None
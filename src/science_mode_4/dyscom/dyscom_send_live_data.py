@@ -11,29 +11,27 @@ class PacketDyscomSendLiveData(PacketAck):
     because it is send automatically from device)"""
 
 
+    # dict with number of channels as key and struct to unpack whole packet as value
+    _struct_cache: dict[int, struct.Struct] = {}
+    # status flags for each possible status byte value
+    _STATUS_FLAGS: list[frozenset[DyscomPowerLiveDataStatusFlag]] = \
+        [frozenset(f for f in DyscomPowerLiveDataStatusFlag if status & (1 << f) == 1) for status in range(256)]
+
+
     def __init__(self, data: bytes):
         super().__init__(data)
         self._command = Commands.DL_SEND_LIVE_DATA
         self._number_of_channels = 0
         self._time_offset = 0
-        self._samples: list[DyscomElectrodeSample] = []
+        # value, signal type and status for each channel, samples are created from it on first access
+        self._raw_samples: tuple = ()
+        self._samples: list[DyscomElectrodeSample] | None = None
 
         if not data is None:
-            self._number_of_channels = data[0]
-            self._time_offset = int.from_bytes(data[1:5], "big")
-
-            for x in range(self._number_of_channels):
-                start_index = 5 + x * 6
-
-                sample = DyscomElectrodeSample()
-                sample.value = struct.unpack_from(">f", data[start_index:start_index+4])[0]
-                sample.signal_type = DyscomSignalType(data[start_index+4])
-                status = data[start_index+5]
-                for f in DyscomPowerLiveDataStatusFlag:
-                    if status & (1 << f) == 1:
-                        sample.status.add(f)
-
-                self._samples.append(sample)
+            unpacked = PacketDyscomSendLiveData._get_struct(data[0]).unpack_from(data)
+            self._number_of_channels = unpacked[0]
+            self._time_offset = unpacked[1]
+            self._raw_samples = unpacked[2:]
 
 
     @property
@@ -51,13 +49,44 @@ class PacketDyscomSendLiveData(PacketAck):
     @property
     def samples(self) -> list[DyscomElectrodeSample]:
         """Getter for samples"""
+        if self._samples is None:
+            self._samples = []
+            raw_samples = self._raw_samples
+            for x in range(0, len(raw_samples), 3):
+                sample = DyscomElectrodeSample(raw_samples[x], DyscomSignalType(raw_samples[x + 1]),
+                                               set(PacketDyscomSendLiveData._STATUS_FLAGS[raw_samples[x + 2]]))
+                self._samples.append(sample)
         return self._samples
 
 
+    @property
+    def values(self) -> tuple[float, ...]:
+        """Getter for sample values of all channels, faster than using samples"""
+        return self._raw_samples[0::3]
+
+
+    @property
+    def status_values(self) -> tuple[int, ...]:
+        """Getter for status bitmasks of all channels"""
+        return self._raw_samples[2::3]
+
+
     @property
     def status_error(self) -> bool:
         """Returns true if in any sample a status flag is set, false otherwise"""
-        for x in self._samples:
-            if len(x.status) != 0:
+        status_flags = PacketDyscomSendLiveData._STATUS_FLAGS
+        for x in self._raw_samples[2::3]:
+            if len(status_flags[x]) != 0:
                 return True
         return False
+
+
+    @staticmethod
+    def _get_struct(number_of_channels: int) -> struct.Struct:
+        """Returns struct to unpack a packet with number_of_channels channels"""
+        result = PacketDyscomSendLiveData._struct_cache.get(number_of_channels)
+        if result is None:
+            # number of channels, time offset and value, signal type and status for each channel
+            result = struct.Struct(">BI" + "fBB" * number_of_channels)
+            PacketDyscomSendLiveData._struct_cache[number_of_channels] = result
+        return result
@@ -0,0 +1,80 @@
+"""Provides a class to convert raw dyscom live data values to physical units"""
+
+import numpy as np
+
+from .ads129x.ads129x import Ads129x
+from .ads129x.ads129x_channel_settings_register import Ads129xChannelGain
+from .ads129x.ads129x_config_register_3 import Ads129xReferenceVoltage
+from .dyscom_types import DyscomSignalType
+
+
+class DyscomUnitConverter():
+    """Converts raw ADC values of ADS129x channels to microvolts or ohms. Gain of each channel and
+    reference voltage are taken from register map, e.g. DyscomInitResult.register_map_ads129x. Voltage
+    of a raw value is raw * VREF * 2 / (2^24 * GAIN), impedance is voltage divided by injected current.
+    Column i of values belongs to ADS129x channel i + 1, columns beyond ADS129x channels are not
+    converted (factor 1). Settings are copied, so later changes of register map do not affect converter"""
+
+
+    # injected current for bioimpedance measurement, see ADS129x manual
+    BI_CURRENT = 30e-6
+
+    GAIN = {Ads129xChannelGain.GAIN_1: 1, Ads129xChannelGain.GAIN_2: 2, Ads129xChannelGain.GAIN_3: 3,
+            Ads129xChannelGain.GAIN_4: 4, Ads129xChannelGain.GAIN_6: 6, Ads129xChannelGain.GAIN_8: 8,
+            Ads129xChannelGain.GAIN_12: 12}
+    REFERENCE_VOLTAGE = {Ads129xReferenceVoltage.VREF_2_4: 2.4, Ads129xReferenceVoltage.VREF_4_0: 4.0}
+
+
+    def __init__(self, register_map: Ads129x, current: float = BI_CURRENT):
+        self._reference_voltage = DyscomUnitConverter.REFERENCE_VOLTAGE[register_map.config_register_3.reference_voltage]
+        self._gains = np.array([DyscomUnitConverter.GAIN[x.gain] for x in
+                                [register_map.channel_1_setting_register, register_map.channel_2_setting_register,
+                                 register_map.channel_3_setting_register, register_map.channel_4_setting_register]])
+        self._current = current
+        # volts per raw value for each ADS129x channel
+        self._volt_factors = self._reference_voltage * 2 / (2**24 * self._gains)
+
+
+    @property
+    def reference_voltage(self) -> float:
+        """Getter for reference voltage in V"""
+        return self._reference_voltage
+
+
+    @property
+    def gains(self) -> np.ndarray:
+        """Getter for gain of each ADS129x channel"""
+        return self._gains
+
+
+    @property
+    def current(self) -> float:
+        """Getter for injected current in A used for conversion to ohms"""
+        return self._current
+
+
+    def get_factors(self, signal_types: list[DyscomSignalType], channel_count: int = 5) -> np.ndarray:
+        """Returns factor for each of channel_count columns, that converts raw values to ohms for
+        signal type BI and to microvolts for other signal types (columns without signal type)"""
+        factors = np.ones(channel_count)
+        count = min(channel_count, len(self._volt_factors))
+        for index in range(count):
+            is_bi = index < len(signal_types) and signal_types[index] == DyscomSignalType.BI
+            factors[index] = self._volt_factors[index] / self._current if is_bi else self._volt_factors[index] * 1e6
+        return factors
+
+
+    def to_microvolts(self, values: np.ndarray) -> np.ndarray:
+        """Converts raw values (last axis is channel, e.g. block["values"]) to microvolts"""
+        return np.multiply(values, self.get_factors([], values.shape[-1]))
+
+
+    def to_ohms(self, values: np.ndarray) -> np.ndarray:
+        """Converts raw values (last axis is channel, e.g. block["values"]) to ohms"""
+        return np.multiply(values, self.get_factors([DyscomSignalType.BI] * values.shape[-1], values.shape[-1]))
+
+
+    def convert(self, values: np.ndarray, signal_types: list[DyscomSignalType]) -> np.ndarray:
+        """Converts raw values (last axis is channel, e.g. block["values"]) to ohms for signal type BI
+        and to microvolts for other signal types, signal_types is the order of init parameters"""
+        return np.multiply(values, self.get_factors(signal_types, values.shape[-1]))
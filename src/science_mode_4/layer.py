@@ -1,5 +1,6 @@
 """Provides base class for all ScienceMode layers"""
 
+from .protocol.packet_dispatcher import PacketDispatcher
 from .protocol.protocol_helper import ProtocolHelper
 from .protocol.types import ResultAndError
 from .protocol.packet import Packet, PacketAck
@@ -16,6 +17,7 @@ class Layer():
         self._packet_factory = packet_factory
         self._packet_number_generator = packet_number_generator
         self._packet_buffer = packet_buffer
+        self._packet_dispatcher: PacketDispatcher | None = None
 
 
     @property
@@ -24,6 +26,24 @@ class Layer():
         return self._packet_buffer
 
 
+    @packet_buffer.setter
+    def packet_buffer(self, value: PacketBuffer):
+        """Setter for packet buffer"""
+        self._packet_buffer = value
+
+
+    @property
+    def packet_dispatcher(self) -> PacketDispatcher | None:
+        """Getter for packet dispatcher"""
+        return self._packet_dispatcher
+
+
+    @packet_dispatcher.setter
+    def packet_dispatcher(self, value: PacketDispatcher | None):
+        """Setter for packet dispatcher, if set send_packet_and_wait() uses dispatcher"""
+        self._packet_dispatcher = value
+
+
     def send_packet(self, packet: Packet):
         """Generates a new packet number and send packet"""
         ack = ProtocolHelper.send_packet(packet, self._packet_number_generator.get_next_number(),
@@ -33,11 +53,21 @@ class Layer():
 
     async def send_packet_and_wait(self, packet: Packet) -> PacketAck:
         """Generates a new packet number, send packet and waits for response"""
+        if self._packet_dispatcher is not None:
+            return await self._packet_dispatcher.send_packet_and_wait(packet, self._packet_number_generator.get_next_number())
+
         ack = await ProtocolHelper.send_packet_and_wait(packet, self._packet_number_generator.get_next_number(),
                                                         self._packet_buffer)
         return ack
 
 
+    def _check_no_packet_dispatcher(self, function_name: str):
+        """Raises an exception if packet dispatcher is running, used by functions reading packets from packet buffer
+        directly, because these packets are consumed by dispatcher"""
+        if self._packet_dispatcher is not None:
+            raise ValueError(f"Error {function_name} can not be used while packet dispatcher is running")
+
+
     def _check_result_error(self, result_error: ResultAndError, packet_name: str):
         """Check if result_error contains an error and if yes prints packet_name"""
         if result_error != ResultAndError.NO_ERROR:
@@ -0,0 +1,206 @@
+"""Provides a dispatcher for concurrent commands waiting for acknowledges"""
+
+import asyncio
+import logging
+from typing import Callable
+
+from science_mode_4.utils.logger import logger
+from science_mode_4.utils.packet_buffer import PacketBuffer
+from .commands import Commands
+from .packet import Packet, PacketAck
+from .protocol import Protocol
+
+
+# cached reference to avoid resolving logger for each packet
+_LOGGER = logger()
+
+
+class PacketDispatcher():
+    """Dispatches packets from a packet buffer. Acknowledges complete the future of the waiting command
+    (matched by acknowledge command and packet number), all other packets (e.g. live data) are passed
+    to subscribers. Multiple commands can wait for acknowledges at once and the buffer is never cleared.
+    While dispatcher is running, packets must not be read from packet buffer directly"""
+
+
+    def __init__(self, packet_buffer: PacketBuffer):
+        self._packet_buffer = packet_buffer
+        # dict with acknowledge command and packet number as key and future waiting for acknowledge as value
+        self._futures: dict[tuple[int, int], asyncio.Future] = {}
+        # dict with command as key and list of callbacks as value
+        self._subscribers: dict[int, list[Callable[[PacketAck], None]]] = {}
+        self._task: asyncio.Task | None = None
+        self._error: Exception | None = None
+
+
+    @property
+    def packet_buffer(self) -> PacketBuffer:
+        """Getter for packet buffer"""
+        return self._packet_buffer
+
+
+    @packet_buffer.setter
+    def packet_buffer(self, value: PacketBuffer):
+        """Setter for packet buffer"""
+        self._packet_buffer = value
+
+
+    @property
+    def open_future_count(self) -> int:
+        """Getter for number of commands waiting for acknowledge"""
+        return len(self._futures)
+
+
+    @property
+    def is_running(self) -> bool:
+        """Getter for dispatch task state, False if task stopped because of an error"""
+        return self._task is not None and self._error is None
+
+
+    @property
+    def error(self) -> Exception | None:
+        """Getter for error, that stopped dispatch task"""
+        return self._error
+
+
+    def subscribe(self, command: int, callback: Callable[[PacketAck], None]):
+        """Calls callback for each packet with command, that is not an awaited acknowledge"""
+        self._subscribers.setdefault(command, []).append(callback)
+
+
+    def unsubscribe(self, command: int, callback: Callable[[PacketAck], None]):
+        """Removes callback for command"""
+        callbacks = self._subscribers.get(command)
+        if callbacks is not None and callback in callbacks:
+            callbacks.remove(callback)
+
+
+    def start(self):
+        """Starts task processing incoming packets, must be called with a running event loop"""
+        # task is restarted, if it was stopped because of an error
+        if self._task is None or self._task.done():
+            self._error = None
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+
+    async def stop(self):
+        """Stops task processing incoming packets, all waiting commands get an exception"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self._fail_all_futures(ValueError("Packet dispatcher stopped"))
+
+
+    def send_packet(self, packet: Packet, packet_number: int) -> asyncio.Future:
+        """Send a packet and returns a future, that is completed when the acknowledge arrives"""
+        if self._error is not None:
+            raise ValueError(f"Error in packet dispatcher {self._error}") from self._error
+
+        packet.number = packet_number
+        key = packet.command + 1, packet.number
+        if key in self._futures:
+            raise ValueError(f"Acknowledge already awaited, command {packet.command}, number {packet.number}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        self._packet_buffer.add_open_acknowledge(packet)
+        self._packet_buffer.connection.write(Protocol.packet_to_bytes(packet))
+        return future
+
+
+    async def send_packet_and_wait(self, packet: Packet, packet_number: int, timeout_in_seconds = 5) -> PacketAck:
+        """Send a packet and wait for response, if no response arrives raise an exception,
+        this function assumes that the response has the same packet number and ack command must be command+1"""
+        send_time = asyncio.get_running_loop().time()
+        future = self.send_packet(packet, packet_number)
+        key = packet.command + 1, packet.number
+        try:
+            ack = await asyncio.wait_for(future, timeout_in_seconds)
+        except asyncio.TimeoutError:
+            self._packet_buffer.statistics.ack_timeout_count += 1
+            raise ValueError(f"No valid answer for packet {packet.command}") from None
+        finally:
+            # we got no response (timeout or cancelled), so remove open acknowledges
+            if self._futures.get(key) is future:
+                del self._futures[key]
+                self._packet_buffer.remove_open_acknowledge(packet)
+
+        self._packet_buffer.statistics.add_ack_latency(packet.command, asyncio.get_running_loop().time() - send_time)
+        return ack
+
+
+    def dispatch(self) -> int:
+        """Reads connection once and dispatches all available packets, returns number of dispatched packets"""
+        count = 0
+        for ack in self._packet_buffer.iter_packets_from_buffer():
+            count += 1
+            self._dispatch_packet(ack)
+        return count
+
+
+    async def _run(self):
+        """Task function processing incoming packets, an error stops task and is passed to all waiting commands"""
+        try:
+            while True:
+                self.dispatch()
+                await self._packet_buffer.wait_for_data(0.1)
+        except Exception as e: # pylint:disable=broad-exception-caught
+            _LOGGER.error("Error in packet dispatcher: %s", e)
+            self._error = e
+            self._fail_all_futures(ValueError(f"Error in packet dispatcher {e}"))
+
+
+    def _dispatch_packet(self, ack: PacketAck):
+        """Completes waiting future or calls subscribers"""
+        future = self._futures.pop((ack.command, ack.number), None)
+        if future is not None:
+            if not future.done():
+                future.set_result(ack)
+            return
+
+        # check if we got an error
+        if ack.command in [Commands.GENERAL_ERROR, Commands.UNKNOWN_COMMAND]:
+            self._fail_futures(ack)
+            return
+
+        callbacks = self._subscribers.get(ack.command)
+        if callbacks:
+            for callback in callbacks:
+                # an error in a subscriber must not stop dispatching
+                try:
+                    callback(ack)
+                except Exception as e: # pylint:disable=broad-exception-caught
+                    _LOGGER.error("Error in packet dispatcher subscriber, command: %s, error: %s", ack.command, e)
+        else:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Unhandled packet, command: %s, number: %d", ack.command, ack.number)
+
+
+    def _fail_futures(self, ack: PacketAck):
+        """Raises an exception in waiting commands with packet number of ack,
+        or in all waiting commands if none matches"""
+        if ack.command == Commands.GENERAL_ERROR:
+            error = ValueError(f"General error packet {ack.result_error.name}")
+        else:
+            error = ValueError(f"Unknown command packet {ack.result_error.name}")
+
+        self._packet_buffer.statistics.ack_error_count += 1
+        keys = [x for x in self._futures if x[1] == ack.number]
+        if len(keys) == 0:
+            keys = list(self._futures)
+        for key in keys:
+            future = self._futures.pop(key)
+            if not future.done():
+                future.set_exception(error)
+
+
+    def _fail_all_futures(self, error: Exception):
+        """Raises error in all waiting commands"""
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(error)
+        self._futures.clear()
@@ -1,9 +1,15 @@
 """Provides a packet factory class"""
 
+import logging
+
 from science_mode_4.utils.logger import logger
 from .packet import Packet, PacketAck
 
 
+# cached reference to avoid resolving logger for each packet
+_LOGGER = logger()
+
+
 class PacketFactory():
     """Packet factory class, it is possible to register multiple packet classes
     per command distinguished by kind"""
@@ -18,7 +24,7 @@ class PacketFactory():
 
     def register_packet(self, packet: Packet):
         """Register a packet"""
-        logger().debug("Register packet: %s", packet.__class__.__name__)
+        _LOGGER.debug("Register packet: %s", packet.__class__.__name__)
         self.data[packet.command, packet.kind] = packet
 
 
@@ -39,7 +45,8 @@ class PacketFactory():
             proto = self.data[command, kind]
             copy = proto.create_copy_with_data(data)
         copy.number = number
-        logger().debug("Read package, %s", copy)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Read package, %s", copy)
         return copy
 
 
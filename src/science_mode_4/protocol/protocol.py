@@ -1,11 +1,17 @@
 """Provides helper class for ScienceMode protocol"""
 
-from science_mode_4.utils.byte_builder import ByteBuilder
+import logging
+from typing import Any, Callable, Iterable
+
 from science_mode_4.utils.crc16 import Crc16
 from science_mode_4.utils import logger
 from .packet import Packet
 
 
+# cached reference to avoid resolving logger for each packet
+_LOGGER = logger()
+
+
 class Protocol:
     """Class for handling ScienceMode protocol packet"""
 
@@ -15,77 +21,180 @@ class Protocol:
     STUFFING_KEY = 0x55
 
 
+    # frame header with start byte and stuffed packet length and crc, values are set for each packet
+    _FRAME_HEADER_TEMPLATE = bytes([START_BYTE, STUFFING_BYTE, 0, STUFFING_BYTE, 0, STUFFING_BYTE, 0, STUFFING_BYTE, 0])
+    _STOP_BYTES = bytes([STOP_BYTE])
+    # 0xF0 does not always indicate a packet start, but 0xF0 followed by stuffing byte does
+    _PACKET_START_BYTES = bytes([START_BYTE, STUFFING_BYTE])
+    _START_BYTES = bytes([START_BYTE])
+    _STUFFING_BYTES = bytes([STUFFING_BYTE])
+    _STUFFED_START_BYTES = bytes([STUFFING_BYTE, STUFFING_KEY ^ START_BYTE])
+    _STUFFED_STOP_BYTES = bytes([STUFFING_BYTE, STUFFING_KEY ^ STOP_BYTE])
+    _STUFFED_STUFFING_BYTES = bytes([STUFFING_BYTE, STUFFING_KEY ^ STUFFING_BYTE])
+    # cache with command and packet number as key and stuffed command prefix and its crc as value
+    _command_prefix_cache: dict[tuple[int, int], tuple[bytes, int]] = {}
+
+
     @staticmethod
     def packet_to_bytes(packet: Packet) -> bytes:
         """Builds bytes from a packet"""
-        # build payload
-        bb = ByteBuilder()
-        # command and packet number
-        bb.set_bit_to_position(packet.command, 0, 10)
-        bb.set_bit_to_position(packet.number, 10, 6)
-        # swap command and packet number to ensure big endianness
-        bb.swap(0, 2)
-        # append packet data
-        bb.append_bytes(packet.get_data())
-        # stuff packet data
-        stuffed_packet_data = Protocol.stuff(bb.get_bytes())
-
-        bb.clear()
-
-        # stop byte
-        bb.append_byte(Protocol.START_BYTE)
-        # packet length
-        packet_length: int = len(stuffed_packet_data) + 10
-        bb.append_bytes(Protocol.stuff_byte(packet_length >> 8))
-        bb.append_bytes(Protocol.stuff_byte(packet_length))
-        # crc
-        crc_16 = Crc16.crc16_xmodem(stuffed_packet_data)
-        bb.append_bytes(Protocol.stuff_byte(crc_16 >> 8))
-        bb.append_bytes(Protocol.stuff_byte(crc_16))
-        # payload
-        bb.append_bytes(stuffed_packet_data)
-        # stop byte
-        bb.append_byte(Protocol.STOP_BYTE)
-
-        logger().debug("Build package, %s", packet)
-        result = bb.get_bytes()
+        result = Protocol.data_to_bytes(packet.command, packet.number, packet.get_data())
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Build package, %s", packet)
+        return result
+
+
+    @staticmethod
+    def data_to_bytes(command: int, number: int, data: bytes) -> bytes:
+        """Builds packet bytes from command, packet number and payload"""
+        stuffed_prefix, prefix_crc = Protocol._get_command_prefix(command, number)
+        stuffed_data = Protocol.stuff(data)
+
+        packet_length = len(stuffed_prefix) + len(stuffed_data) + 10
+        crc_16 = Crc16.crc16_xmodem(stuffed_data, prefix_crc)
+
+        # length and crc are always stuffed
+        result = bytearray(Protocol._FRAME_HEADER_TEMPLATE)
+        result[2] = Protocol.STUFFING_KEY ^ ((packet_length >> 8) & 0xFF)
+        result[4] = Protocol.STUFFING_KEY ^ (packet_length & 0xFF)
+        result[6] = Protocol.STUFFING_KEY ^ ((crc_16 >> 8) & 0xFF)
+        result[8] = Protocol.STUFFING_KEY ^ (crc_16 & 0xFF)
+        result += stuffed_prefix
+        result += stuffed_data
+        result += Protocol._STOP_BYTES
         return bytes(result)
 
 
     @staticmethod
     def is_valid_packet_data(buffer: bytes) -> bool:
         """Checks if buffer might contain a valid packet structure, does not check if payload is valid """
-        if len(buffer) == 0:
+        # check cheap conditions first to avoid crc calculation
+        if len(buffer) <= 10 or buffer[0] != Protocol.START_BYTE or buffer[-1] != Protocol.STOP_BYTE:
             return False
 
-        result = True
-
-        result &= len(buffer) > 10
-        result &= buffer[0] == Protocol.START_BYTE
-        result &= buffer[-1] == Protocol.STOP_BYTE
         # packet_length = int.from_bytes([Protocol.unstuffByte(data[2]), Protocol.unstuffByte(data[4])])
-        crc = int.from_bytes([Protocol.unstuff_byte(buffer[6]), Protocol.unstuff_byte(buffer[8])])
-        result &= crc == Crc16.crc16_xmodem(buffer[9:-1])
+        crc = (Protocol.unstuff_byte(buffer[6]) << 8) | Protocol.unstuff_byte(buffer[8])
+        return crc == Crc16.crc16_xmodem(buffer[9:-1])
+
+
+    @staticmethod
+    def is_valid_packet_data_list(buffers: Iterable[bytes]) -> list[bool]:
+        """Checks for each item of buffers if it might contain a valid packet structure, returns results in same order"""
+        buffers = list(buffers)
+        # crcs are calculated in one call for all buffers with valid structure
+        candidates = [x for x in buffers if len(x) > 10 and x[0] == Protocol.START_BYTE and x[-1] == Protocol.STOP_BYTE]
+        crcs = iter(Crc16.crc16_xmodem_list(x[9:-1] for x in candidates))
+
+        result: list[bool] = []
+        for x in buffers:
+            if len(x) > 10 and x[0] == Protocol.START_BYTE and x[-1] == Protocol.STOP_BYTE:
+                result.append(((Protocol.unstuff_byte(x[6]) << 8) | Protocol.unstuff_byte(x[8])) == next(crcs))
+            else:
+                result.append(False)
         return result
 
 
     @staticmethod
-    def find_packet_in_buffer(buffer: bytes) -> tuple[int, int] | None:
-        """Tries to find a valid packet in buffer, return start and stop index of packet if found or None otherwise"""
-        start = 0
+    def find_packet_in_buffer(buffer: bytes, start: int = 0) -> tuple[int, int] | None:
+        """Tries to find a valid packet in buffer beginning at index start, return start and stop index of packet
+        if found or None otherwise"""
+        result = Protocol._search_packet_in_buffer(buffer, start, Protocol.is_valid_packet_data)
+        if result is None:
+            return None
+        return result[0], result[1]
+
+
+    @staticmethod
+    def decode_packet_in_buffer(buffer: bytes, start: int = 0,
+                                on_invalid_frame: Callable[[int, int], None] | None = None) -> tuple[int, int, tuple[int, int, memoryview]] | None:
+        """Tries to find a valid packet in buffer beginning at index start, return start and stop index of packet
+        and decoded packet data (see decode_packet_data()) if found or None otherwise.
+        on_invalid_frame is called with start and stop index of each skipped invalid frame (wrong length or CRC)"""
+        return Protocol._search_packet_in_buffer(buffer, start, Protocol.decode_packet_data, on_invalid_frame)
+
+
+    @staticmethod
+    def decode_packet_data(buffer: bytes) -> tuple[int, int, memoryview] | None:
+        """Validates and decodes a packet in one pass, returns command, packet number and payload or None if buffer
+        contains no valid packet. Payload is a view of a new unstuffed bytes object, so it does not reference buffer"""
+        # check cheap conditions first to avoid crc calculation
+        if len(buffer) <= 10 or buffer[0] != Protocol.START_BYTE or buffer[-1] != Protocol.STOP_BYTE:
+            return None
+
+        stuffed_data = memoryview(buffer)[9:-1]
+        crc = (Protocol.unstuff_byte(buffer[6]) << 8) | Protocol.unstuff_byte(buffer[8])
+        if crc != Crc16.crc16_xmodem(stuffed_data):
+            return None
+
+        # command prefix and payload are stuffed together, so unstuff them at once
+        data = Protocol.unstuff(stuffed_data)
+        if len(data) < 2:
+            return None
+        # command has 10 bits and packet number 6 bits, big endian
+        prefix = (data[0] << 8) | data[1]
+        return prefix & 0x3FF, prefix >> 10, memoryview(data)[2:]
+
+
+    @staticmethod
+    def extract_packet_data(buffer: bytes) -> tuple[int, int, bytes]:
+        """Extract command, packet number and payload from buffer and returns these as tuple, buffer must contain valid packet data"""
+        data = Protocol.unstuff(buffer[9:-1])
+        # command has 10 bits and packet number 6 bits, big endian
+        prefix = (data[0] << 8) | data[1]
+        return prefix & 0x3FF, prefix >> 10, data[2:]
+
+
+    @staticmethod
+    def stuff(packet_data: bytes) -> bytes:
+        """Stuff data"""
+        # stuffing byte must be replaced first, because all replacements contain it
+        return bytes(packet_data).replace(Protocol._STUFFING_BYTES, Protocol._STUFFED_STUFFING_BYTES)\
+            .replace(Protocol._START_BYTES, Protocol._STUFFED_START_BYTES)\
+            .replace(Protocol._STOP_BYTES, Protocol._STUFFED_STOP_BYTES)
+
+
+    @staticmethod
+    def unstuff(stuffed_packet_data: bytes) -> bytes:
+        """Unstuff data"""
+        data = bytes(stuffed_packet_data)
+        if Protocol.STUFFING_BYTE not in data:
+            return data
+
+        # each part after a stuffing byte starts with a stuffed byte
+        parts = data.split(Protocol._STUFFING_BYTES)
+        if not all(parts[1:]):
+            # stuffing byte is followed by stuffing byte or at end of data, this does not happen for valid data
+            return Protocol._unstuff_bytewise(data)
+
+        result = bytearray(parts[0])
+        key = Protocol.STUFFING_KEY
+        for part in parts[1:]:
+            result.append(key ^ part[0])
+            result += part[1:]
+        return bytes(result)
+
+
+    @staticmethod
+    def _search_packet_in_buffer(buffer: bytes, start: int, check: Callable[[bytes], Any],
+                                 on_invalid_frame: Callable[[int, int], None] | None = None) -> tuple[int, int, Any] | None:
+        """Tries to find a packet in buffer beginning at index start, for which check returns a truthy value,
+        return start and stop index of packet and result of check if found or None otherwise"""
         while True:
             # Find start of packet
             # (0xF0 does not always indicate a packet start, so check additionally for stuffing byte)
-            start = buffer.find(bytes([Protocol.START_BYTE, Protocol.STUFFING_BYTE]), start)
+            start = buffer.find(Protocol._PACKET_START_BYTES, start)
             if start != -1:
                 # we found a start, so use minimal packet length as starting index to find stop
-                stop = buffer.find(bytes([Protocol.STOP_BYTE]), start + 12)
+                stop = buffer.find(Protocol._STOP_BYTES, start + 12)
                 if stop != -1:
                     # we found a packet end, lets check if its valid
-                    if Protocol.is_valid_packet_data(buffer[start:stop+1]):
-                        return start, stop
+                    result = check(buffer[start:stop+1])
+                    if result:
+                        return start, stop, result
 
                     # found packet is not valid, so check for more packets afterwards
+                    if on_invalid_frame is not None:
+                        on_invalid_frame(start, stop)
                     start = stop
                 else:
                     # we found no stop byte, so there is no complete packet in buffer
@@ -96,43 +205,8 @@ class Protocol:
 
 
     @staticmethod
-    def extract_packet_data(buffer: bytes) -> tuple[int, int, bytes]:
-        """Extract command, packet number and payload from buffer and returns these as tuple, buffer must contain valid packet data"""
-        bb = ByteBuilder()
-        # command prefix with command and packet number may be stuffed and can be from 2 to 4 bytes long
-        command_prefix_count = 0
-        for _ in range(2):
-            if buffer[9+command_prefix_count] == Protocol.STUFFING_BYTE:
-                command_prefix_count += 2
-            else:
-                command_prefix_count += 1
-
-        bb.append_bytes(Protocol.unstuff(buffer[9:9+command_prefix_count]))
-        bb.swap(0, 2)
-
-        command = bb.get_bit_from_position(0, 10)
-        nr = bb.get_bit_from_position(10, 6)
-        payload = Protocol.unstuff(buffer[9+command_prefix_count:-1])
-
-        return command, nr, payload
-
-
-    @staticmethod
-    def stuff(packet_data: bytes) -> bytes:
-        """Stuff data"""
-        result: bytearray = bytearray()
-        for b in packet_data:
-            if b in [Protocol.START_BYTE, Protocol.STOP_BYTE, Protocol.STUFFING_BYTE]:
-                result.extend(Protocol.stuff_byte(b))
-            else:
-                result.append(b)
-
-        return bytes(result)
-
-
-    @staticmethod
-    def unstuff(stuffed_packet_data: bytes) -> bytes:
-        """Unstuff data"""
+    def _unstuff_bytewise(stuffed_packet_data: bytes) -> bytes:
+        """Unstuff data byte by byte, a stuffing byte always unstuffs the following byte"""
         result = bytearray()
         index: int = 0
         while index < len(stuffed_packet_data):
@@ -147,6 +221,19 @@ class Protocol:
         return bytes(result)
 
 
+    @staticmethod
+    def _get_command_prefix(command: int, number: int) -> tuple[bytes, int]:
+        """Returns stuffed command prefix (command and packet number) and crc of it"""
+        key = command, number
+        result = Protocol._command_prefix_cache.get(key)
+        if result is None:
+            # command has 10 bits and packet number 6 bits, big endian
+            stuffed_prefix = Protocol.stuff(((command & 0x3FF) | ((number & 0x3F) << 10)).to_bytes(2, "big"))
+            result = stuffed_prefix, Crc16.crc16_xmodem(stuffed_prefix)
+            Protocol._command_prefix_cache[key] = result
+        return result
+
+
     @staticmethod
     def stuff_byte(b: int) -> bytes:
         """Stuff a single byte"""
@@ -28,38 +28,46 @@ class ProtocolHelper:
         """Send a packet and wait for response, if no response arrives raise an exception,
         this function assumes that the response has the same packet number and ack command must be command+1
         
-        Clears all incoming data from connection and packet buffer"""
+        Clears all incoming data from connection and packet buffer, if preserve packets mode of packet buffer
+        is enabled, buffer is not cleared and all other packets are added to pending packets of packet buffer"""
 
-        # discard all packets because we don"t need them anymore
-        packet_buffer.clear_buffer()
+        preserve_packets = packet_buffer.preserve_packets
+        if not preserve_packets:
+            # discard all packets because we don"t need them anymore
+            packet_buffer.clear_buffer()
         ProtocolHelper.send_packet(packet, packet_number, packet_buffer)
 
-        # calculate number of loops to reach timeout
-        sleep_duration = 0.01
-        counter = timeout_in_seconds / sleep_duration
-        while counter > 0:
-            while True:
-                ack = packet_buffer.get_packet_from_buffer()
-                if ack:
-                    if (ack.command == packet.command + 1) and (ack.number == packet.number):
-                        return ack
-
-                    # check if we got an error
-                    if ack.command == Commands.GENERAL_ERROR:
-                        ge: PacketGeneralError = ack
-                        raise ValueError(f"General error packet {ge.result_error.name}")
-                    if ack.command == Commands.UNKNOWN_COMMAND:
-                        uc: PacketGeneralUnknownCommand = ack
-                        raise ValueError(f"Unknown command packet {uc.result_error.name}")
-
-                    # discard acknowledge and continue
-
-                # no acknowledge arrived, sleep and check again
+        send_time = asyncio.get_running_loop().time()
+        deadline = send_time + timeout_in_seconds
+        statistics = packet_buffer.statistics
+        while True:
+            # pending packets are not checked, because they arrived before packet was sent
+            for ack in packet_buffer.iter_packets_from_buffer(do_include_pending=False):
+                if (ack.command == packet.command + 1) and (ack.number == packet.number):
+                    statistics.add_ack_latency(packet.command, asyncio.get_running_loop().time() - send_time)
+                    return ack
+
+                # check if we got an error
+                if ack.command == Commands.GENERAL_ERROR:
+                    statistics.ack_error_count += 1
+                    ge: PacketGeneralError = ack
+                    raise ValueError(f"General error packet {ge.result_error.name}")
+                if ack.command == Commands.UNKNOWN_COMMAND:
+                    statistics.ack_error_count += 1
+                    uc: PacketGeneralUnknownCommand = ack
+                    raise ValueError(f"Unknown command packet {uc.result_error.name}")
+
+                # keep or discard packet and check next one
+                if preserve_packets:
+                    packet_buffer.add_pending_packet(ack)
+
+            # no acknowledge arrived, wait for more data
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
                 break
-
-            await asyncio.sleep(sleep_duration)
-            counter -= 1
+            await packet_buffer.wait_for_data(remaining)
 
         # we got no response in time, so remove open acknowledges
+        statistics.ack_timeout_count += 1
         packet_buffer.remove_open_acknowledge(packet)
         raise ValueError(f"No valid answer for packet {packet.command}")
@@ -0,0 +1,5 @@
+"""Init file for simulator"""
+
+from .device_simulator_connection import *
+from .device_simulator_file_transfer import *
+from .device_simulator_measurement import *
@@ -0,0 +1,340 @@
+"""Provides a connection to an in-process simulated science mode device"""
+
+import asyncio
+import struct
+import threading
+import time
+from typing import Callable
+
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.protocol import Protocol
+from science_mode_4.protocol.types import ResultAndError, StimStatus
+from science_mode_4.general.general_types import GeneralHashType
+from science_mode_4.low_level.low_level_types import LowLevelMode
+from science_mode_4.dyscom.dyscom_helper import DyscomHelper
+from science_mode_4.dyscom.dyscom_types import DyscomFileByNameMode, DyscomGetOperationModeType,\
+    DyscomGetType, DyscomInitFlag, DyscomInitState, DyscomSignalType, DyscomSysState
+from science_mode_4.utils.connection import Connection
+from .device_simulator_file_transfer import DeviceSimulatorFileTransfer
+from .device_simulator_measurement import DeviceSimulatorMeasurement
+
+
+class DeviceSimulatorConnection(Connection):
+    """Connection to a simulated device, that answers general, low level, mid level and dyscom commands.
+    During a live measurement DL_send_live_data packets with synthetic signals are created at sample_rate
+    (based on elapsed time when data is read), during a recording samples are stored in a measurement file.
+    Files are transferred with DL_send_file packets of block_size bytes, file_window_size blocks are sent
+    without waiting for an acknowledge. Use instead of SerialPortConnection to test without a device.
+    Samples are created by DeviceSimulatorMeasurement and file blocks by DeviceSimulatorFileTransfer"""
+
+
+    # offsets in dyscom init data
+    _INIT_SIGNAL_TYPE_COUNT_OFFSET = 343
+    _INIT_SIGNAL_TYPE_OFFSET = 349
+    _INIT_FLAGS_OFFSET = 360
+
+
+    def __init__(self, sample_rate: int = 4000, block_size: int = 512, file_window_size: int = 1, seed: int = 0):
+        self._lock = threading.Lock()
+        self._is_open = False
+        self._output = bytearray()
+        self._files: dict[str, bytes] = {}
+
+        # general, low level and mid level state
+        self._stim_status = StimStatus.NO_LEVEL_INITIALIZED
+        self._mid_level_active_channels = 0
+
+        # dyscom state
+        self._operation_mode = DyscomGetOperationModeType.IDLE
+        self._measurement = DeviceSimulatorMeasurement(sample_rate, seed)
+        self._measurement_file_number = 0
+        self._measurement_file_id = ""
+        self._file_transfer = DeviceSimulatorFileTransfer(block_size, file_window_size)
+
+        self._handler: dict[int, Callable[[int, bytes], None]] = {
+            Commands.GET_DEVICE_ID: self._handle_get_device_id,
+            Commands.RESET: self._handle_reset,
+            Commands.GET_STIM_STATUS: self._handle_get_stim_status,
+            Commands.GET_EXTENDED_VERSION: self._handle_get_extended_version,
+            Commands.LOW_LEVEL_INIT: self._handle_low_level_init,
+            Commands.LOW_LEVEL_CHANNEL_CONFIG: self._handle_low_level_channel_config,
+            Commands.LOW_LEVEL_STOP: self._handle_stim_stop,
+            Commands.MID_LEVEL_INIT: self._handle_mid_level_init,
+            Commands.MID_LEVEL_UPDATE: self._handle_mid_level_update,
+            Commands.MID_LEVEL_STOP: self._handle_stim_stop,
+            Commands.MID_LEVEL_GET_CURRENT_DATA: self._handle_mid_level_get_current_data,
+            Commands.DL_INIT: self._handle_dyscom_init,
+            Commands.DL_START: self._handle_dyscom_start,
+            Commands.DL_STOP: self._handle_dyscom_stop,
+            Commands.DL_GET: self._handle_dyscom_get,
+            Commands.DL_POWER_MODULE: self._handle_dyscom_power_module,
+            Commands.DL_SYS: self._handle_dyscom_sys,
+            Commands.DL_SEND_FILE_ACK: self._handle_dyscom_send_file_ack,
+        }
+
+
+    @property
+    def sample_rate(self) -> int:
+        """Getter for sample rate of live data and recordings"""
+        return self._measurement.sample_rate
+
+
+    @property
+    def operation_mode(self) -> DyscomGetOperationModeType:
+        """Getter for dyscom operation mode"""
+        return self._operation_mode
+
+
+    @property
+    def sample_count(self) -> int:
+        """Getter for number of samples created since start of current measurement"""
+        return self._measurement.sample_count
+
+
+    @property
+    def files(self) -> dict[str, bytes]:
+        """Getter for files stored on simulated memory card"""
+        return self._files
+
+
+    def add_file(self, filename: str, data: bytes):
+        """Stores a file on simulated memory card"""
+        self._files[filename] = data
+
+
+    def open(self):
+        self._is_open = True
+
+
+    def close(self):
+        self._is_open = False
+
+
+    def is_open(self) -> bool:
+        return self._is_open
+
+
+    def write(self, data: bytes):
+        super().write(data)
+        # each write contains exactly one packet
+        packet = Protocol.decode_packet_data(data)
+        if packet is None:
+            return
+        with self._lock:
+            self._handle_packet(packet[0], packet[1], packet[2].tobytes())
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until an answer is available, next sample is due or timeout_in_seconds elapsed"""
+        with self._lock:
+            if len(self._output) > 0:
+                return
+            duration = Connection.POLL_INTERVAL_IN_SECONDS
+            if self._is_sampling():
+                duration = max(0.0, self._measurement.get_next_sample_time() - time.perf_counter())
+        await asyncio.sleep(min(timeout_in_seconds, duration))
+
+
+    def clear_buffer(self):
+        with self._lock:
+            self._create_samples()
+            self._output.clear()
+
+
+    def _read_intern(self) -> bytes:
+        with self._lock:
+            self._create_samples()
+            result = bytes(self._output)
+            self._output.clear()
+        return result
+
+
+    def _send(self, command: int, number: int, data: bytes):
+        """Appends a packet to output"""
+        self._output += Protocol.data_to_bytes(command, number, data)
+
+
+    def _handle_packet(self, command: int, number: int, data: bytes):
+        """Calls handler for command or answers with unknown command"""
+        handler = self._handler.get(command)
+        if handler is None:
+            self._send(Commands.UNKNOWN_COMMAND, number, bytes([ResultAndError.INVALID_CMD_ERROR]))
+            return
+        handler(number, data)
+
+
+    def _handle_get_device_id(self, number: int, _: bytes):
+        self._send(Commands.GET_DEVICE_ID_ACK, number, bytes([ResultAndError.NO_ERROR]) + b"SIMULATOR0")
+
+
+    def _handle_reset(self, number: int, _: bytes):
+        self._send(Commands.RESET_ACK, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_get_stim_status(self, number: int, _: bytes):
+        high_voltage = 6 if self._stim_status != StimStatus.NO_LEVEL_INITIALIZED else 0
+        self._send(Commands.GET_STIM_STATUS_ACK, number, bytes([ResultAndError.NO_ERROR, self._stim_status, high_voltage]))
+
+
+    def _handle_get_extended_version(self, number: int, _: bytes):
+        self._send(Commands.GET_EXTENDED_VERSION_ACK, number,
+                   bytes([ResultAndError.NO_ERROR, 1, 0, 0, 4, 0, 0, 0, 0, 0, 0, GeneralHashType.UNINITIALIZED, 0]))
+
+
+    def _handle_low_level_init(self, number: int, _: bytes):
+        self._stim_status = StimStatus.LOW_LEVEL_INITIALIZED
+        self._send(Commands.LOW_LEVEL_INIT_ACK, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_low_level_channel_config(self, number: int, data: bytes):
+        if self._stim_status != StimStatus.LOW_LEVEL_INITIALIZED:
+            self._send(Commands.LOW_LEVEL_CHANNEL_CONFIG_ACK, number,
+                       bytes([ResultAndError.NOT_INITIALIZED, 0, LowLevelMode.NO_MEASUREMENT]))
+            return
+        connector = (data[0] >> 4) & 0x01
+        channel = (data[0] >> 5) & 0x03
+        # measurement values are not simulated
+        self._send(Commands.LOW_LEVEL_CHANNEL_CONFIG_ACK, number,
+                   bytes([ResultAndError.NO_ERROR, channel | (connector << 4), LowLevelMode.NO_MEASUREMENT]))
+
+
+    def _handle_stim_stop(self, number: int, _: bytes):
+        ack_command = Commands.LOW_LEVEL_STOP_ACK if self._stim_status == StimStatus.LOW_LEVEL_INITIALIZED \
+            else Commands.MID_LEVEL_STOP_ACK
+        self._stim_status = StimStatus.NO_LEVEL_INITIALIZED
+        self._mid_level_active_channels = 0
+        self._send(ack_command, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_mid_level_init(self, number: int, _: bytes):
+        self._stim_status = StimStatus.MID_LEVEL_INITIALIZED
+        self._send(Commands.MID_LEVEL_INIT_ACK, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_mid_level_update(self, number: int, data: bytes):
+        if self._stim_status not in [StimStatus.MID_LEVEL_INITIALIZED, StimStatus.MID_LEVEL_RUNNING]:
+            self._send(Commands.MID_LEVEL_UPDATE_ACK, number, bytes([ResultAndError.NOT_INITIALIZED]))
+            return
+        self._stim_status = StimStatus.MID_LEVEL_RUNNING
+        self._mid_level_active_channels = data[0]
+        self._send(Commands.MID_LEVEL_UPDATE_ACK, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_mid_level_get_current_data(self, number: int, _: bytes):
+        self._send(Commands.MID_LEVEL_GET_CURRENT_DATA_ACK, number,
+                   bytes([ResultAndError.NO_ERROR, 4, self._mid_level_active_channels, 0, 0, 0, 0]))
+
+
+    def _handle_dyscom_init(self, number: int, data: bytes):
+        signal_type_count = int.from_bytes(data[self._INIT_SIGNAL_TYPE_COUNT_OFFSET:self._INIT_SIGNAL_TYPE_COUNT_OFFSET + 2], "big")
+        self._measurement.signal_types = [DyscomSignalType(x) for x in
+                                          data[self._INIT_SIGNAL_TYPE_OFFSET:self._INIT_SIGNAL_TYPE_OFFSET + min(signal_type_count, 8)]]
+        flags = data[self._INIT_FLAGS_OFFSET]
+        if flags & (1 << DyscomInitFlag.ENABLE_SD_STORAGE_MODE):
+            self._operation_mode = DyscomGetOperationModeType.RECORD_PRE
+            self._measurement_file_number += 1
+            self._measurement_file_id = f"SIM{self._measurement_file_number:05d}.MEA"
+        else:
+            self._operation_mode = DyscomGetOperationModeType.LIVE_MEASURING_PRE
+            self._measurement_file_id = ""
+
+        self._send(Commands.DL_INIT_ACK, number, bytes([ResultAndError.NO_ERROR]) + data[0:26] +
+                   DyscomHelper.str_to_bytes(self._measurement_file_id, 60) +
+                   bytes([DyscomInitState.SUCCESS, self._measurement.frequency_out]))
+
+
+    def _handle_dyscom_start(self, number: int, _: bytes):
+        result = ResultAndError.NO_ERROR
+        if self._operation_mode in [DyscomGetOperationModeType.LIVE_MEASURING_PRE, DyscomGetOperationModeType.RECORD_PRE]:
+            self._operation_mode = DyscomGetOperationModeType.LIVE_MEASURING \
+                if self._operation_mode == DyscomGetOperationModeType.LIVE_MEASURING_PRE else DyscomGetOperationModeType.RECORD
+            self._measurement.start(self._operation_mode == DyscomGetOperationModeType.RECORD)
+        elif self._operation_mode == DyscomGetOperationModeType.DATATRANSFER_PRE:
+            self._operation_mode = DyscomGetOperationModeType.DATATRANSFER
+        else:
+            result = ResultAndError.NOT_INITIALIZED
+        self._send(Commands.DL_START_ACK, number, bytes([result]))
+
+        if self._operation_mode == DyscomGetOperationModeType.DATATRANSFER and result == ResultAndError.NO_ERROR:
+            # send first blocks, further blocks are sent when blocks are acknowledged
+            for _ in range(self._file_transfer.window_size):
+                self._output += self._file_transfer.create_next_block()
+
+
+    def _handle_dyscom_stop(self, number: int, _: bytes):
+        if self._operation_mode == DyscomGetOperationModeType.RECORD:
+            self._files[self._measurement_file_id] = self._measurement.create_measurement_file()
+        self._operation_mode = DyscomGetOperationModeType.IDLE
+        self._send(Commands.DL_STOP_ACK, number, bytes([ResultAndError.NO_ERROR]))
+
+
+    def _handle_dyscom_get(self, number: int, data: bytes):
+        get_type = DyscomGetType(data[0])
+        result = bytes([ResultAndError.NO_ERROR, get_type])
+        if get_type == DyscomGetType.BATTERY:
+            result += struct.pack("<BBbiI", 0, 80, 25, -100, 3900)
+        elif get_type == DyscomGetType.FILESYSTEM_STATUS:
+            used_size = sum(len(x) for x in self._files.values())
+            result += bytes([1]) + used_size.to_bytes(8, "big") + (2**32 - used_size).to_bytes(8, "big")
+        elif get_type == DyscomGetType.LIST_OF_MEASUREMENT_META_INFO:
+            result += len(self._files).to_bytes(2, "big")
+        elif get_type == DyscomGetType.OPERATION_MODE:
+            result += bytes([self._operation_mode])
+        elif get_type == DyscomGetType.FILE_BY_NAME:
+            result = self._prepare_file_transfer(data)
+        elif get_type == DyscomGetType.DEVICE_ID:
+            result += DyscomHelper.str_to_bytes("SIMULATOR0", 128)
+        elif get_type == DyscomGetType.FIRMWARE_VERSION:
+            result += DyscomHelper.str_to_bytes("1.0.0 simulator", 128)
+        elif get_type == DyscomGetType.FILE_INFO:
+            filename = DyscomHelper.bytes_to_str(data[1:129], 128)
+            content = self._files.get(filename)
+            if content is None:
+                result = bytes([ResultAndError.FILE_NOT_FOUND, get_type])
+                content = b""
+            # checksum algorithm of device is unknown, so checksum is always 0
+            result += DyscomHelper.str_to_bytes(filename, 128) + len(content).to_bytes(4, "big") + bytes(2)
+        self._send(Commands.DL_GET_ACK, number, result)
+
+
+    def _handle_dyscom_power_module(self, number: int, data: bytes):
+        self._send(Commands.DL_POWER_MODULE_ACK, number, bytes([ResultAndError.NO_ERROR, data[0], data[1]]))
+
+
+    def _handle_dyscom_sys(self, number: int, data: bytes):
+        self._send(Commands.DL_SYS_ACK, number, bytes([ResultAndError.NO_ERROR, data[128], DyscomSysState.SUCCESSFUL]) + data[0:128])
+
+
+    def _handle_dyscom_send_file_ack(self, _: int, __: bytes):
+        # there is no acknowledge for a send file acknowledge
+        if self._operation_mode == DyscomGetOperationModeType.DATATRANSFER:
+            self._output += self._file_transfer.create_next_block()
+
+
+    def _prepare_file_transfer(self, data: bytes) -> bytes:
+        """Prepares transfer of file requested with get file by name and returns acknowledge data"""
+        filename = DyscomHelper.bytes_to_str(data[1:129], 128)
+        block_offset = int.from_bytes(data[129:133], "big")
+        content = self._files.get(filename)
+        if content is None or self._operation_mode != DyscomGetOperationModeType.IDLE:
+            result_error = ResultAndError.FILE_NOT_FOUND if content is None else ResultAndError.BUSY
+            content = b""
+        else:
+            result_error = ResultAndError.NO_ERROR
+            self._operation_mode = DyscomGetOperationModeType.DATATRANSFER_PRE
+
+        self._file_transfer.prepare(content, block_offset)
+        return bytes([result_error, DyscomGetType.FILE_BY_NAME]) + DyscomHelper.str_to_bytes(filename, 128) +\
+            block_offset.to_bytes(4, "big") + len(content).to_bytes(8, "big") +\
+            self._file_transfer.block_count.to_bytes(4, "big") + bytes([DyscomFileByNameMode.MULTI_BLOCK])
+
+
+    def _is_sampling(self) -> bool:
+        """Returns True if device creates samples"""
+        return self._operation_mode in [DyscomGetOperationModeType.LIVE_MEASURING, DyscomGetOperationModeType.RECORD]
+
+
+    def _create_samples(self):
+        """Creates all samples due since start of measurement"""
+        if self._is_sampling():
+            self._output += self._measurement.create_samples()
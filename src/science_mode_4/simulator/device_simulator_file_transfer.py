@@ -0,0 +1,59 @@
+"""Provides a class for the file transfer state of a simulated science mode device"""
+
+import math
+
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.protocol import Protocol
+
+
+class DeviceSimulatorFileTransfer():
+    """Splits a file into DL_send_file packets of block_size bytes, blocks are numbered starting with 1
+    and the last block is padded to block size. window_size is the number of blocks sent without waiting
+    for an acknowledge"""
+
+
+    def __init__(self, block_size: int, window_size: int):
+        self._block_size = block_size
+        self._window_size = window_size
+        self._data = b""
+        self._block_count = 0
+        self._next_block = 0
+
+
+    @property
+    def block_size(self) -> int:
+        """Getter for block size"""
+        return self._block_size
+
+
+    @property
+    def window_size(self) -> int:
+        """Getter for number of blocks sent without waiting for an acknowledge"""
+        return self._window_size
+
+
+    @property
+    def block_count(self) -> int:
+        """Getter for number of blocks of current file"""
+        return self._block_count
+
+
+    def prepare(self, data: bytes, block_offset: int):
+        """Prepares transfer of data, transfer starts with block block_offset + 1"""
+        self._data = data
+        self._block_count = math.ceil(len(data) / self._block_size)
+        # block numbers start with 1
+        self._next_block = block_offset + 1
+
+
+    def create_next_block(self) -> bytes:
+        """Returns packet with next block or nothing if all blocks were created"""
+        block_number = self._next_block
+        if block_number > self._block_count:
+            return b""
+        self._next_block += 1
+
+        start = (block_number - 1) * self._block_size
+        block = self._data[start:start + self._block_size].ljust(self._block_size, b"\0")
+        return Protocol.data_to_bytes(Commands.DL_SEND_FILE, block_number % 64,
+                                      block_number.to_bytes(4, "big") + self._block_size.to_bytes(2, "big") + block)
@@ -0,0 +1,140 @@
+"""Provides a class for the measurement state of a simulated science mode device"""
+
+import struct
+import time
+
+import numpy as np
+
+from science_mode_4.dyscom.dyscom_measurement_decoder import DyscomMeasurementDecoder
+from science_mode_4.dyscom.dyscom_types import DyscomFrequencyOut, DyscomSignalType
+from science_mode_4.protocol.commands import Commands
+from science_mode_4.protocol.protocol import Protocol
+
+
+class DeviceSimulatorMeasurement():
+    """Creates synthetic samples of a simulated dyscom measurement at sample_rate (based on elapsed time
+    since start). During a live measurement samples are returned as DL_send_live_data packets, during a
+    recording samples are collected as records of a measurement file"""
+
+
+    CHANNEL_COUNT = 5
+
+    _FREQUENCY_OUT = {value: key for key, value in DyscomMeasurementDecoder.SAMPLES_PER_SECOND.items()}
+    # signal types in measurement files differ from DyscomSignalType enum
+    _FILE_SIGNAL_TYPE = {value: key for key, value in DyscomMeasurementDecoder.SIGNAL_TYPE_MAP.items()}
+    _LIVE_DATA_STRUCT = struct.Struct(">BI" + "fBB" * CHANNEL_COUNT)
+
+
+    def __init__(self, sample_rate: int, seed: int):
+        self._sample_rate = sample_rate
+        self._rng = np.random.default_rng(seed)
+        self._signal_types: list[DyscomSignalType] = []
+        self._is_recording = False
+        self._recording = bytearray()
+        self._sample_count = 0
+        self._live_data_number = 0
+        self._start_time = 0.0
+
+
+    @property
+    def sample_rate(self) -> int:
+        """Getter for sample rate"""
+        return self._sample_rate
+
+
+    @property
+    def frequency_out(self) -> DyscomFrequencyOut:
+        """Getter for sample rate as DyscomFrequencyOut"""
+        return self._FREQUENCY_OUT.get(self._sample_rate, DyscomFrequencyOut.UNUSED)
+
+
+    @property
+    def sample_count(self) -> int:
+        """Getter for number of samples created since start"""
+        return self._sample_count
+
+
+    @property
+    def signal_types(self) -> list[DyscomSignalType]:
+        """Getter for signal types"""
+        return self._signal_types
+
+
+    @signal_types.setter
+    def signal_types(self, value: list[DyscomSignalType]):
+        """Setter for signal types"""
+        self._signal_types = value
+
+
+    def start(self, is_recording: bool):
+        """Starts creating samples, if is_recording is True samples are stored instead of sent"""
+        self._is_recording = is_recording
+        self._recording = bytearray()
+        self._sample_count = 0
+        self._live_data_number = 0
+        self._start_time = time.perf_counter()
+
+
+    def get_next_sample_time(self) -> float:
+        """Returns time (see time.perf_counter()) when next sample is due"""
+        return self._start_time + (self._sample_count + 1) / self._sample_rate
+
+
+    def create_samples(self) -> bytes:
+        """Creates all samples due since start, returns DL_send_live_data packets for a live measurement
+        and nothing for a recording"""
+        count = int((time.perf_counter() - self._start_time) * self._sample_rate) - self._sample_count
+        if count <= 0:
+            return b""
+
+        values = self._create_signals(self._sample_count, count)
+        time_offset = round(1_000_000 / self._sample_rate)
+        result = bytearray()
+        if not self._is_recording:
+            pack = self._LIVE_DATA_STRUCT.pack
+            types = (self._signal_types + [DyscomSignalType.UNUSED] * self.CHANNEL_COUNT)[0:self.CHANNEL_COUNT]
+            for index, row in enumerate(values.tolist()):
+                # first sample has no predecessor, so time offset is zero
+                payload = pack(self.CHANNEL_COUNT, 0 if self._sample_count + index == 0 else time_offset,
+                               row[0], types[0], 0, row[1], types[1], 0, row[2], types[2], 0,
+                               row[3], types[3], 0, row[4], types[4], 0)
+                result += Protocol.data_to_bytes(Commands.DL_SEND_LIVE_DATA, self._live_data_number, payload)
+                self._live_data_number = (self._live_data_number + 1) % 64
+        else:
+            # each record has time offset and a value for each signal type
+            records = np.zeros(count, np.dtype([("time_offset", "<u4"), ("values", "<f4", (len(self._signal_types),))]))
+            records["time_offset"] = time_offset
+            records["values"] = values[:, 0:len(self._signal_types)]
+            self._recording += records.tobytes()
+        self._sample_count += count
+        return bytes(result)
+
+
+    def create_measurement_file(self) -> bytes:
+        """Creates all samples due and returns content of a measurement file with recorded samples"""
+        self.create_samples()
+        return self._create_measurement_file_header() + bytes(self._recording)
+
+
+    def _create_signals(self, start: int, count: int) -> np.ndarray:
+        """Creates count synthetic samples for all channels beginning with sample start,
+        channel 1 is a slowly varying bioimpedance, channel 2 and 3 are EMG bursts, channel 4
+        is a breathing signal and channel 5 is always zero"""
+        t = np.arange(start, start + count) / self._sample_rate
+        result = np.zeros((count, self.CHANNEL_COUNT), np.float32)
+        result[:, 0] = 100.0 + 5.0 * np.sin(2 * np.pi * 1.0 * t)
+        for channel, phase in [(1, 0.0), (2, np.pi)]:
+            envelope = np.where(np.sin(2 * np.pi * 0.5 * t + phase) > 0, 1.0, 0.1)
+            result[:, channel] = self._rng.normal(0.0, 20.0, count) * envelope
+        result[:, 3] = 0.5 * np.sin(2 * np.pi * 0.25 * t)
+        return result
+
+
+    def _create_measurement_file_header(self) -> bytes:
+        """Creates header of a measurement file with sample rate and signal types"""
+        header = bytearray(DyscomMeasurementDecoder.HEADER_SIZE)
+        header[3] = self.frequency_out
+        header[10] = len(self._signal_types)
+        for index, signal_type in enumerate(self._signal_types):
+            header[11 + index] = self._FILE_SIGNAL_TYPE.get(signal_type, 1)
+        return bytes(header)
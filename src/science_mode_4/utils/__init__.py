@@ -1,5 +1,7 @@
 """Init file for utils"""
 
+from .async_connection import *
+from .async_serial_port_connection import *
 from .bit_vector import *
 from .byte_builder import *
 from .connection import *
@@ -7,5 +9,11 @@ from .crc16 import *
 from .logger import *
 from .null_connection import *
 from .packet_buffer import *
+from .packet_statistics import *
+from .recording_connection import *
+from .replay_connection import *
+from .ring_packet_buffer import *
 from .serial_port_connection import *
+from .threaded_packet_buffer import *
 from .usb_connection import *
+from .wire_trace import *
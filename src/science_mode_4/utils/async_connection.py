@@ -0,0 +1,83 @@
+"""Provides a base class for connections with a background reader thread"""
+
+import threading
+from abc import abstractmethod
+
+from .async_data_notifier import AsyncDataNotifier
+from .connection import Connection
+from .logger import logger
+
+
+class AsyncConnection(Connection):
+    """Abstract base class for connections that read incoming data in a background thread.
+    Coroutines waiting for data with wait_for_data() are woken up as soon as data arrives,
+    so no polling interval adds latency"""
+
+
+    def __init__(self):
+        self._received_data = bytearray()
+        self._lock = threading.Lock()
+        self._notifier = AsyncDataNotifier()
+        self._reader_thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._reader_error: Exception | None = None
+
+
+    def clear_buffer(self):
+        with self._lock:
+            self._received_data.clear()
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until data is available or timeout_in_seconds elapsed"""
+        await self._notifier.wait(timeout_in_seconds,
+                                  lambda: len(self._received_data) > 0 or self._reader_error is not None)
+
+
+    def _start_reader(self):
+        """Starts background reader thread, call after connection is opened"""
+        self._stop_event.clear()
+        self._reader_error = None
+        self._reader_thread = threading.Thread(target=self._reader_loop, name=f"{type(self).__name__} reader", daemon=True)
+        self._reader_thread.start()
+
+
+    def _stop_reader(self):
+        """Stops background reader thread, call before connection is closed"""
+        self._stop_event.set()
+        if self._reader_thread is not None:
+            self._reader_thread.join()
+            self._reader_thread = None
+
+
+    def _read_intern(self) -> bytes:
+        with self._lock:
+            if self._reader_error is not None:
+                raise ValueError(f"Error reading from connection {self._reader_error}") from self._reader_error
+            result = bytes(self._received_data)
+            self._received_data.clear()
+        return result
+
+
+    @abstractmethod
+    def _read_blocking(self) -> bytes:
+        """Read available data from connection, blocks until data arrives or a short timeout elapsed,
+        called from background reader thread"""
+
+
+    def _reader_loop(self):
+        """Function of background reader thread"""
+        while not self._stop_event.is_set():
+            try:
+                data = self._read_blocking()
+            except Exception as e: # pylint:disable=broad-exception-caught
+                logger().error("Error reading from connection: %s", e)
+                with self._lock:
+                    self._reader_error = e
+                self._notifier.notify()
+                break
+
+            if len(data) > 0:
+                with self._lock:
+                    self._received_data += data
+                self._notifier.notify()
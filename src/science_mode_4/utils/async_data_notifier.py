@@ -0,0 +1,56 @@
+"""Provides a class to wake up coroutines from other threads"""
+
+import asyncio
+import threading
+from typing import Callable
+
+
+class AsyncDataNotifier():
+    """Coroutines wait for data with wait() and are woken up by notify(), notify() can be called from any thread"""
+
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # event loop and future for each waiting coroutine
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+
+    async def wait(self, timeout_in_seconds: float, is_data_available: Callable[[], bool]):
+        """Waits until notify() is called or timeout_in_seconds elapsed, returns immediately if
+        is_data_available returns True. Producers must make data available before calling notify()"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if is_data_available():
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter[1], timeout_in_seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+
+    def notify(self):
+        """Wakes up all waiting coroutines"""
+        with self._lock:
+            waiters = self._waiters
+            self._waiters = []
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(AsyncDataNotifier._set_future_done, future)
+            except RuntimeError:
+                # event loop is already closed
+                pass
+
+
+    @staticmethod
+    def _set_future_done(future: asyncio.Future):
+        """Marks future as done, must be called in context of future's event loop"""
+        if not future.done():
+            future.set_result(None)
@@ -0,0 +1,55 @@
+"""Provides a class for a serial connection with a background reader thread"""
+
+import os
+import serial
+
+from .async_connection import AsyncConnection
+
+
+class AsyncSerialPortConnection(AsyncConnection):
+    """Serial connection class, that reads incoming data in a background thread and wakes up
+    waiting coroutines as soon as data arrives. Use instead of SerialPortConnection to reduce
+    latency of commands waiting for an acknowledge"""
+
+
+    def __init__(self, port: str, read_timeout_in_seconds: float = 0.05):
+        super().__init__()
+        # reader thread blocks at most read_timeout_in_seconds, so it can be stopped in time
+        self._ser = serial.Serial(timeout = read_timeout_in_seconds)
+        self._ser.port = port
+
+
+    def open(self):
+        self._ser.open()
+
+        if os.name == "nt":
+            self._ser.set_buffer_size(4096*128)
+
+        self._start_reader()
+
+
+    def close(self):
+        self._stop_reader()
+        self._ser.close()
+
+
+    def is_open(self) -> bool:
+        return self._ser.is_open
+
+
+    def write(self, data: bytes):
+        super().write(data)
+        self._ser.write(data)
+
+
+    def clear_buffer(self):
+        self._ser.reset_input_buffer()
+        super().clear_buffer()
+
+
+    def _read_blocking(self) -> bytes:
+        # wait for first byte and read everything else that is available
+        result = self._ser.read(1)
+        if len(result) > 0 and self._ser.in_waiting > 0:
+            result += self._ser.read(self._ser.in_waiting)
+        return result
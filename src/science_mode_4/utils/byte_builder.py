@@ -13,41 +13,38 @@ class ByteBuilder():
 
     def get_bit_from_position(self, bit_position: int, bit_count: int) -> int:
         """Returns bits starting with bit_position and a count of bit_count"""
-        result = 0
-        for x in range(bit_count):
-            result |= (self._data[bit_position + x] << x)
-        return result
+        return self._data.get_bits(bit_position, bit_count)
 
 
     def append_value(self, value: int, byte_count: int, do_swap: bool):
         """Extends current data with byte_count bytes from values"""
-        temp = range(byte_count)
+        if byte_count <= 0:
+            return
+        value &= (1 << (byte_count * 8)) - 1
         if do_swap:
-            temp = reversed(temp)
-        for x in temp:
-            self._append_byte(value >> (x * 8))
+            # reverse byte order, so bytes are appended in big endian order
+            value = int.from_bytes(value.to_bytes(byte_count, "little"), "big")
+        self._data.append_bits(value, byte_count * 8)
 
 
     def append_byte(self, value: int):
         """Append a byte"""
-        self._append_byte(value)
+        self._data.append_bits(value, 8)
 
 
     def append_list(self, value: list[int]):
         """Extends current data with list of values (byte)"""
-        for x in value:
-            self._append_byte(x)
+        self.append_bytes(bytes(x & 0xFF for x in value))
 
 
     def append_bytes(self, value: bytes):
         """Extends current data with value"""
-        for x in value:
-            self._append_byte(x)
+        self._data.append_bits(int.from_bytes(value, "little"), len(value) * 8)
 
 
     def extend_byte_builder(self, value: "ByteBuilder"):
         """Extends current data with value"""
-        self._data.extend(value.get_bytes())
+        self.append_bytes(value.get_bytes())
 
 
     def set_bit_to_position(self, value: int, bit_position: int, bit_count: int):
@@ -55,10 +52,7 @@ class ByteBuilder():
         Set bits starting with bit_position and a count of bit_count to value
         This method extends data to make room for value
         """
-        new_length = max(len(self._data), bit_position + bit_count)
-        self._data.set_length(new_length)
-        for x in range(bit_count):
-            self._data[bit_position + x] = (value >> x) & 0x1
+        self._data.set_bits(value, bit_position, bit_count)
 
 
     def set_bytes_to_position(self, value: bytes, byte_position: int, byte_count: int):
@@ -66,15 +60,23 @@ class ByteBuilder():
         Set bytes starting with byte_position and a count of byte_count to value
         This method extends data to make room for value
         """
-        for x in range(byte_count):
-            self.set_bit_to_position(value[x], (byte_position + x) * 8, 8)
+        if byte_count <= 0:
+            return
+        # value may be a list of int, so ensure that every item is treated as byte
+        data = bytes(x & 0xFF for x in value[0:byte_count])
+        if len(data) < byte_count:
+            raise IndexError(f"Not enough bytes in value {len(data)}, expected {byte_count}")
+        self._data.set_bits(int.from_bytes(data, "little"), byte_position * 8, byte_count * 8)
 
 
     def swap(self, start: int, count: int):
         """Swap bytes by reversion order from start to start + count"""
+        if count <= 0:
+            return
         tmp = self.get_bytes()
-        for x in range(count):
-            self.set_bit_to_position(tmp[start + x], (start + count - x - 1) * 8, 8)
+        if start + count > len(tmp):
+            raise IndexError(f"Swap out of range {start} - {start + count - 1} [0 - {len(tmp)}]")
+        self._data.set_bits(int.from_bytes(tmp[start:start + count], "big"), start * 8, count * 8)
 
 
     def get_bytes(self) -> bytes:
@@ -99,11 +101,3 @@ class ByteBuilder():
     def __str__(self) -> str:
         b = self.get_bytes()
         return f"length: {len(b)}, bytes: {b.hex(" ").upper()}"
-
-
-    def _append_byte(self, value: int):
-        """Append value at the end of data, value is treated as byte"""
-        start = len(self._data)
-        self._data.set_length(start + 8)
-        for x in range(8):
-            self._data[start + x] = (value >> x) & 0x1
@@ -1,14 +1,39 @@
 """Provides a base class for a connection"""
 
+import asyncio
 from abc import ABC, abstractmethod
+import logging
 
 from .logger import logger
+from .wire_trace import WireTraceDirection, WireTraceWriter
+
+
+# cached reference to avoid resolving logger for each read and write
+_LOGGER = logger()
 
 
 class Connection(ABC):
     """Abstract base class for connection"""
 
 
+    # interval for polling connection, used if connection has no notification about arriving data
+    POLL_INTERVAL_IN_SECONDS = 0.01
+    # optional sink for raw data, class attribute because subclasses do not call __init__()
+    _wire_trace: WireTraceWriter | None = None
+
+
+    @property
+    def wire_trace(self) -> WireTraceWriter | None:
+        """Getter for wire trace"""
+        return self._wire_trace
+
+
+    @wire_trace.setter
+    def wire_trace(self, value: WireTraceWriter | None):
+        """Setter for wire trace, all read and written data is recorded to wire trace"""
+        self._wire_trace = value
+
+
     @abstractmethod
     def open(self):
         """Open connection"""
@@ -26,17 +51,29 @@ class Connection(ABC):
 
     def write(self, data: bytes):
         """Write data to connection"""
-        logger().debug("Outgoing data, length: %d, bytes: %s", len(data), data.hex(" ").upper())
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Outgoing data, length: %d, bytes: %s", len(data), data.hex(" ").upper())
+        if self._wire_trace is not None:
+            self._wire_trace.write_record(WireTraceDirection.WRITE, data)
 
 
     def read(self) -> bytes:
         """Read all data from connection"""
         result = self._read_intern()
         if len(result) > 0:
-            logger().debug("Incoming data, length: %d, bytes: %s", len(result), result.hex(" ").upper())
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Incoming data, length: %d, bytes: %s", len(result), result.hex(" ").upper())
+            if self._wire_trace is not None:
+                self._wire_trace.write_record(WireTraceDirection.READ, result)
         return result
 
 
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until data is available or timeout_in_seconds elapsed, default implementation
+        waits for poll interval because there is no notification about arriving data"""
+        await asyncio.sleep(min(timeout_in_seconds, Connection.POLL_INTERVAL_IN_SECONDS))
+
+
     @abstractmethod
     def clear_buffer(self):
         """Clear buffer from connection"""
@@ -1,5 +1,13 @@
 """Provides a class for CRC16"""
 
+from typing import Iterable
+
+try:
+    # binascii.crc_hqx implements CRC-CCITT (XModem) natively
+    from binascii import crc_hqx as _crc_hqx
+except ImportError:
+    _crc_hqx = None
+
 
 class Crc16:
     """Class for CRC16 checksum calculation"""
@@ -44,9 +52,22 @@ class Crc16:
     @staticmethod
     def crc16_xmodem(data: bytes, crc: int = 0) -> int:
         """Calculate CRC-CCITT (XModem) variant of CRC16 for data with crc as initial value and returns result"""
+        if _crc_hqx is not None:
+            return _crc_hqx(data, crc & 0xFFFF)
         return Crc16._crc16(data, crc, Crc16.CRC16_XMODEM_TABLE)
 
 
+    @staticmethod
+    def crc16_xmodem_list(data_list: Iterable[bytes], crc: int = 0) -> list[int]:
+        """Calculate CRC-CCITT (XModem) variant of CRC16 for each item of data_list with crc as initial value
+        and returns results in same order"""
+        crc &= 0xFFFF
+        if _crc_hqx is not None:
+            return [_crc_hqx(data, crc) for data in data_list]
+        table = Crc16.CRC16_XMODEM_TABLE
+        return [Crc16._crc16(data, crc, table) for data in data_list]
+
+
     @staticmethod
     def _crc16(data: bytes, crc: int, table: list[int]) -> int:
         """Calculate CRC16 using the given table"""
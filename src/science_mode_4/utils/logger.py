@@ -39,4 +39,7 @@ class Logger:
 
 def logger() -> logging.Logger:
     """Shortcut to access custom logger"""
+    # avoid Logger.__new__() after first call
+    if Logger._instance is not None: # pylint: disable=protected-access
+        return Logger._logger # pylint: disable=protected-access
     return Logger().logger
@@ -1,22 +1,34 @@
 """Provides a packet buffer functionality for more async handling of packets and acknowledges"""
 
-from science_mode_4.protocol.packet import Packet
+from collections import deque
+from typing import Iterator
+
+from science_mode_4.protocol.packet import Packet, PacketAck
 from science_mode_4.protocol.packet_factory import PacketFactory
 from science_mode_4.protocol.protocol import Protocol
 from science_mode_4.protocol.commands import Commands
 from science_mode_4.utils.logger import logger
 from .connection import Connection
+from .packet_statistics import PacketStatistics
 
 
 class PacketBuffer():
     """Class for handling a buffer and provides methods to take care of arriving acknowledges"""
 
+
+    _START_SEQUENCE = bytes([Protocol.START_BYTE, Protocol.STUFFING_BYTE])
+
+
     def __init__(self, conn: Connection, packet_factory: PacketFactory):
         self._buffer: bytes = b""
         # dict with command and packet number as key and open count as value
         self._open_acknowledges: dict[tuple[int, int], int] = {}
         self._connection = conn
         self._packet_factory = packet_factory
+        # packets kept while waiting for an acknowledge, returned before packets from buffer
+        self._pending_packets: deque[PacketAck] = deque()
+        self._preserve_packets = False
+        self._statistics = PacketStatistics()
 
 
     @property
@@ -31,9 +43,59 @@ class PacketBuffer():
         return self._buffer
 
 
+    @property
+    def statistics(self) -> PacketStatistics:
+        """Getter for statistics"""
+        return self._statistics
+
+
+    @statistics.setter
+    def statistics(self, value: PacketStatistics):
+        """Setter for statistics, used when a packet buffer replaces another one"""
+        self._statistics = value
+
+
+    @property
+    def preserve_packets(self) -> bool:
+        """Getter for preserve packets mode"""
+        return self._preserve_packets
+
+
+    @preserve_packets.setter
+    def preserve_packets(self, value: bool):
+        """Setter for preserve packets mode, if enabled async functions waiting for an acknowledge do not
+        clear buffer and keep all other packets (e.g. live data) as pending packets"""
+        self._preserve_packets = value
+
+
+    @property
+    def pending_packet_count(self) -> int:
+        """Getter for number of pending packets"""
+        return len(self._pending_packets)
+
+
+    def add_pending_packet(self, packet: PacketAck):
+        """Adds packet to pending packets, pending packets are returned before packets from buffer"""
+        self._pending_packets.append(packet)
+
+
+    def copy_pending_packets(self, other: "PacketBuffer"):
+        """Copies preserve packets mode and pending packets from other packet buffer, used when a packet buffer
+        replaces another one"""
+        self._preserve_packets = other._preserve_packets # pylint: disable=protected-access
+        self._pending_packets = deque(other._pending_packets) # pylint: disable=protected-access
+
+
     def update_buffer(self):
         """Reads all data from connection and appends to internal buffer"""
-        self._buffer += self._connection.read()
+        data = self._connection.read()
+        self._statistics.add_read(len(data))
+        self._buffer += data
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until new data is available or timeout_in_seconds elapsed"""
+        await self._connection.wait_for_data(timeout_in_seconds)
 
 
     def add_open_acknowledge(self, packet: Packet):
@@ -54,6 +116,11 @@ class PacketBuffer():
             raise ValueError(f"Remove non existing acknowledge from packet buffer, command {packet.command}, number {packet.number}")
 
 
+    def copy_open_acknowledges(self, other: "PacketBuffer"):
+        """Copies open acknowledges from other packet buffer, used when a packet buffer replaces another one"""
+        self._open_acknowledges = dict(other._open_acknowledges) # pylint: disable=protected-access
+
+
     def print_open_acknowledge(self):
         """Print open acknowledges"""
         logger().info("Open acknowledges")
@@ -69,12 +136,122 @@ class PacketBuffer():
         if do_update_buffer:
             self.update_buffer()
 
-        start_stop = Protocol.find_packet_in_buffer(self._buffer)
-        if start_stop is None:
+        if self._pending_packets:
+            return self._pending_packets.popleft()
+
+        ack_data = self._extract_packet_data()
+        if ack_data is None:
             return None
 
-        packet_data = self._buffer[start_stop[0]: start_stop[1] + 1]
-        ack_data = Protocol.extract_packet_data(packet_data)
+        return self._create_packet(ack_data)
+
+
+    def get_packets_from_buffer(self, max_count: int | None = None, do_update_buffer = True,
+                                do_include_pending = True) -> list[PacketAck]:
+        """Reads connection once and returns all valid packets from buffer (at most max_count packets).
+        Pending packets are returned first, if do_include_pending is True.
+        Does adjust internal buffer accordingly. Returns an empty list if no valid packet was found
+        """
+        if do_update_buffer:
+            self.update_buffer()
+
+        result: list[PacketAck] = []
+        if do_include_pending:
+            while self._pending_packets and (max_count is None or len(result) < max_count):
+                result.append(self._pending_packets.popleft())
+            if max_count is not None:
+                max_count -= len(result)
+                if max_count == 0:
+                    return result
+
+        result.extend([self._create_packet(x) for x in self._extract_packets_data(max_count)])
+        return result
+
+
+    def iter_packets_from_buffer(self, max_count: int | None = None, do_update_buffer = True,
+                                 do_include_pending = True) -> Iterator[PacketAck]:
+        """Reads connection once and yields all valid packets from buffer (at most max_count packets).
+        Pending packets are yielded first, if do_include_pending is True.
+        A packet is removed from internal buffer when it is yielded, so stopping the iteration early keeps
+        remaining packets in buffer
+        """
+        if do_update_buffer:
+            self.update_buffer()
+
+        count = 0
+        while do_include_pending and self._pending_packets and (max_count is None or count < max_count):
+            count += 1
+            yield self._pending_packets.popleft()
+
+        while max_count is None or count < max_count:
+            ack_data = self._extract_packet_data()
+            if ack_data is None:
+                break
+
+            count += 1
+            yield self._create_packet(ack_data)
+
+
+    def clear_buffer(self):
+        """Clear internal buffer, pending packets and buffer from connection"""
+        self._connection.clear_buffer()
+        self._buffer = b""
+        self._pending_packets.clear()
+
+
+    def _extract_packet_data(self) -> tuple[int, int, bytes] | None:
+        """Search for a valid packet in internal buffer, removes it from buffer and returns
+        command, packet number and payload. Returns None if no valid packet was found"""
+        result = self._extract_packets_data(1)
+        return result[0] if result else None
+
+
+    def _extract_packets_data(self, max_count: int | None) -> list[tuple[int, int, bytes]]:
+        """Search for all valid packets (at most max_count) in internal buffer, removes them from buffer
+        and returns command, packet number and payload for each packet. Invalid frames and bytes before
+        a packet start are removed as well, so they are counted only once in statistics"""
+        result: list[tuple[int, int, bytes]] = []
+        buffer = self._buffer
+        position = 0
+        discarded_byte_count = 0
+        invalid_frame_count = 0
+
+        def skip_invalid_frame(_start: int, stop: int):
+            # invalid frame and bytes before it are no packet, stop byte may be start of next packet
+            nonlocal position, discarded_byte_count, invalid_frame_count
+            invalid_frame_count += 1
+            discarded_byte_count += stop - position
+            position = stop
+
+        while max_count is None or len(result) < max_count:
+            packet = Protocol.decode_packet_in_buffer(buffer, position, skip_invalid_frame)
+            if packet is None:
+                # keep an incomplete packet in buffer, last byte may be the first byte of a start sequence,
+                # everything else can be discarded
+                start = buffer.find(self._START_SEQUENCE, position)
+                if start == -1:
+                    start = max(position, len(buffer) - 1)
+                discarded_byte_count += start - position
+                position = start
+                break
+
+            # bytes before start are no packet
+            start, stop, (command, number, payload) = packet
+            discarded_byte_count += start - position
+            result.append((command, number, payload.tobytes()))
+            position = stop + 1
+
+        # remove all found packets and invalid data at once from buffer
+        if position > 0:
+            self._buffer = buffer[position:]
+        self._statistics.decoded_packet_count += len(result)
+        self._statistics.invalid_frame_count += invalid_frame_count
+        self._statistics.discarded_byte_count += discarded_byte_count
+        return result
+
+
+    def _create_packet(self, ack_data: tuple[int, int, bytes]) -> Packet:
+        """Updates open acknowledges and creates packet from command, packet number and payload"""
         # check if we wait for this acknowledge
         key = ack_data[0], ack_data[1]
         wait_ack = self._open_acknowledges.get(key)
@@ -82,15 +259,6 @@ class PacketBuffer():
             if ack_data[0] not in [Commands.DL_SEND_LIVE_DATA, Commands.DL_SEND_FILE]:
                 logger().warning("Unexpected acknowledge command: %s, number: %d", Commands(ack_data[0]).name, ack_data[1])
         else:
-            self._open_acknowledges[ack_data[0], ack_data[1]] -= 1
-
-        # remove from buffer
-        self._buffer = self._buffer[start_stop[0] + start_stop[1] + 1:]
-        ack = self._packet_factory.create_packet_with_data(ack_data[0], ack_data[1], ack_data[2])
-        return ack
-
+            self._open_acknowledges[key] -= 1
 
-    def clear_buffer(self):
-        """Clear internal buffer and buffer from connection"""
-        self._connection.clear_buffer()
-        self._buffer = b""
+        return self._packet_factory.create_packet_with_data(ack_data[0], ack_data[1], ack_data[2])
@@ -0,0 +1,137 @@
+"""Provides classes for counters and histograms of packet processing"""
+
+from typing import Any
+
+from science_mode_4.protocol.commands import Commands
+
+
+class Histogram():
+    """Histogram with power of two buckets, bucket n counts values in range [2^(n-1), 2^n),
+    bucket 0 counts values less than 1"""
+
+
+    def __init__(self):
+        self._buckets: list[int] = []
+        self._count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+
+    @property
+    def count(self) -> int:
+        """Getter for number of values"""
+        return self._count
+
+
+    @property
+    def total(self) -> int:
+        """Getter for sum of all values"""
+        return self._total
+
+
+    @property
+    def min(self) -> int:
+        """Getter for minimum value"""
+        return self._min
+
+
+    @property
+    def max(self) -> int:
+        """Getter for maximum value"""
+        return self._max
+
+
+    def add(self, value: int):
+        """Adds a value"""
+        value = int(value)
+        index = value.bit_length() if value > 0 else 0
+        if index >= len(self._buckets):
+            self._buckets.extend([0] * (index + 1 - len(self._buckets)))
+        self._buckets[index] += 1
+
+        if self._count == 0:
+            self._min = value
+            self._max = value
+        else:
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+        self._count += 1
+        self._total += value
+
+
+    def reset(self):
+        """Removes all values"""
+        self._buckets = []
+        self._count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """Returns count, sum, min, max, mean and buckets (upper bound of bucket as key) as dict"""
+        return {"count": self._count, "total": self._total, "min": self._min, "max": self._max,
+                "mean": self._total / self._count if self._count > 0 else 0.0,
+                "buckets": {1 << index: value for index, value in enumerate(self._buckets) if value > 0}}
+
+
+class PacketStatistics():
+    """Counters and histograms for reading connection, decoding packets and waiting for acknowledges,
+    acknowledge latency is measured in microseconds per command"""
+
+
+    def __init__(self):
+        self.read_count = 0
+        self.empty_read_count = 0
+        self.read_bytes = Histogram()
+        self.decoded_packet_count = 0
+        self.invalid_frame_count = 0
+        self.discarded_byte_count = 0
+        self.ack_timeout_count = 0
+        self.ack_error_count = 0
+        # dict with command as key and histogram of acknowledge latency as value
+        self.ack_latency: dict[int, Histogram] = {}
+        self.queue_length = Histogram()
+
+
+    def add_read(self, length: int):
+        """Counts a read from connection with length bytes"""
+        self.read_count += 1
+        if length == 0:
+            self.empty_read_count += 1
+        else:
+            self.read_bytes.add(length)
+
+
+    def add_ack_latency(self, command: int, latency_in_seconds: float):
+        """Adds latency between sending command and receiving acknowledge"""
+        histogram = self.ack_latency.get(command)
+        if histogram is None:
+            histogram = Histogram()
+            self.ack_latency[command] = histogram
+        histogram.add(latency_in_seconds * 1_000_000)
+
+
+    def reset(self):
+        """Resets all counters and histograms"""
+        self.read_count = 0
+        self.empty_read_count = 0
+        self.read_bytes.reset()
+        self.decoded_packet_count = 0
+        self.invalid_frame_count = 0
+        self.discarded_byte_count = 0
+        self.ack_timeout_count = 0
+        self.ack_error_count = 0
+        self.ack_latency = {}
+        self.queue_length.reset()
+
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """Returns all counters and histograms as dict"""
+        return {"read_count": self.read_count, "empty_read_count": self.empty_read_count,
+                "read_bytes": self.read_bytes.get_snapshot(), "decoded_packet_count": self.decoded_packet_count,
+                "invalid_frame_count": self.invalid_frame_count, "discarded_byte_count": self.discarded_byte_count,
+                "ack_timeout_count": self.ack_timeout_count, "ack_error_count": self.ack_error_count,
+                "ack_latency_us": {Commands(command).name: value.get_snapshot() for command, value in self.ack_latency.items()},
+                "queue_length": self.queue_length.get_snapshot()}
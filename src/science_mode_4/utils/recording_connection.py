@@ -0,0 +1,70 @@
+"""Provides a connection wrapper that records all data to a file"""
+
+from .connection import Connection
+from .wire_trace import WireTraceDirection, WireTraceWriter
+
+
+class RecordingConnection(Connection):
+    """Wraps a connection and records every read and written chunk with timestamp to a binary file
+    (see WireTraceWriter), use ReplayConnection to play recorded data back"""
+
+
+    def __init__(self, conn: Connection, filename: str):
+        self._connection = conn
+        self._filename = filename
+        self._writer: WireTraceWriter | None = None
+
+
+    @property
+    def connection(self) -> Connection:
+        """Getter for wrapped connection"""
+        return self._connection
+
+
+    @property
+    def filename(self) -> str:
+        """Getter for filename of recording"""
+        return self._filename
+
+
+    def open(self):
+        """Opens wrapped connection and starts recording, an existing file is overwritten"""
+        self._connection.open()
+        self._writer = WireTraceWriter(self._filename)
+
+
+    def close(self):
+        """Closes wrapped connection and recording file"""
+        self._connection.close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+    def is_open(self) -> bool:
+        return self._connection.is_open()
+
+
+    def write(self, data: bytes):
+        self._connection.write(data)
+        if self._writer is not None:
+            self._writer.write_record(WireTraceDirection.WRITE, data)
+
+
+    def read(self) -> bytes:
+        result = self._connection.read()
+        if len(result) > 0 and self._writer is not None:
+            self._writer.write_record(WireTraceDirection.READ, result)
+        return result
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        await self._connection.wait_for_data(timeout_in_seconds)
+
+
+    def clear_buffer(self):
+        self._connection.clear_buffer()
+
+
+    def _read_intern(self) -> bytes:
+        return self._connection.read()
@@ -0,0 +1,105 @@
+"""Provides a connection that plays back a recording"""
+
+import asyncio
+import time
+
+from .connection import Connection
+from .wire_trace import WireTraceDirection, WireTraceReader, WireTraceRecord
+
+
+class ReplayConnection(Connection):
+    """Plays back data read during a recording (see RecordingConnection and WireTraceWriter), written data
+    is ignored. Recorded chunks become available at recorded time divided by speed (relative to first chunk),
+    so speed 1.0 replays with recorded timing. If speed is 0, every read returns the next recorded chunk
+    without any delay, this is useful for deterministic tests and benchmarks"""
+
+
+    def __init__(self, filename: str, speed: float = 1.0):
+        self._filename = filename
+        self._speed = speed
+        self._records: list[WireTraceRecord] = []
+        self._index = 0
+        self._start_time = 0.0
+        self._is_open = False
+        self._written_byte_count = 0
+
+
+    @property
+    def speed(self) -> float:
+        """Getter for speed"""
+        return self._speed
+
+
+    @property
+    def is_finished(self) -> bool:
+        """Getter for replay state, True if all recorded chunks were read"""
+        return self._index >= len(self._records)
+
+
+    @property
+    def written_byte_count(self) -> int:
+        """Getter for number of written bytes"""
+        return self._written_byte_count
+
+
+    def open(self):
+        """Loads recorded chunks and starts replay"""
+        self._records = [x for x in WireTraceReader.read_records(self._filename) if x.direction == WireTraceDirection.READ]
+        self._index = 0
+        self._start_time = time.perf_counter()
+        self._is_open = True
+
+
+    def close(self):
+        self._is_open = False
+
+
+    def is_open(self) -> bool:
+        return self._is_open
+
+
+    def write(self, data: bytes):
+        super().write(data)
+        self._written_byte_count += len(data)
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until next recorded chunk is due or timeout_in_seconds elapsed"""
+        if self.is_finished:
+            await asyncio.sleep(min(timeout_in_seconds, Connection.POLL_INTERVAL_IN_SECONDS))
+        elif self._speed > 0:
+            await asyncio.sleep(min(timeout_in_seconds, max(0.0, self._get_due_time(self._index) - time.perf_counter())))
+
+
+    def clear_buffer(self):
+        """Discards all chunks, that are due"""
+        if self._speed > 0:
+            self._index = self._get_due_index()
+
+
+    def _read_intern(self) -> bytes:
+        if self.is_finished:
+            return bytes()
+
+        if self._speed <= 0:
+            self._index += 1
+            return self._records[self._index - 1].data
+
+        stop = self._get_due_index()
+        result = b"".join(x.data for x in self._records[self._index:stop])
+        self._index = stop
+        return result
+
+
+    def _get_due_time(self, index: int) -> float:
+        """Returns time when record with index is available"""
+        return self._start_time + (self._records[index].timestamp - self._records[0].timestamp) / self._speed
+
+
+    def _get_due_index(self) -> int:
+        """Returns index of first record, that is not due"""
+        now = time.perf_counter()
+        index = self._index
+        while index < len(self._records) and self._get_due_time(index) <= now:
+            index += 1
+        return index
@@ -0,0 +1,155 @@
+"""Provides a packet buffer backed by a preallocated bytearray"""
+
+from science_mode_4.protocol.packet_factory import PacketFactory
+from science_mode_4.protocol.protocol import Protocol
+from .connection import Connection
+from .packet_buffer import PacketBuffer
+
+
+class RingPacketBuffer(PacketBuffer):
+    """Packet buffer with a preallocated bytearray as storage, can be used instead of PacketBuffer.
+    Consumed packets are dropped by moving a read index instead of copying the remaining data and
+    a persistent scan cursor ensures that already rejected bytes are not searched again"""
+
+
+    _STOP_SEQUENCE = bytes([Protocol.STOP_BYTE])
+    # minimal distance between start byte and stop byte of a packet
+    _MIN_STOP_DISTANCE = 12
+
+
+    def __init__(self, conn: Connection, packet_factory: PacketFactory, capacity: int = 65536):
+        super().__init__(conn, packet_factory)
+        self._data = bytearray(capacity)
+        self._view = memoryview(self._data)
+        # index of first unconsumed byte
+        self._head = 0
+        # index after last valid byte
+        self._tail = 0
+        # index where search for next packet start continues
+        self._scan = 0
+        # index where search for stop byte of packet starting at _scan continues
+        self._stop_scan = 0
+
+
+    @property
+    def buffer(self) -> bytes:
+        """Getter for buffer"""
+        return bytes(self._view[self._head:self._tail])
+
+
+    @property
+    def capacity(self) -> int:
+        """Getter for current capacity, capacity grows if more unconsumed data is available"""
+        return len(self._data)
+
+
+    def update_buffer(self):
+        """Reads all data from connection and appends to internal buffer"""
+        data = self._connection.read()
+        length = len(data)
+        self._statistics.add_read(length)
+        if length == 0:
+            return
+
+        if self._tail + length > len(self._data):
+            self._make_room(length)
+
+        self._view[self._tail:self._tail + length] = data
+        self._tail += length
+
+
+    def clear_buffer(self):
+        """Clear internal buffer, pending packets and buffer from connection"""
+        super().clear_buffer()
+        self._head = 0
+        self._tail = 0
+        self._scan = 0
+        self._stop_scan = 0
+
+
+    def _extract_packet_data(self) -> tuple[int, int, bytes] | None:
+        """Search for a valid packet starting at scan cursor, same rules as Protocol.find_packet_in_buffer"""
+        data = self._data
+        while True:
+            start = data.find(self._START_SEQUENCE, self._scan, self._tail)
+            if start == -1:
+                # last byte may be the first byte of a start sequence, everything else can be discarded
+                self._scan = max(self._head, self._tail - 1)
+                self._stop_scan = self._scan
+                self._statistics.discarded_byte_count += self._scan - self._head
+                self._head = self._scan
+                return None
+
+            # bytes before start are no packet
+            self._statistics.discarded_byte_count += start - self._head
+            self._head = start
+            if start != self._scan:
+                self._scan = start
+                self._stop_scan = start + self._MIN_STOP_DISTANCE
+
+            stop = data.find(self._STOP_SEQUENCE, max(self._stop_scan, start + self._MIN_STOP_DISTANCE), self._tail)
+            if stop == -1:
+                # packet is not complete, continue search for stop byte later at current end
+                self._stop_scan = self._tail
+                return None
+
+            packet_data = self._view[start:stop + 1]
+            try:
+                ack_data = Protocol.decode_packet_data(packet_data)
+            finally:
+                packet_data.release()
+
+            if ack_data is not None:
+                self._statistics.decoded_packet_count += 1
+                self._consume(stop + 1)
+                # payload is a view of unstuffed data, so it does not reference storage
+                return ack_data[0], ack_data[1], ack_data[2].tobytes()
+
+            # found packet is not valid, so check for more packets afterwards
+            self._statistics.invalid_frame_count += 1
+            self._statistics.discarded_byte_count += stop - start
+            self._consume(stop)
+
+
+    def _extract_packets_data(self, max_count: int | None) -> list[tuple[int, int, bytes]]:
+        """Search for all valid packets (at most max_count), consumed packets are dropped without copying"""
+        result: list[tuple[int, int, bytes]] = []
+        while max_count is None or len(result) < max_count:
+            ack_data = self._extract_packet_data()
+            if ack_data is None:
+                break
+            result.append(ack_data)
+        return result
+
+
+    def _consume(self, index: int):
+        """Drops all bytes before index"""
+        self._head = index
+        self._scan = index
+        self._stop_scan = index
+        if self._head == self._tail:
+            # buffer is empty, so start again at the beginning without copying anything
+            self._head = 0
+            self._tail = 0
+            self._scan = 0
+            self._stop_scan = 0
+
+
+    def _make_room(self, length: int):
+        """Moves unconsumed data to the beginning of storage and grows storage if necessary"""
+        unconsumed = self._tail - self._head
+        if unconsumed + length > len(self._data):
+            # grow by creating a new storage, resizing is not possible while a memoryview exists
+            new_data = bytearray(max(2 * len(self._data), unconsumed + length))
+            new_data[0:unconsumed] = self._view[self._head:self._tail]
+            self._view.release()
+            self._data = new_data
+            self._view = memoryview(self._data)
+        else:
+            self._data[0:unconsumed] = self._data[self._head:self._tail]
+
+        offset = self._head
+        self._head = 0
+        self._tail = unconsumed
+        self._scan -= offset
+        self._stop_scan -= offset
@@ -0,0 +1,197 @@
+"""Provides a packet buffer that reads and decodes packets in a background thread"""
+
+from collections import deque
+from enum import IntEnum
+import threading
+
+from science_mode_4.protocol.packet_factory import PacketFactory
+from .async_data_notifier import AsyncDataNotifier
+from .connection import Connection
+from .logger import logger
+from .packet_buffer import PacketBuffer
+from .packet_statistics import PacketStatistics
+
+
+class QueueOverflowPolicy(IntEnum):
+    """Represent behavior when packet queue is full"""
+    DROP_OLDEST = 0
+    DROP_NEWEST = 1
+
+
+class ThreadedPacketBuffer(PacketBuffer):
+    """Packet buffer with a background thread, that continuously reads connection, decodes packets and
+    pushes them into a bounded queue. Packets are created from the queue in consumer context, so
+    user logic does not delay reading from connection. Call start() after connection is opened and
+    stop() before connection is closed"""
+
+
+    # interval for reading connection when no data arrived
+    POLL_INTERVAL_IN_SECONDS = 0.001
+
+
+    def __init__(self, conn: Connection, packet_factory: PacketFactory, max_queue_size: int = 65536,
+                 overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.DROP_OLDEST,
+                 reader_buffer: PacketBuffer | None = None):
+        super().__init__(conn, packet_factory)
+        # buffer used by reader thread to decode packets from connection, an existing buffer keeps
+        # data already read from connection
+        self._reader_buffer = reader_buffer if reader_buffer is not None else PacketBuffer(conn, packet_factory)
+        self._reader_buffer.statistics = self._statistics
+        self._reader_lock = threading.Lock()
+        # command, packet number and payload of decoded packets, append and popleft are thread safe
+        self._queue: deque[tuple[int, int, bytes]] = deque()
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+        self._notifier = AsyncDataNotifier()
+        self._reader_thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._reader_error: Exception | None = None
+
+        self._received_packet_count = 0
+        self._dropped_packet_count = 0
+        self._max_queue_length = 0
+
+
+    @property
+    def buffer(self) -> bytes:
+        """Getter for buffer, contains data not yet decoded by reader thread"""
+        return self._reader_buffer.buffer
+
+
+    @PacketBuffer.statistics.setter
+    def statistics(self, value: PacketStatistics):
+        """Setter for statistics, reader buffer uses same statistics"""
+        self._statistics = value
+        self._reader_buffer.statistics = value
+
+
+    @property
+    def reader_buffer(self) -> PacketBuffer:
+        """Getter for packet buffer used by reader thread to decode packets"""
+        return self._reader_buffer
+
+
+    @property
+    def queue_length(self) -> int:
+        """Getter for number of packets in queue"""
+        return len(self._queue)
+
+
+    @property
+    def received_packet_count(self) -> int:
+        """Getter for number of packets decoded by reader thread"""
+        return self._received_packet_count
+
+
+    @property
+    def dropped_packet_count(self) -> int:
+        """Getter for number of packets dropped because queue was full"""
+        return self._dropped_packet_count
+
+
+    @property
+    def max_queue_length(self) -> int:
+        """Getter for maximum number of packets in queue since start"""
+        return self._max_queue_length
+
+
+    @property
+    def is_running(self) -> bool:
+        """Getter for reader thread state"""
+        return self._reader_thread is not None
+
+
+    def start(self):
+        """Starts background reader thread"""
+        if self._reader_thread is not None:
+            return
+        self._stop_event.clear()
+        self._reader_error = None
+        self._reader_thread = threading.Thread(target=self._reader_loop, name="PacketBuffer reader", daemon=True)
+        self._reader_thread.start()
+
+
+    def stop(self):
+        """Stops background reader thread, remaining packets stay in queue"""
+        self._stop_event.set()
+        if self._reader_thread is not None:
+            self._reader_thread.join()
+            self._reader_thread = None
+
+
+    def move_queue_to_pending_packets(self):
+        """Creates packets from all packets in queue and adds them to pending packets, used after stop()
+        to keep remaining packets when this packet buffer is replaced"""
+        while self._queue:
+            self._pending_packets.append(self._create_packet(self._queue.popleft()))
+
+
+    def update_buffer(self):
+        """Does nothing, because reader thread reads connection"""
+
+
+    async def wait_for_data(self, timeout_in_seconds: float):
+        """Waits until a packet is in queue or timeout_in_seconds elapsed"""
+        await self._notifier.wait(timeout_in_seconds, lambda: len(self._queue) > 0 or self._reader_error is not None)
+
+
+    def clear_buffer(self):
+        """Clear queue, pending packets, internal buffer and buffer from connection"""
+        with self._reader_lock:
+            self._reader_buffer.clear_buffer()
+            self._queue.clear()
+        self._pending_packets.clear()
+
+
+    def _extract_packets_data(self, max_count: int | None) -> list[tuple[int, int, bytes]]:
+        """Takes packets (at most max_count) from queue"""
+        if self._reader_error is not None:
+            raise ValueError(f"Error in packet buffer reader thread {self._reader_error}") from self._reader_error
+
+        result: list[tuple[int, int, bytes]] = []
+        while max_count is None or len(result) < max_count:
+            try:
+                result.append(self._queue.popleft())
+            except IndexError:
+                break
+        return result
+
+
+    def _reader_loop(self):
+        """Function of background reader thread"""
+        while not self._stop_event.is_set():
+            try:
+                # lock ensures that clear_buffer() discards all packets, even those currently decoded
+                with self._reader_lock:
+                    self._reader_buffer.update_buffer()
+                    packets = self._reader_buffer._extract_packets_data(None) # pylint:disable=protected-access
+                    self._enqueue(packets)
+            except Exception as e: # pylint:disable=broad-exception-caught
+                logger().error("Error in packet buffer reader thread: %s", e)
+                self._reader_error = e
+                self._notifier.notify()
+                break
+
+            if len(packets) > 0:
+                self._notifier.notify()
+            else:
+                self._stop_event.wait(ThreadedPacketBuffer.POLL_INTERVAL_IN_SECONDS)
+
+
+    def _enqueue(self, packets: list[tuple[int, int, bytes]]):
+        """Appends packets to queue considering overflow policy"""
+        self._received_packet_count += len(packets)
+        for x in packets:
+            if len(self._queue) >= self._max_queue_size:
+                self._dropped_packet_count += 1
+                if self._overflow_policy == QueueOverflowPolicy.DROP_NEWEST:
+                    continue
+                try:
+                    self._queue.popleft()
+                except IndexError:
+                    # consumer emptied queue in the meantime
+                    pass
+            self._queue.append(x)
+        self._max_queue_length = max(self._max_queue_length, len(self._queue))
+        if packets:
+            self._statistics.queue_length.add(len(self._queue))
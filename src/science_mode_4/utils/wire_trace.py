@@ -0,0 +1,102 @@
+"""Provides classes to write and read a binary trace of raw connection data"""
+
+from enum import IntEnum
+import struct
+import threading
+import time
+from typing import BinaryIO, Iterator, NamedTuple
+
+
+class WireTraceDirection(IntEnum):
+    """Represent direction of traced data"""
+    READ = 0
+    WRITE = 1
+
+
+class WireTraceRecord(NamedTuple):
+    """Helper class for a traced data chunk, timestamp is in seconds since start of trace"""
+    timestamp: float
+    direction: WireTraceDirection
+    data: bytes
+
+
+class WireTraceWriter():
+    """Writes raw data chunks to a binary file without any formatting. File starts with magic bytes and
+    start time (seconds since epoch as double), each chunk is stored as record header (timestamp in seconds
+    since start as double, direction and length) followed by data. Thread safe, so read and write may happen
+    in different threads"""
+
+
+    MAGIC = b"SM4WIRE1"
+    FILE_HEADER = struct.Struct("<d")
+    RECORD_HEADER = struct.Struct("<dBI")
+
+
+    def __init__(self, filename: str):
+        self._file: BinaryIO = open(filename, "wb") # pylint: disable=consider-using-with
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+        self._file.write(WireTraceWriter.MAGIC)
+        self._file.write(WireTraceWriter.FILE_HEADER.pack(time.time()))
+
+
+    @property
+    def is_closed(self) -> bool:
+        """Getter for file state"""
+        return self._file.closed
+
+
+    def write_record(self, direction: WireTraceDirection, data: bytes):
+        """Writes data with current timestamp"""
+        timestamp = time.perf_counter() - self._start_time
+        with self._lock:
+            self._file.write(WireTraceWriter.RECORD_HEADER.pack(timestamp, direction, len(data)))
+            self._file.write(data)
+
+
+    def flush(self):
+        """Writes buffered records to file"""
+        with self._lock:
+            self._file.flush()
+
+
+    def close(self):
+        """Closes file"""
+        with self._lock:
+            self._file.close()
+
+
+class WireTraceReader():
+    """Reads files written by WireTraceWriter"""
+
+
+    @staticmethod
+    def read_start_time(filename: str) -> float:
+        """Returns start time of trace in seconds since epoch"""
+        with open(filename, "rb") as f:
+            return WireTraceReader._read_file_header(f)
+
+
+    @staticmethod
+    def read_records(filename: str) -> Iterator[WireTraceRecord]:
+        """Yields all records of file"""
+        header_size = WireTraceWriter.RECORD_HEADER.size
+        with open(filename, "rb") as f:
+            WireTraceReader._read_file_header(f)
+            while True:
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    break
+                timestamp, direction, length = WireTraceWriter.RECORD_HEADER.unpack(header)
+                data = f.read(length)
+                if len(data) < length:
+                    break
+                yield WireTraceRecord(timestamp, WireTraceDirection(direction), data)
+
+
+    @staticmethod
+    def _read_file_header(f: BinaryIO) -> float:
+        """Checks magic bytes and returns start time"""
+        if f.read(len(WireTraceWriter.MAGIC)) != WireTraceWriter.MAGIC:
+            raise ValueError("Wire trace file has wrong format")
+        return WireTraceWriter.FILE_HEADER.unpack(f.read(WireTraceWriter.FILE_HEADER.size))[0]